@@ -0,0 +1,151 @@
+# ubl_tr_py.attachments kontrolü ve bellek/süre ölçümü: ekleri listeleme ve çözme.
+#
+#   python benchmarks/attachments.py                 # kontrol, sonra 50 MB'lık (çözülmüş) ekle ölçüm
+#   python benchmarks/attachments.py --size 200      # ek boyutu (MB)
+#   python benchmarks/attachments.py --check         # yalnızca kontrol; farklılıkta çıkış kodu 1
+#
+# Kontrol, paketteki her Invoice belgesi için list_attachments'ın dosya adı, mimeCode ve base64 uzunluğunun ve
+# read_attachment / save_attachment çıktısının etree.parse + base64.b64decode ile aynı olduğuna bakar.
+#
+# Ölçüm: HKS-Ornek1.xml'deki XSLT eki --size MB rastgele içerikle değiştirilir. Her yöntem ayrı bir süreçte
+# çalışır; süre ve süreç başlangıcına göre tepe RSS artışı (ru_maxrss) yazılır (başlangıçtaki tepe değeri
+# aşmayan yöntemlerde 0):
+#   list            list_attachments
+#   save            save_attachment ile dosyaya (parça parça)
+#   read            read_attachment (ekin tamamı bellekte, istenirse)
+#   etree+b64decode etree.parse, ekin metni base64.b64decode ile çözülüp dosyaya yazılır
+
+import argparse
+import base64
+import glob
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLES = os.path.join(ROOT, 'UBLTR_1.2.1_Paketi', 'xml')
+sys.path.insert(0, ROOT)
+
+from lxml import etree
+
+from ubl_tr_py.attachments import list_attachments, read_attachment, save_attachment
+from ubl_tr_py.reader import INVOICE, CAC, CBC
+
+TEMPLATE = os.path.join(SAMPLES, 'HKS-Ornek1.xml')
+BINARY_OBJECT = CBC + 'EmbeddedDocumentBinaryObject'
+METHODS = ('list', 'save', 'read', 'etree+b64decode')
+
+
+def _max_rss() -> int:
+    import resource
+    # Linux'ta KB, macOS'ta bayt.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+def check(paths: list) -> bool:
+    ok = True
+    for path in paths:
+        name = os.path.basename(path)
+        root = etree.parse(path).getroot()
+        if root.tag != INVOICE:
+            continue
+        objects = root.findall(f'{CAC}AdditionalDocumentReference/{CAC}Attachment/{BINARY_OBJECT}')
+        attachments = list_attachments(path)
+        problems = []
+        if len(attachments) != len(objects):
+            problems.append(f'{len(attachments)} attachments, expected {len(objects)}')
+        for attachment, element in zip(attachments, objects):
+            text = ''.join((element.text or '').split())
+            if (attachment.filename, attachment.mimeCode, attachment.encoded_size) != \
+                    (element.get('filename'), element.get('mimeCode'), len(text)):
+                problems.append(f'{attachment.index}: list')
+            expected = base64.b64decode(text)
+            if read_attachment(path, attachment) != expected:
+                problems.append(f'{attachment.index}: read')
+            output = io.BytesIO()
+            with open(path, 'rb') as f:
+                save_attachment(f, attachment.filename, output)
+            if output.getvalue() != expected:
+                problems.append(f'{attachment.index}: save')
+
+        print(f'{name:<32} {len(attachments)} attachments  {", ".join(problems) or "identical"}', file=sys.stderr)
+        ok = ok and not problems
+    return ok
+
+
+def generate(path: str, megabytes: int):
+    """TEMPLATE'teki ekin yerine megabytes MB rastgele içerik (base64, 76 karakterlik satırlar) yazar."""
+    with open(TEMPLATE, 'rb') as f:
+        template = f.read()
+    start = template.index(b'>', template.index(b'<cbc:EmbeddedDocumentBinaryObject')) + 1
+    end = template.index(b'</cbc:EmbeddedDocumentBinaryObject>')
+    with open(path, 'wb') as f:
+        f.write(template[:start])
+        block = 57 * 16384  # 57 bayt = 76 base64 karakteri
+        for _ in range(megabytes * 2 ** 20 // block):
+            f.write(base64.encodebytes(os.urandom(block)))
+        f.write(template[end:])
+
+
+def run(method: str, path: str, output: str) -> dict:
+    """Alt süreçte çalışır."""
+    baseline = _max_rss()
+    start = time.perf_counter()
+    if method == 'list':
+        size = list_attachments(path)[0].encoded_size
+    elif method == 'save':
+        size = save_attachment(path, 0, output)
+    elif method == 'read':
+        size = len(read_attachment(path, 0))
+    else:
+        element = etree.parse(path, etree.XMLParser(huge_tree=True)).getroot().find(
+            f'{CAC}AdditionalDocumentReference/{CAC}Attachment/{BINARY_OBJECT}')
+        data = base64.b64decode(element.text)
+        with open(output, 'wb') as f:
+            f.write(data)
+        size = len(data)
+    return {'method': method, 'seconds': time.perf_counter() - start, 'size': size,
+            'peak_kb': (_max_rss() - baseline) // 1024}
+
+
+def benchmark(megabytes: int) -> list:
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'ekli-fatura.xml')
+        generate(path, megabytes)
+        print(f'\n{os.path.getsize(path) / 2 ** 20:.0f} MB fatura, {megabytes} MB ek', file=sys.stderr)
+        for method in METHODS:
+            output = os.path.join(directory, 'ek.bin')
+            result = json.loads(subprocess.check_output(
+                [sys.executable, os.path.abspath(__file__), '--child', method, path, output]))
+            results.append(result)
+            print(f"{method:<16} {result['seconds']:>7.2f} s {result['peak_kb'] / 1024:>9.1f} MB peak "
+                  f"{result['size']:>12} bytes", file=sys.stderr)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Ekleri listeleme ve çözme: kontrol ve ölçüm')
+    parser.add_argument('files', nargs='*', help='Varsayılan: UBLTR_1.2.1_Paketi/xml altındaki bütün belgeler')
+    parser.add_argument('--check', action='store_true', help='Yalnızca kontrol')
+    parser.add_argument('--size', type=int, default=50, help='Ölçümde kullanılan ekin boyutu (MB)')
+    parser.add_argument('--child', nargs=3, metavar=('METHOD', 'PATH', 'OUTPUT'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run(*args.child)))
+        return 0
+
+    ok = check(args.files or sorted(glob.glob(os.path.join(SAMPLES, '*.xml'))))
+    if not args.check and ok:
+        benchmark(args.size)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
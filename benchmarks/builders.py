@@ -0,0 +1,340 @@
+# UBLInvoice bölüm oluşturucularının mikro ölçümü: süre ve tepe bellek, JSON sonuç ve sürümler arası karşılaştırma.
+#
+#   python benchmarks/builders.py                              # bütün ölçümler, tablo
+#   python benchmarks/builders.py --json sonuc-0.1.0.json      # sonucu kaydet
+#   python benchmarks/builders.py --compare sonuc-0.1.0.json   # öncekiyle karşılaştır; eşiği aşan gerilemede çıkış kodu 1
+#   python benchmarks/builders.py --filter add_invoice_line --threshold 15
+#
+# Ölçümler: add_accounting_supplier_party, add_accounting_customer_party, add_taxtotal, add_legalmonetarytotal,
+# add_invoice_line (1/10/100/10000 kalem), xml() ve dump_xml() (aynı kalem sayıları) ve README'deki örnek faturanın
+# baştan sona oluşturulması. Veriler sentetiktir, her kalemin kendi model nesneleri vardır.
+#
+# Her ölçüm ayrı bir süreçte çalışır. Süre: her turda hazırlık (yeni fatura, model nesneleri) ölçüm dışında yapılır,
+# yalnızca ölçülen çağrının süresi alınır; en az --min-rounds tur, toplam --min-time saniye dolana kadar.
+# Bellek: zamanlamadan önceki ilk turda tracemalloc tepe değeri (Python nesneleri, örn. xml() metni) ve hazırlıktan
+# sonraki ru_maxrss artışı (libxml2 ayırmaları tracemalloc'a görünmez; küçük ölçümlerde 0 çıkabilir).
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lxml import etree
+
+from ubl_tr_py.UBLInvoice import (UBLInvoice, KolaysoftSignature, PartyData, PartyIdentification, PostalAddress,
+                                  PartyTaxScheme, TaxScheme, Contact, PaymentMeans, PayeeFinancialAccount,
+                                  PaymentTerms, TaxTotal, TaxSubtotal, TaxCategory, MonetaryTotal, InvoiceLine, Item,
+                                  ItemIdentification, Price)
+
+LINE_COUNTS = (1, 10, 100, 10000)
+
+
+def supplier_party() -> PartyData:
+    party = PartyData()
+    party.PartyIdentification = PartyIdentification(schemeID='VKN', value='12345678900')
+    party.PartyName = 'GÖTÜR LTD. ŞTİ.'
+    party.PostalAddress = PostalAddress(ID='1234567890', StreetName='Papatya Caddesi Yasemin Sokak',
+                                        BuildingNumber='21', CitySubdivisionName='Beşiktaş', CityName='İstanbul',
+                                        PostalZone='34100', Country='Türkiye')
+    party.PartyTaxScheme = PartyTaxScheme(TaxScheme=TaxScheme(Name='Büyük Mükellefler'))
+    party.Contact = Contact(ElectronicMail='info@gtr.mv', Telephone='555555555', Telefax='666666666')
+    return party
+
+
+def customer_party() -> PartyData:
+    party = PartyData()
+    party.PartyIdentification = PartyIdentification(schemeID='VKN', value='0000510000')
+    party.PartyName = 'SAGATGRUP YAZILIM VE BİLİŞİM TEKNOLOJİLERİ TİCARET LİMİTED ŞİRKETİ'
+    party.PostalAddress = PostalAddress(CitySubdivisionName='Çankaya', CityName='Ankara', Country='Türkiye')
+    party.PartyTaxScheme = PartyTaxScheme(TaxScheme=TaxScheme(Name='DOĞANBEY VERGİ DAİRESİ MÜD.'))
+    return party
+
+
+def vat_scheme() -> TaxScheme:
+    return TaxScheme(Name='GERÇEK USULDE KATMA DEĞER VERGİSİ', TaxTypeCode='0015')
+
+
+def tax_total(lines: int = 1) -> TaxTotal:
+    return TaxTotal(TaxAmount=f'{lines * 0.18:.2f}',
+                    TaxSubtotal=TaxSubtotal(TaxableAmount=f'{lines}.00', TaxAmount=f'{lines * 0.18:.2f}',
+                                            CalculationSequenceNumeric='1', Percent='18',
+                                            TaxCategory=TaxCategory(Name='GERÇEK USULDE KATMA DEĞER VERGİSİ',
+                                                                    TaxScheme=vat_scheme())))
+
+
+def monetary_total(lines: int = 1) -> MonetaryTotal:
+    return MonetaryTotal(LineExtensionAmount=f'{lines}.00', TaxExclusiveAmount=f'{lines}.00',
+                         TaxInclusiveAmount=f'{lines * 1.18:.2f}', AllowanceTotalAmount='0.00',
+                         PayableAmount=f'{lines * 1.18:.2f}')
+
+
+def invoice_line(i: int) -> InvoiceLine:
+    return InvoiceLine(ID=str(i + 1), InvoicedQuantity='1', InvoicedQuantity_unitCode='C62', LineExtensionAmount='1.00',
+                       Item=Item(Name=f'Ürün {i}', SellersItemIdentification=ItemIdentification(ID=f'STK{i:09d}')),
+                       Price=Price(PriceAmount='1.00'),
+                       TaxTotal=TaxTotal(TaxAmount='0.18', TaxSubtotal=TaxSubtotal(
+                           TaxableAmount='1.00', TaxAmount='0.18', Percent='18',
+                           TaxCategory=TaxCategory(TaxScheme=vat_scheme()))))
+
+
+def invoice_lines(lines: int) -> list:
+    return [invoice_line(i) for i in range(lines)]
+
+
+def header(doc=None):
+    doc = UBLInvoice() if doc is None else doc
+    doc.add_ubl_extension()
+    doc.add_ubl_version_id()
+    doc.add_customisation_id()
+    doc.add_profile_id('TEMELFATURA')
+    doc.add_id('INV2024050512346')
+    doc.add_copy_indicator('false')
+    doc.add_uuid('e093a490-dd99-11dd-ad8b-0800200c9a66')
+    doc.add_issue_date('2024-05-05')
+    doc.add_invoice_type_code('SATIS')
+    doc.add_document_currency_code('TRY')
+    return doc
+
+
+def parties_and_totals(doc, lines: int):
+    # Kalemlerden önceki bölümler; UBLInvoice.write() ile kalemler akış olarak yazılabilir.
+    doc.add_line_count_numeric(str(lines))
+    doc.add_signature(signatory=KolaysoftSignature())
+    doc.add_accounting_supplier_party(supplier_party())
+    doc.add_accounting_customer_party(customer_party())
+    doc.add_taxtotal(tax_total(lines))
+    doc.add_legalmonetarytotal(monetary_total(lines))
+    return doc
+
+
+def full_invoice(lines: int) -> UBLInvoice:
+    doc = parties_and_totals(header(), lines)
+    doc.add_invoice_line(invoice_lines(lines))
+    return doc
+
+
+def readme_example() -> UBLInvoice:
+    # README'deki "Örnek kullanım" adımları.
+    ubl_doc = UBLInvoice()
+    ubl_doc.add_ubl_extension()
+    ubl_doc.add_ubl_version_id()
+    ubl_doc.add_customisation_id()
+    ubl_doc.add_profile_id('TEMELFATURA')
+    ubl_doc.add_id('INV2024050512346')
+    ubl_doc.add_copy_indicator('false')
+    ubl_doc.add_uuid()
+    ubl_doc.add_issue_date('2024-05-05')
+    ubl_doc.add_issue_time('12:34:56')
+    ubl_doc.add_invoice_type_code('SATIS')
+    ubl_doc.add_note('Fatura notu')
+    ubl_doc.add_document_currency_code('TRY')
+    ubl_doc.add_line_count_numeric('1')
+    ubl_doc.add_despatch_document_reference('IRS2024050510346', '2024-05-05')
+    ubl_doc.add_signature(signatory=KolaysoftSignature())
+    ubl_doc.add_accounting_supplier_party(supplier_party())
+    ubl_doc.add_accounting_customer_party(customer_party())
+    ubl_doc.add_paymentmeans(PaymentMeans(PaymentMeansCode='1', PaymentDueDate='2024-05-25', PaymentChannelCode='1',
+                                          PayeeFinancialAccount=PayeeFinancialAccount(
+                                              ID='1', CurrencyCode='TRY', PaymentNote='İST Bank Şişli Şubesi')))
+    ubl_doc.add_paymentterms(PaymentTerms(Note='Fatura düzenlenme tarihinden itibaren 20 gün içerisinde ödenecektir.',
+                                          PaymentDueDate='2024-02-25'))
+    ubl_doc.add_taxtotal(tax_total())
+    ubl_doc.add_legalmonetarytotal(monetary_total())
+    ubl_doc.add_invoice_line(InvoiceLine(
+        ID='1', InvoicedQuantity='1', InvoicedQuantity_unitCode='C62', LineExtensionAmount='1.00',
+        Item=Item(Name='Mal ya da hizmetin adı', SellersItemIdentification=ItemIdentification(ID='STK000006DMDE')),
+        Price=Price(PriceAmount='1.00'),
+        TaxTotal=TaxTotal(TaxAmount='0.18', TaxSubtotal=TaxSubtotal(
+            TaxableAmount='1', TaxAmount='0.18', CalculationSequenceNumeric='1', Percent='18',
+            TaxCategory=TaxCategory(TaxScheme=vat_scheme())))))
+    ubl_doc.xml()
+    return ubl_doc
+
+
+def _section(method: str, make_argument):
+    def prepare():
+        doc = header()
+        argument = make_argument()
+        return lambda: getattr(doc, method)(argument)
+    return prepare
+
+
+def _lines(lines: int):
+    def prepare():
+        doc = header()
+        argument = invoice_lines(lines)
+        return lambda: doc.add_invoice_line(argument)
+    return prepare
+
+
+def _serialize(method: str, lines: int):
+    def prepare():
+        doc = full_invoice(lines)
+        return getattr(doc, method)
+    return prepare
+
+
+def _benchmarks() -> dict:
+    # ad -> (parametreler, hazırlık). Hazırlık ölçülecek çağrıyı döndürür ve her turda yeniden çağrılır.
+    benchmarks = {
+        'add_accounting_supplier_party': ({}, _section('add_accounting_supplier_party', supplier_party)),
+        'add_accounting_customer_party': ({}, _section('add_accounting_customer_party', customer_party)),
+        'add_taxtotal': ({}, _section('add_taxtotal', tax_total)),
+        'add_legalmonetarytotal': ({}, _section('add_legalmonetarytotal', monetary_total)),
+    }
+    for lines in LINE_COUNTS:
+        benchmarks[f'add_invoice_line[{lines}]'] = ({'lines': lines}, _lines(lines))
+    for method in ('xml', 'dump_xml'):
+        for lines in LINE_COUNTS:
+            benchmarks[f'{method}[{lines}]'] = ({'lines': lines}, _serialize(method, lines))
+    benchmarks['readme_example'] = ({}, lambda: readme_example)
+    return benchmarks
+
+
+BENCHMARKS = _benchmarks()
+
+
+def run_benchmark(name: str, min_rounds: int, min_time: float) -> dict:
+    """Alt süreçte çalışır: name ölçümünü yapar."""
+    import resource
+    params, prepare = BENCHMARKS[name]
+
+    # Bellek önce ölçülür; zamanlama turları tepe RSS'i yükseltir.
+    call = prepare()
+    gc.collect()
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+    call()
+    peak_python = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss
+    del call
+
+    timings = []
+    while len(timings) < min_rounds or (sum(timings) < min_time and len(timings) < 10000):
+        call = prepare()
+        gc.disable()
+        start = time.perf_counter()
+        call()
+        timings.append(time.perf_counter() - start)
+        gc.enable()
+        del call
+
+    return {
+        'params': params,
+        'time': {
+            'rounds': len(timings),
+            'median_us': round(statistics.median(timings) * 1e6, 2),
+            'min_us': round(min(timings) * 1e6, 2),
+            'stdev_us': round(statistics.stdev(timings) * 1e6, 2) if len(timings) > 1 else 0.0,
+        },
+        'memory': {
+            'peak_python_kb': round(peak_python / 1024, 1),
+            'peak_rss_kb': peak_rss,
+        },
+    }
+
+
+def measure(name: str, min_rounds: int, min_time: float) -> dict:
+    # Tepe RSS süreç başına tutulduğundan her ölçüm temiz bir süreçte yapılır; dump_xml çalışma dizinine yazar.
+    with tempfile.TemporaryDirectory() as directory:
+        output = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--child', name,
+                                          '--min-rounds', str(min_rounds), '--min-time', str(min_time)],
+                                         cwd=directory)
+    return json.loads(output)
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.check_output(['git', 'describe', '--always', '--dirty'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metadata() -> dict:
+    return {
+        'revision': _git_revision(),
+        'python': sys.version.split()[0],
+        'lxml': etree.__version__,
+        'libxml2': '.'.join(map(str, etree.LIBXML_VERSION)),
+        'platform': platform.platform(),
+        'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Eşiği (%) aşan gerilemeler: [(ölçüm, metrik, önceki, şimdiki, değişim %)]"""
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        for group, metric in (('time', 'median_us'), ('memory', 'peak_python_kb')):
+            before, after = old[group][metric], result[group][metric]
+            if before and (after - before) / before * 100 > threshold:
+                regressions.append((name, metric, before, after, (after - before) / before * 100))
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='UBLInvoice bölüm oluşturucularının süre ve bellek ölçümü')
+    parser.add_argument('--filter', help='Yalnızca adı bu metni içeren ölçümler')
+    parser.add_argument('--min-rounds', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=1.0, help='Ölçüm başına en az toplam süre (saniye)')
+    parser.add_argument('--json', help='Sonuçları bu dosyaya yaz')
+    parser.add_argument('--compare', help='Önceki --json çıktısı; gerilemeler listelenir')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Gerileme eşiği (%%)')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_benchmark(args.child, args.min_rounds, args.min_time)))
+        return 0
+
+    names = [name for name in BENCHMARKS if not args.filter or args.filter in name]
+    results = {}
+    for name in names:
+        results[name] = measure(name, args.min_rounds, args.min_time)
+        print(f"{name:<32} {results[name]['time']['median_us']:>12.1f} us {results[name]['time']['rounds']:>6} rounds "
+              f"{results[name]['memory']['peak_python_kb']:>10.1f} KB py {results[name]['memory']['peak_rss_kb']:>8} KB rss",
+              file=sys.stderr)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'metadata': metadata(), 'benchmarks': results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"\ncompared with {baseline['metadata'].get('revision')}", file=sys.stderr)
+        for name, result in results.items():
+            old = baseline['benchmarks'].get(name)
+            if old is None:
+                print(f'{name:<32} (new)', file=sys.stderr)
+                continue
+            changes = []
+            for group, metric in (('time', 'median_us'), ('memory', 'peak_python_kb')):
+                before, after = old[group][metric], result[group][metric]
+                changes.append(f'{metric} {before} -> {after} ({(after - before) / before:+.1%})' if before
+                               else f'{metric} {before} -> {after}')
+            print(f"{name:<32} {'  '.join(changes)}", file=sys.stderr)
+        regressions = compare(results, baseline['benchmarks'], args.threshold)
+        for name, metric, before, after, change in regressions:
+            print(f'REGRESSION {name} {metric}: {before} -> {after} (+{change:.1f}%)', file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,161 @@
+# UBLInvoiceEmitter ile UBLInvoice (lxml) karşılaştırması.
+#
+#   python benchmarks/emitter.py            # önce çıktıların bayt bayt aynı olduğunu kontrol eder, sonra süre ölçer
+#   python benchmarks/emitter.py --check    # yalnızca kontrol; farklılıkta diff basar, çıkış kodu 1
+#
+# Aynı build() fonksiyonu iki sınıfla da çağrılır; emitter çıktısı referans olan lxml çıktısıyla
+# karşılaştırılır (tostring(pretty_print=True, encoding='UTF-8')).
+
+import argparse
+import difflib
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lxml import etree
+
+from ubl_tr_py.UBLInvoice import (UBLInvoice, KolaysoftSignature, PartyData, PartyIdentification, PostalAddress,
+                                  PartyTaxScheme, TaxScheme, Contact, PaymentMeans, PayeeFinancialAccount,
+                                  PaymentTerms, TaxTotal, TaxSubtotal, TaxCategory, MonetaryTotal, InvoiceLine,
+                                  Item, ItemIdentification, Price)
+from ubl_tr_py.emitter import UBLInvoiceEmitter
+
+
+def build(doc, lines: int = 1, profile: str = 'TEMELFATURA', name: str = 'GÖTÜR LTD. ŞTİ.', full: bool = True,
+          defaults: bool = False):
+    # defaults: imza ve ödeme şekli parametresiz eklenir (prototipsiz varsayılanlar, bkz. batch.build_invoice).
+    doc.add_ubl_extension()
+    doc.add_ubl_version_id()
+    doc.add_customisation_id()
+    doc.add_profile_id(profile)
+    doc.add_id('INV2024050512346')
+    doc.add_copy_indicator('false')
+    doc.add_uuid('e093a490-dd99-11dd-ad8b-0800200c9a66')
+    doc.add_issue_date('2024-05-05')
+    doc.add_issue_time('12:34:56')
+    doc.add_invoice_type_code('SATIS')
+    doc.add_note('Fatura notu: "tırnak" & <açı> \'kesme\'\r\nikinci satır')
+    if full:
+        doc.add_note()
+    doc.add_document_currency_code('TRY')
+    doc.add_line_count_numeric(str(lines))
+    if full:
+        doc.add_despatch_document_reference('IRS2024050510346', '2024-05-05')
+    if defaults:
+        doc.add_signature()
+    else:
+        doc.add_signature(signatory=KolaysoftSignature())
+
+    supplier = PartyData()
+    supplier.PartyIdentification = PartyIdentification(schemeID='VKN', value='12345678900')
+    supplier.PartyName = name
+    supplier.PostalAddress = PostalAddress(ID='1234567890', StreetName='Papatya Caddesi Yasemin Sokak',
+                                           BuildingNumber='21', CitySubdivisionName='Beşiktaş', CityName='İstanbul',
+                                           PostalZone='34100', Country='Türkiye')
+    supplier.PartyTaxScheme = PartyTaxScheme(TaxScheme=TaxScheme(Name='Büyük Mükellefler'))
+    supplier.Contact = Contact(ElectronicMail='info@gtr.mv', Telephone='555555555', Telefax='666666666')
+    doc.add_accounting_supplier_party(supplier)
+
+    customer = PartyData()
+    customer.WebsiteURI = 'https://example.com/?a=1&b=2' if full else None
+    customer.PartyIdentification = PartyIdentification(schemeID='TCKN "x"', value='0000510000')
+    customer.PartyName = 'SAGATGRUP YAZILIM VE BİLİŞİM TEKNOLOJİLERİ TİCARET LİMİTED ŞİRKETİ'
+    if full:
+        customer.PostalAddress = PostalAddress(ID='1', StreetName='Atatürk Bulvarı', BuildingNumber='5',
+                                               CitySubdivisionName='Çankaya', CityName='Ankara', PostalZone='06100',
+                                               Country='Türkiye')
+    else:
+        customer.PostalAddress = PostalAddress(CitySubdivisionName='Çankaya', CityName='Ankara')
+    customer.PartyTaxScheme = PartyTaxScheme(TaxScheme=TaxScheme(Name='DOĞANBEY VERGİ DAİRESİ MÜD.'))
+    doc.add_accounting_customer_party(customer)
+
+    if defaults:
+        doc.add_paymentmeans()
+    elif full:
+        doc.add_paymentmeans(PaymentMeans(PaymentMeansCode='1', PaymentDueDate='2024-05-25', PaymentChannelCode='1',
+                                          PayeeFinancialAccount=PayeeFinancialAccount(ID='1', CurrencyCode='TRY',
+                                                                                      PaymentNote='İST Bank Şişli Şubesi')))
+    if full:
+        doc.add_paymentterms(PaymentTerms(Note='20 gün içerisinde ödenecektir.', PaymentDueDate='2024-02-25',
+                                          PenaltySurchargePercent='2', Amount='10', CurrencyID='TRY'))
+        doc.add_paymentterms(PaymentTerms())
+
+    vat = TaxScheme(Name='GERÇEK USULDE KATMA DEĞER VERGİSİ', TaxTypeCode='0015')
+    doc.add_taxtotal(TaxTotal(TaxAmount='0.18', TaxSubtotal=[
+        TaxSubtotal(TaxableAmount='1', TaxAmount='0.18', CalculationSequenceNumeric='1', Percent='18',
+                    TaxCategory=TaxCategory(Name='GERÇEK USULDE KATMA DEĞER VERGİSİ', TaxScheme=vat))]))
+    if full:
+        doc.add_withholdingtaxtotal()
+    doc.add_legalmonetarytotal(MonetaryTotal(LineExtensionAmount='1.00', TaxExclusiveAmount='1.00',
+                                             TaxInclusiveAmount='1.18', AllowanceTotalAmount='0.00' if full else None,
+                                             ChargeTotalAmount='0.00' if full else None, PayableAmount='1.18'))
+
+    for i in range(lines):
+        subtotals = [TaxSubtotal(TaxableAmount='1', TaxAmount='0.18', Percent='18', TaxCategory=TaxCategory(TaxScheme=vat))]
+        if full and i % 2:
+            otv = TaxScheme(Name='ÖTV 4.LİSTE', TaxTypeCode='0074')
+            subtotals.append(TaxSubtotal(TaxableAmount='2', TaxAmount='0.20', Percent='10', TaxCategory=TaxCategory(TaxScheme=otv)))
+        doc.add_invoice_line(InvoiceLine(
+            ID=str(i + 1), InvoicedQuantity='1', InvoicedQuantity_unitCode='C62', LineExtensionAmount='1.00',
+            Item=Item(Name=f'Mal ya da hizmetin adı <{i}> & co',
+                      SellersItemIdentification=ItemIdentification(ID=f'STK{i:06d}') if i % 3 else None),
+            Price=Price(PriceAmount='1.00'),
+            TaxTotal=TaxTotal(TaxAmount='0.18', TaxSubtotal=subtotals) if full or i % 2 else None))
+    return doc
+
+
+CASES = {
+    'temel-1': dict(lines=1),
+    'earsiv-5-sade': dict(lines=5, profile='EARSIVFATURA', full=False),
+    'temel-25': dict(lines=25),
+    'bos-ad': dict(lines=2, name=''),
+    'varsayilan': dict(lines=2, defaults=True),
+}
+
+
+def reference(**kwargs) -> bytes:
+    doc = build(UBLInvoice(), **kwargs)
+    return etree.tostring(doc.root, pretty_print=True, encoding='UTF-8')
+
+
+def emitted(**kwargs) -> bytes:
+    return build(UBLInvoiceEmitter(), **kwargs).tobytes()
+
+
+def check() -> bool:
+    ok = True
+    for name, kwargs in CASES.items():
+        expected, actual = reference(**kwargs), emitted(**kwargs)
+        if expected == actual:
+            print(f'{name:<16} identical ({len(actual)} bytes)')
+            continue
+        ok = False
+        print(f'{name:<16} DIFFERENT')
+        sys.stdout.writelines(difflib.unified_diff(expected.decode().splitlines(True), actual.decode().splitlines(True),
+                                                   'lxml', 'emitter'))
+    return ok
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='UBLInvoiceEmitter / UBLInvoice karşılaştırması')
+    parser.add_argument('--check', action='store_true', help='Yalnızca çıktıların aynı olduğunu kontrol et')
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args(argv)
+
+    if not check():
+        return 1
+    if args.check:
+        return 0
+
+    print(f"\n{'case':<16} {'lxml ms':>9} {'emitter ms':>11} {'speedup':>8}")
+    for name, kwargs in CASES.items():
+        lxml_time = timeit.timeit(lambda: reference(**kwargs), number=args.number) / args.number * 1000
+        emitter_time = timeit.timeit(lambda: emitted(**kwargs), number=args.number) / args.number * 1000
+        print(f'{name:<16} {lxml_time:>9.3f} {emitter_time:>11.3f} {lxml_time / emitter_time:>7.1f}x')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,216 @@
+# Fatura oluşturmanın aşama aşama bellek kullanımı: kalem başına bayt (model nesneleri, lxml ağacı, xml() metni,
+# dump_xml ve şema doğrulaması); ağaç, doğrudan metin (UBLInvoiceEmitter) ve akış (UBLInvoice.write) modları.
+# Gelen faturaların okunması da ölçülür: UBLInvoice.from_xml ve kalem kalem iter_invoice_lines.
+#
+#   python benchmarks/memory.py                                   # 1..100000 kalem, üç mod
+#   python benchmarks/memory.py --lines 1000 50000 --modes tree stream --json bellek.json
+#   python benchmarks/memory.py --tracemalloc                     # Python nesnelerinin payı da yazılır
+#
+# Modlar ve aşamalar (önceki aşamaların nesneleri bellekte tutulur, gerçek bir worker gibi):
+#   tree     models (InvoiceLine listesi), tree (add_invoice_line), xml (xml() metni), dump_xml, validate
+#   emitter  models, emit (UBLInvoiceEmitter.add_invoice_line), xml, tobytes, validate (okurken doğrulama)
+#   stream   write (kalemler generator'dan UBLInvoice.write ile dosyaya), validate (dosyadan okurken doğrulama)
+#   read     write (stream gibi), from_xml (bütün kalemler ParsedInvoice'ta)
+#   iterlines write (stream gibi), iter_lines (iter_invoice_lines ile kalemler tek tek okunur, tutulmaz)
+#
+# Her (mod, kalem sayısı) ayrı bir süreçte ölçülür. Şema başta derlenir ve taban değere dahildir.
+# retained: aşamada süreçte kalan bellek artışı (RSS, /proc/self/statm); total: taban değerden fark; peak: aşama
+# sonuna kadar ulaşılan tepe RSS'in taban değerden farkı (ru_maxrss). Sonda mod başına kalem başına tepe bellek
+# (worker bellek sınırı için) özetlenir. libxml2 ayırmaları RSS'te görünür, tracemalloc'ta görünmez;
+# --tracemalloc açıkken RSS değerlerine izleme maliyeti de eklenir.
+
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from builders import header, parties_and_totals, invoice_line, invoice_lines
+from ubl_tr_py.UBLInvoice import UBLInvoice
+from ubl_tr_py.emitter import UBLInvoiceEmitter
+from ubl_tr_py.reader import iter_invoice_lines
+from ubl_tr_py.schemas import get_schema
+from ubl_tr_py.validate_xml import validate_bytes, validate_file
+
+LINE_COUNTS = (1, 10, 100, 1000, 10000, 100000)
+MODES = ('tree', 'emitter', 'stream', 'read', 'iterlines')
+
+
+def _rss() -> int:
+    # Anlık RSS (bayt); /proc olmayan sistemlerde tepe değer.
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return _max_rss()
+
+
+def _max_rss() -> int:
+    import resource
+    # Linux'ta KB, macOS'ta bayt.
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return max_rss if sys.platform == 'darwin' else max_rss * 1024
+
+
+class Stages:
+    """Aşama başına kalan/tepe bellek ve (açıksa) Python nesnelerini kaydeder."""
+
+    def __init__(self, lines: int, python: bool = False):
+        self.lines = lines
+        self.python = python
+        self.results = []
+        gc.collect()
+        if python:
+            tracemalloc.start()
+        self.baseline = self.previous = _rss()
+        self.baseline_peak = _max_rss()
+
+    def stage(self, name: str, size: int = None):
+        gc.collect()
+        rss = _rss()
+        result = {
+            'stage': name,
+            'retained_kb': round((rss - self.previous) / 1024),
+            'total_kb': round((rss - self.baseline) / 1024),
+            'peak_kb': round(max(_max_rss() - self.baseline_peak, 0) / 1024),
+            'bytes_per_line': round((rss - self.previous) / self.lines, 1),
+        }
+        if size is not None:
+            result['output_bytes'] = size
+        if self.python:
+            result['python_kb'] = round(tracemalloc.get_traced_memory()[0] / 1024)
+        self.results.append(result)
+        self.previous = rss
+
+
+def run_tree(lines: int, stages: Stages, path: str):
+    models = invoice_lines(lines)
+    stages.stage('models')
+    doc = parties_and_totals(header(), lines)
+    doc.add_invoice_line(models)
+    stages.stage('tree')
+    text = doc.xml()
+    stages.stage('xml', len(text.encode('utf-8')))
+    size = doc.dump_xml()
+    stages.stage('dump_xml', size)
+    errors = doc.validate()
+    assert not errors, errors[:3]
+    stages.stage('validate')
+    return models, doc, text
+
+
+def run_emitter(lines: int, stages: Stages, path: str):
+    models = invoice_lines(lines)
+    stages.stage('models')
+    doc = parties_and_totals(header(UBLInvoiceEmitter()), lines)
+    doc.add_invoice_line(models)
+    stages.stage('emit')
+    text = doc.xml()
+    stages.stage('xml', len(text.encode('utf-8')))
+    data = doc.tobytes()
+    stages.stage('tobytes', len(data))
+    result = validate_bytes(data, parse_validate=True)
+    assert result['valid'], result
+    stages.stage('validate')
+    return models, doc, text, data
+
+
+def run_stream(lines: int, stages: Stages, path: str):
+    doc = parties_and_totals(header(), lines)
+    doc.write(path, invoice_lines=(invoice_line(i) for i in range(lines)))
+    stages.stage('write', os.path.getsize(path))
+    result = validate_file(path, parse_validate=True)
+    assert result['valid'], result
+    stages.stage('validate')
+    return doc
+
+
+def run_read(lines: int, stages: Stages, path: str):
+    doc = parties_and_totals(header(), lines)
+    doc.write(path, invoice_lines=(invoice_line(i) for i in range(lines)))
+    stages.stage('write', os.path.getsize(path))
+    invoice = UBLInvoice.from_xml(path)
+    assert len(invoice.InvoiceLine) == lines
+    stages.stage('from_xml')
+    return doc, invoice
+
+
+def run_iterlines(lines: int, stages: Stages, path: str):
+    doc = parties_and_totals(header(), lines)
+    doc.write(path, invoice_lines=(invoice_line(i) for i in range(lines)))
+    stages.stage('write', os.path.getsize(path))
+    with iter_invoice_lines(path) as parsed_lines:
+        count = sum(1 for _ in parsed_lines)
+    assert count == lines
+    stages.stage('iter_lines')
+    return doc
+
+
+RUNNERS = {'tree': run_tree, 'emitter': run_emitter, 'stream': run_stream, 'read': run_read,
+           'iterlines': run_iterlines}
+
+
+def run_mode(mode: str, lines: int, python: bool = False) -> dict:
+    """Alt süreçte çalışır."""
+    get_schema('Invoice')
+    # İlk faturanın şablon ve önbellek ayırmaları taban değere girsin.
+    RUNNERS[mode](1, Stages(1), os.path.join(os.getcwd(), 'isinma.xml'))
+    stages = Stages(lines, python)
+    kept = RUNNERS[mode](lines, stages, os.path.join(os.getcwd(), 'fatura.xml'))
+    del kept
+    peak = stages.results[-1]['peak_kb'] * 1024
+    return {'mode': mode, 'lines': lines, 'peak_kb': peak // 1024, 'peak_bytes_per_line': round(peak / lines, 1),
+            'stages': stages.results}
+
+
+def measure(mode: str, lines: int, python: bool = False) -> dict:
+    # Tepe RSS süreç başına tutulduğundan her ölçüm temiz bir süreçte yapılır; dump_xml çalışma dizinine yazar.
+    command = [sys.executable, os.path.abspath(__file__), '--child', mode, str(lines)]
+    if python:
+        command.append('--tracemalloc')
+    with tempfile.TemporaryDirectory() as directory:
+        return json.loads(subprocess.check_output(command, cwd=directory))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Aşama aşama fatura bellek kullanımı')
+    parser.add_argument('--lines', type=int, nargs='+', default=LINE_COUNTS)
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES)
+    parser.add_argument('--tracemalloc', action='store_true', help='Python nesnelerinin payını da ölç')
+    parser.add_argument('--json', help='Sonuçları bu dosyaya yaz')
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'LINES'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_mode(args.child[0], int(args.child[1]), args.tracemalloc)))
+        return 0
+
+    results = []
+    print(f"{'mode':<9} {'lines':>7} {'stage':<10} {'retained kb':>12} {'total kb':>10} {'peak kb':>10} "
+          f"{'bytes/line':>11} {'output bytes':>13}" + (f" {'python kb':>10}" if args.tracemalloc else ''))
+    for lines in args.lines:
+        for mode in args.modes:
+            result = measure(mode, lines, args.tracemalloc)
+            results.append(result)
+            for stage in result['stages']:
+                print(f"{mode:<9} {lines:>7} {stage['stage']:<10} {stage['retained_kb']:>12} {stage['total_kb']:>10} "
+                      f"{stage['peak_kb']:>10} {stage['bytes_per_line']:>11} {stage.get('output_bytes', ''):>13}"
+                      + (f" {stage['python_kb']:>10}" if args.tracemalloc else ''), flush=True)
+
+    print(f"\n{'mode':<9} {'lines':>7} {'peak kb':>10} {'peak bytes/line':>16}")
+    for result in results:
+        print(f"{result['mode']:<9} {result['lines']:>7} {result['peak_kb']:>10} {result['peak_bytes_per_line']:>16}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
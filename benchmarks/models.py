@@ -0,0 +1,88 @@
+# Model nesnelerinin bellek kullanımı: InvoiceLine başına bayt (tracemalloc).
+#
+#   python benchmarks/models.py                 # 100000 kalem
+#   python benchmarks/models.py --lines 1000000 --json sonuc.json
+#   python benchmarks/models.py --interned      # TaxCategory.of('0015'): kalemler aynı TaxCategory/TaxScheme'yi paylaşır
+#
+# Her kalem gerçek kullanımdaki gibi kendi nesneleriyle oluşturulur: InvoiceLine, Item, ItemIdentification,
+# Price, TaxTotal, TaxSubtotal (liste içinde), TaxCategory, TaxScheme. Metinler kalemler arasında
+# paylaşılmaz, ölçüme dahildir. Tek nesne boyutları da (sys.getsizeof, varsa __dict__ ile) ayrıca yazılır.
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ubl_tr_py.UBLInvoice import (InvoiceLine, Item, ItemIdentification, Price, TaxTotal, TaxSubtotal, TaxCategory,
+                                  TaxScheme, PartyData, PostalAddress)
+
+
+def make_line(i: int, interned: bool = False) -> InvoiceLine:
+    if interned:
+        tax_category = TaxCategory.of('0015')
+    else:
+        tax_category = TaxCategory(TaxScheme=TaxScheme(Name='GERÇEK USULDE KATMA DEĞER VERGİSİ', TaxTypeCode='0015'))
+    subtotal = TaxSubtotal(TaxableAmount=f'{i}.00', TaxAmount=f'{i * 0.2:.2f}', Percent='20',
+                           TaxCategory=tax_category)
+    return InvoiceLine(ID=str(i), InvoicedQuantity='1', InvoicedQuantity_unitCode='C62', LineExtensionAmount=f'{i}.00',
+                       Item=Item(Name=f'Ürün {i}', SellersItemIdentification=ItemIdentification(ID=f'STK{i:08d}')),
+                       Price=Price(PriceAmount=f'{i}.00'),
+                       TaxTotal=TaxTotal(TaxAmount=f'{i * 0.2:.2f}', TaxSubtotal=[subtotal]))
+
+
+def object_size(obj) -> int:
+    # __slots__ kullanan sınıflarda örnek sözlüğü yoktur (__dictoffset__ == 0).
+    size = sys.getsizeof(obj)
+    if type(obj).__dictoffset__:
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def measure(lines: int, interned: bool = False) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [make_line(i, interned) for i in range(lines)]
+    total = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+
+    sample = make_line(1)
+    sizes = {type(obj).__name__: object_size(obj) for obj in (
+        sample, sample.Item, sample.Item.SellersItemIdentification, sample.Price, sample.TaxTotal,
+        sample.TaxTotal.TaxSubtotal[0], sample.TaxTotal.TaxSubtotal[0].TaxCategory,
+        sample.TaxTotal.TaxSubtotal[0].TaxCategory.TaxScheme, PostalAddress(), PartyData())}
+
+    return {
+        'lines': lines,
+        'bytes_per_line': round(total / lines, 1),
+        'objects_per_line': 6 if interned else 8,
+        'interned': interned,
+        'object_sizes': sizes,
+        'python': sys.version.split()[0],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='InvoiceLine başına bellek kullanımı')
+    parser.add_argument('--lines', type=int, default=100000)
+    parser.add_argument('--interned', action='store_true', help='TaxCategory.of ile paylaşılan vergi nesneleri')
+    parser.add_argument('--json', help='Sonucu bu dosyaya yaz')
+    args = parser.parse_args(argv)
+
+    result = measure(args.lines, args.interned)
+    print(f"{result['lines']} lines: {result['bytes_per_line']} bytes/line ({result['objects_per_line']} objects per line)")
+    for name, size in result['object_sizes'].items():
+        print(f'  {name:<20} {size:>5} bytes')
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,262 @@
+# UBLInvoice.from_xml (ubl_tr_py.reader) kontrolü ve hızı: GİB örnek faturaları, saniyede belge.
+#
+#   python benchmarks/reader.py                # önce kontrol, sonra süre ölçümü
+#   python benchmarks/reader.py --check        # yalnızca kontrol; farklılıkta çıkış kodu 1
+#   python benchmarks/reader.py --min-time 5 UBLTR_1.2.1_Paketi/xml/TicariFaturaOrnegi.xml
+#   python benchmarks/reader.py --lines 1000 10000   # ayrıca üretilmiş çok kalemli faturalarda
+#
+# Kontrol, paketteki her Invoice belgesi için:
+#   xpath      okunan modeldeki ana alanlar (kimlikler, taraflar, vergiler, toplamlar, kalemler) etree.parse +
+#              findtext ile ayrıca çıkarılan değerlerle aynı mı
+#   roundtrip  model UBLInvoice add_* metodlarıyla yeniden yazılıp okunduğunda ana alanlar aynı kalıyor mu ve
+#              ikinci yazma/okuma turu modeli değiştirmiyor mu
+#   iter_lines iter_invoice_lines'ın başlığı ve kalemleri from_xml ile aynı mı
+#   header     scan_header'ın alanları etree.parse + findtext ile çıkarılanlarla aynı mı
+# Fatura olmayan belgeler (irsaliye, uygulama yanıtı) için from_xml'in ValueError verdiği kontrol edilir.
+#
+# Süre: from_xml ile etree.parse + aynı alanların findtext ile çıkarılması; scan_header ile yalnızca etree.parse
+# (bütün belgenin ağaca okunması) karşılaştırılır. Örnek faturalar küçüktür (1-8 kalem): scan_header'ın kalemlerden
+# önce durmasının etkisi --lines ile üretilen çok kalemli faturalarda görülür.
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLES = os.path.join(ROOT, 'UBLTR_1.2.1_Paketi', 'xml')
+sys.path.insert(0, ROOT)
+
+from lxml import etree
+
+from builders import header, invoice_line, parties_and_totals
+from ubl_tr_py.UBLInvoice import Model, UBLInvoice
+from ubl_tr_py.reader import INVOICE, CAC, CBC, InvoiceHeader, iter_invoice_lines, scan_header
+
+PARTY_ID_SCHEMES = ('VKN', 'TCKN')
+
+
+def plain(value):
+    """Model nesnelerini karşılaştırma için sözlüğe çevirir."""
+    if isinstance(value, Model):
+        return {type(value).__name__: {name: plain(field) for name, field in value._asdict().items()}}
+    if isinstance(value, list):
+        return [plain(item) for item in value]
+    return value
+
+
+def _party_key(party) -> tuple:
+    if party is None:
+        return None
+    identification = party.PartyIdentification
+    return (identification.schemeID, identification.value) if identification else None, party.PartyName
+
+
+def key_fields(invoice) -> dict:
+    """Okunan modelin ana alanları (bkz. xpath_fields)."""
+    total = invoice.LegalMonetaryTotal
+    return {
+        'header': (invoice.ID, invoice.UUID, invoice.IssueDate, invoice.ProfileID, invoice.InvoiceTypeCode,
+                   invoice.DocumentCurrencyCode, invoice.LineCountNumeric, tuple(invoice.Note)),
+        'supplier': _party_key(invoice.AccountingSupplierParty),
+        'customer': _party_key(invoice.AccountingCustomerParty),
+        'taxes': [(tax_total.TaxAmount, [(subtotal.TaxableAmount, subtotal.TaxAmount, subtotal.Percent,
+                                          subtotal.TaxCategory.TaxScheme.TaxTypeCode)
+                                         for subtotal in tax_total.TaxSubtotal])
+                  for tax_total in invoice.TaxTotal],
+        'total': total and (total.LineExtensionAmount, total.TaxExclusiveAmount, total.TaxInclusiveAmount,
+                            total.AllowanceTotalAmount, total.PayableAmount, total.CurrencyID),
+        'lines': [(line.ID, line.InvoicedQuantity, line.InvoicedQuantity_unitCode, line.LineExtensionAmount,
+                   line.Item.Name, line.Item.SellersItemIdentification and line.Item.SellersItemIdentification.ID,
+                   line.Price.PriceAmount, line.TaxTotal and line.TaxTotal.TaxAmount)
+                  for line in invoice.InvoiceLine],
+    }
+
+
+def _xpath_party(root, tag: str) -> tuple:
+    party = root.find(f'{CAC}{tag}/{CAC}Party')
+    if party is None:
+        return None
+    identifiers = [(identifier.get('schemeID'), identifier.text)
+                   for identifier in party.findall(f'{CAC}PartyIdentification/{CBC}ID')]
+    identifier = next((i for i in identifiers if i[0] in PARTY_ID_SCHEMES), identifiers[0] if identifiers else None)
+    return identifier, party.findtext(f'{CAC}PartyName/{CBC}Name')
+
+
+def xpath_fields(root) -> dict:
+    """key_fields ile aynı alanlar, bütün ağaç üzerinde findtext ile."""
+    total = root.find(CAC + 'LegalMonetaryTotal')
+    lines = []
+    for line in root.iterfind(CAC + 'InvoiceLine'):
+        quantity = line.find(CBC + 'InvoicedQuantity')
+        lines.append((line.findtext(CBC + 'ID'), quantity.text, quantity.get('unitCode'),
+                      line.findtext(CBC + 'LineExtensionAmount'), line.findtext(f'{CAC}Item/{CBC}Name'),
+                      line.findtext(f'{CAC}Item/{CAC}SellersItemIdentification/{CBC}ID'),
+                      line.findtext(f'{CAC}Price/{CBC}PriceAmount'), line.findtext(f'{CAC}TaxTotal/{CBC}TaxAmount')))
+    return {
+        'header': (root.findtext(CBC + 'ID'), root.findtext(CBC + 'UUID'), root.findtext(CBC + 'IssueDate'),
+                   root.findtext(CBC + 'ProfileID'), root.findtext(CBC + 'InvoiceTypeCode'),
+                   root.findtext(CBC + 'DocumentCurrencyCode'), root.findtext(CBC + 'LineCountNumeric'),
+                   tuple(note.text for note in root.iterfind(CBC + 'Note'))),
+        'supplier': _xpath_party(root, 'AccountingSupplierParty'),
+        'customer': _xpath_party(root, 'AccountingCustomerParty'),
+        'taxes': [(tax_total.findtext(CBC + 'TaxAmount'),
+                   [(subtotal.findtext(CBC + 'TaxableAmount'), subtotal.findtext(CBC + 'TaxAmount'),
+                     subtotal.findtext(CBC + 'Percent'),
+                     subtotal.findtext(f'{CAC}TaxCategory/{CAC}TaxScheme/{CBC}TaxTypeCode'))
+                    for subtotal in tax_total.iterfind(CAC + 'TaxSubtotal')])
+                  for tax_total in root.iterfind(CAC + 'TaxTotal')],
+        'total': total is not None and (total.findtext(CBC + 'LineExtensionAmount'),
+                                        total.findtext(CBC + 'TaxExclusiveAmount'),
+                                        total.findtext(CBC + 'TaxInclusiveAmount'),
+                                        total.findtext(CBC + 'AllowanceTotalAmount'),
+                                        total.findtext(CBC + 'PayableAmount'),
+                                        total.find(CBC + 'PayableAmount').get('currencyID')) or None,
+        'lines': lines,
+    }
+
+
+def _xpath_vkn(root, tag: str) -> str:
+    for identifier in root.iterfind(f'{CAC}{tag}/{CAC}Party/{CAC}PartyIdentification/{CBC}ID'):
+        if identifier.get('schemeID') in PARTY_ID_SCHEMES:
+            return identifier.text
+    return None
+
+
+def xpath_header(root) -> InvoiceHeader:
+    """scan_header ile aynı alanlar, bütün ağaç üzerinde findtext ile."""
+    payable = root.find(f'{CAC}LegalMonetaryTotal/{CBC}PayableAmount')
+    return InvoiceHeader(ID=root.findtext(CBC + 'ID'), UUID=root.findtext(CBC + 'UUID'),
+                         IssueDate=root.findtext(CBC + 'IssueDate'), ProfileID=root.findtext(CBC + 'ProfileID'),
+                         InvoiceTypeCode=root.findtext(CBC + 'InvoiceTypeCode'),
+                         SupplierVKN=_xpath_vkn(root, 'AccountingSupplierParty'),
+                         CustomerVKN=_xpath_vkn(root, 'AccountingCustomerParty'),
+                         PayableAmount=None if payable is None else payable.text,
+                         CurrencyID=None if payable is None else payable.get('currencyID'))
+
+
+def rebuild(invoice) -> bytes:
+    """Okunan modeli UBLInvoice add_* metodlarıyla yeniden yazar."""
+    doc = UBLInvoice()
+    doc.add_ubl_extension()
+    doc.add_ubl_version_id(invoice.UBLVersionID)
+    doc.add_customisation_id(invoice.CustomizationID)
+    doc.add_profile_id(invoice.ProfileID)
+    doc.add_id(invoice.ID)
+    doc.add_copy_indicator(invoice.CopyIndicator)
+    doc.add_uuid(invoice.UUID)
+    doc.add_issue_date(invoice.IssueDate)
+    if invoice.IssueTime:
+        doc.add_issue_time(invoice.IssueTime)
+    doc.add_invoice_type_code(invoice.InvoiceTypeCode)
+    for note in invoice.Note:
+        doc.add_note(note)
+    doc.add_document_currency_code(invoice.DocumentCurrencyCode)
+    doc.add_line_count_numeric(invoice.LineCountNumeric)
+    for reference in invoice.DespatchDocumentReference:
+        doc.add_despatch_document_reference(reference.id, reference.issue_date)
+    doc.add_accounting_supplier_party(invoice.AccountingSupplierParty)
+    doc.add_accounting_customer_party(invoice.AccountingCustomerParty)
+    for payment_means in invoice.PaymentMeans:
+        doc.add_paymentmeans(payment_means)
+    doc.add_paymentterms(invoice.PaymentTerms)
+    for tax_total in invoice.TaxTotal:
+        doc.add_taxtotal(tax_total)
+    doc.add_legalmonetarytotal(invoice.LegalMonetaryTotal)
+    doc.add_invoice_line(invoice.InvoiceLine)
+    return doc.tobytes()
+
+
+def check(paths: list) -> bool:
+    ok = True
+    for path in paths:
+        name = os.path.basename(path)
+        root = etree.parse(path).getroot()
+        if root.tag != INVOICE:
+            try:
+                UBLInvoice.from_xml(path)
+                status = 'NOT REJECTED'
+            except ValueError:
+                status = 'rejected (not an Invoice)'
+            print(f'{name:<40} {status}', file=sys.stderr)
+            ok = ok and status != 'NOT REJECTED'
+            continue
+
+        invoice = UBLInvoice.from_xml(path)
+        expected = key_fields(invoice)
+        problems = []
+        if expected != xpath_fields(root):
+            problems.append('xpath')
+        with open(path, 'rb') as f, iter_invoice_lines(f) as lines:
+            streamed = plain(lines.header), plain(list(lines))
+        if streamed != (plain(UBLInvoice.from_xml(path, invoice_lines=False)), plain(invoice.InvoiceLine)):
+            problems.append('iter_lines')
+        if plain(scan_header(path)) != plain(xpath_header(root)):
+            problems.append('header')
+        try:
+            again = UBLInvoice.from_xml(rebuild(invoice))
+            if key_fields(again) != expected:
+                problems.append('roundtrip fields')
+            if plain(UBLInvoice.from_xml(rebuild(again))) != plain(again):
+                problems.append('roundtrip model')
+        except Exception as e:
+            problems.append(f'roundtrip {type(e).__name__}: {e}')
+
+        print(f'{name:<40} {len(invoice.InvoiceLine):>3} lines  {", ".join(problems) or "identical"}',
+              file=sys.stderr)
+        ok = ok and not problems
+    return ok
+
+
+def benchmark(paths: list, min_time: float):
+    invoices = [path for path in paths if etree.parse(path).getroot().tag == INVOICE]
+    size = sum(os.path.getsize(path) for path in invoices)
+    for label, read in (('from_xml', UBLInvoice.from_xml),
+                        ('etree.parse+findtext', lambda path: xpath_fields(etree.parse(path).getroot())),
+                        ('scan_header', scan_header),
+                        ('etree.parse', etree.parse)):
+        rounds = 0
+        start = time.perf_counter()
+        while True:
+            for path in invoices:
+                read(path)
+            rounds += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        print(f'{label:<22} {rounds * len(invoices) / elapsed:>9.0f} docs/s {rounds * size / elapsed / 1e6:>7.1f} MB/s',
+              file=sys.stderr)
+
+
+def generated_invoice(directory: str, lines: int) -> str:
+    """Kalemleri UBLInvoice.write ile akış olarak yazılmış lines kalemli fatura."""
+    path = os.path.join(directory, f'uretilen-{lines}.xml')
+    doc = parties_and_totals(header(), lines)
+    doc.write(path, invoice_lines=(invoice_line(i) for i in range(lines)))
+    return path
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='UBLInvoice.from_xml kontrolü ve hızı')
+    parser.add_argument('files', nargs='*', help='Varsayılan: UBLTR_1.2.1_Paketi/xml altındaki bütün belgeler')
+    parser.add_argument('--check', action='store_true', help='Yalnızca kontrol')
+    parser.add_argument('--min-time', type=float, default=2.0, help='Okuyucu başına en az süre (saniye)')
+    parser.add_argument('--lines', type=int, nargs='*', default=(),
+                        help='Ayrıca bu kadar kalemli üretilmiş faturalarda ölç, örn. --lines 1000 10000')
+    args = parser.parse_args(argv)
+
+    paths = args.files or sorted(glob.glob(os.path.join(SAMPLES, '*.xml')))
+    ok = check(paths)
+    if not args.check and ok:
+        benchmark(paths, args.min_time)
+        with tempfile.TemporaryDirectory() as directory:
+            for lines in args.lines:
+                print(f'\n{lines} kalemli fatura', file=sys.stderr)
+                benchmark([generated_invoice(directory, lines)], args.min_time)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
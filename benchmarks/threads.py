@@ -0,0 +1,142 @@
+# Paylaşılan model nesneleriyle thread havuzunda fatura üretimi: çıktı deterministik mi, girdiler değişiyor mu?
+#
+#   python benchmarks/threads.py                         # 8 thread, 200 fatura, 5 tur
+#   python benchmarks/threads.py --threads 16 --invoices 1000 --rounds 3
+#
+# Tedarikçi, müşteri, ödeme bilgileri, TaxTotal ve kalemler bir kez oluşturulur ve bütün faturalarda kopyalanmadan
+# kullanılır (kalem TaxSubtotal'ları liste değil tek nesne olarak verilir). Her fatura önce sırayla oluşturulur;
+# sonra aynı faturalar thread havuzunda karışık sırayla tekrar oluşturulur ve çıktılar bayt bayt karşılaştırılır.
+# UBLInvoice ve UBLInvoiceEmitter, paylaşılan FragmentCache ile ve önbelleksiz denenir. Sonunda paylaşılan
+# nesnelerin pickle çıktısı başlangıçtakiyle karşılaştırılır. Farklılıkta çıkış kodu 1.
+
+import argparse
+import os
+import pickle
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ubl_tr_py.UBLInvoice import (UBLInvoice, KolaysoftSignature, PartyData, PartyIdentification, PostalAddress,
+                                  PartyTaxScheme, TaxScheme, Contact, PaymentMeans, PayeeFinancialAccount,
+                                  TaxTotal, TaxSubtotal, TaxCategory, MonetaryTotal, InvoiceLine, Item,
+                                  ItemIdentification, Price)
+from ubl_tr_py.emitter import UBLInvoiceEmitter
+from ubl_tr_py.fragments import FragmentCache
+
+
+def shared_parts(lines: int = 20) -> dict:
+    supplier = PartyData(PartyIdentification=PartyIdentification(schemeID='VKN', value='12345678900'),
+                         PartyName='GÖTÜR LTD. ŞTİ.',
+                         PostalAddress=PostalAddress(ID='1', StreetName='Papatya Caddesi', BuildingNumber='21',
+                                                     CitySubdivisionName='Beşiktaş', CityName='İstanbul',
+                                                     PostalZone='34100', Country='Türkiye'),
+                         PartyTaxScheme=PartyTaxScheme(TaxScheme=TaxScheme(Name='Büyük Mükellefler')),
+                         Contact=Contact(ElectronicMail='info@gtr.mv', Telephone='555555555'))
+    customers = [PartyData(PartyIdentification=PartyIdentification(schemeID='TCKN', value=f'{10000000000 + i}'),
+                           PartyName=f'Müşteri {i}',
+                           PostalAddress=PostalAddress(CitySubdivisionName='Çankaya', CityName='Ankara',
+                                                       Country='Türkiye'),
+                           PartyTaxScheme=PartyTaxScheme(TaxScheme=TaxScheme(Name='DOĞANBEY VERGİ DAİRESİ MÜD.')))
+                 for i in range(5)]
+    payment_means = PaymentMeans(PaymentMeansCode='1', PaymentDueDate='2024-05-25',
+                                 PayeeFinancialAccount=PayeeFinancialAccount(ID='TR1', CurrencyCode='TRY',
+                                                                             PaymentNote='İST Bank'))
+    vat = TaxCategory.of('0015')
+    tax_total = TaxTotal(TaxAmount=f'{lines * 0.2:.2f}',
+                         TaxSubtotal=TaxSubtotal(TaxableAmount=f'{lines}.00', TaxAmount=f'{lines * 0.2:.2f}',
+                                                 CalculationSequenceNumeric='1', Percent='20',
+                                                 TaxCategory=TaxCategory(Name='KDV', TaxScheme=vat.TaxScheme)))
+    monetary_total = MonetaryTotal(LineExtensionAmount=f'{lines}.00', TaxExclusiveAmount=f'{lines}.00',
+                                   TaxInclusiveAmount=f'{lines * 1.2:.2f}', PayableAmount=f'{lines * 1.2:.2f}')
+    invoice_lines = [InvoiceLine(ID=str(i + 1), InvoicedQuantity='1', InvoicedQuantity_unitCode='C62',
+                                 LineExtensionAmount='1.00',
+                                 Item=Item(Name=f'Ürün {i % 7}', SellersItemIdentification=ItemIdentification(
+                                     ID=f'STK{i % 7:06d}')),
+                                 Price=Price(PriceAmount='1.00'),
+                                 TaxTotal=TaxTotal(TaxAmount='0.20', TaxSubtotal=TaxSubtotal(
+                                     TaxableAmount='1.00', TaxAmount='0.20', Percent='20', TaxCategory=vat)))
+                     for i in range(lines)]
+    return {'supplier': supplier, 'customers': customers, 'payment_means': payment_means, 'tax_total': tax_total,
+            'monetary_total': monetary_total, 'invoice_lines': invoice_lines}
+
+
+def build(doc, parts: dict, n: int):
+    doc.add_ubl_extension()
+    doc.add_ubl_version_id()
+    doc.add_customisation_id()
+    doc.add_profile_id('TEMELFATURA')
+    doc.add_id(f'GTR2024{n:09d}')
+    doc.add_copy_indicator('false')
+    doc.add_uuid(f'00000000-0000-0000-0000-{n:012d}')
+    doc.add_issue_date('2024-05-05')
+    doc.add_invoice_type_code('SATIS')
+    doc.add_document_currency_code('TRY')
+    doc.add_line_count_numeric(str(len(parts['invoice_lines'])))
+    doc.add_signature(signatory=KolaysoftSignature())
+    doc.add_accounting_supplier_party(parts['supplier'])
+    doc.add_accounting_customer_party(parts['customers'][n % len(parts['customers'])])
+    doc.add_paymentmeans(parts['payment_means'])
+    doc.add_taxtotal(parts['tax_total'])
+    doc.add_legalmonetarytotal(parts['monetary_total'])
+    doc.add_invoice_line(parts['invoice_lines'])
+    return doc
+
+
+MODES = {
+    'lxml': lambda cache: UBLInvoice(fragment_cache=cache),
+    'emitter': lambda cache: UBLInvoiceEmitter(fragment_cache=cache),
+}
+
+
+def serialize(doc) -> bytes:
+    return doc.tobytes()
+
+
+def run(threads: int, invoices: int, rounds: int, lines: int) -> bool:
+    parts = shared_parts(lines)
+    snapshot = pickle.dumps(parts)
+    ok = True
+    for mode, new_doc in MODES.items():
+        for cached in (False, True):
+            cache = FragmentCache() if cached else None
+
+            def make(n: int) -> bytes:
+                return serialize(build(new_doc(cache), parts, n))
+
+            expected = [make(n) for n in range(invoices)]
+            mismatches = 0
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                for round_number in range(rounds):
+                    order = list(range(invoices))
+                    random.Random(round_number).shuffle(order)
+                    for n, output in zip(order, pool.map(make, order)):
+                        mismatches += output != expected[n]
+            elapsed = time.perf_counter() - start
+            label = f'{mode}{"+cache" if cached else ""}'
+            print(f'{label:<14} {rounds * invoices} invoices on {threads} threads in {elapsed:.2f}s: '
+                  f'{"deterministic" if not mismatches else f"{mismatches} DIFFERENT"}', file=sys.stderr)
+            ok = ok and not mismatches
+
+    unchanged = pickle.dumps(parts) == snapshot
+    print(f'shared inputs  {"unchanged" if unchanged else "MODIFIED"}', file=sys.stderr)
+    return ok and unchanged
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Paylaşılan model nesneleriyle thread havuzunda fatura üretimi')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--invoices', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--lines', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    ok = run(args.threads, args.invoices, args.rounds, args.lines)
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+# Doğrulama modlarının karşılaştırması: ayrıştır-sonra-doğrula ile okurken doğrula (--parse-validate).
+#
+#   python benchmarks/validation.py
+#   python benchmarks/validation.py UBLTR_1.2.1_Paketi/xml/HKS-Ornek1.xml --repeat 50
+#
+# Dosya verilmezse GİB örneklerinden iki belge kullanılır ve TicariFaturaOrnegi.xml kalemleri
+# çoğaltılarak büyük bir geçerli fatura ile başında hata olan bir kopyası üretilir.
+# Her mod ayrı bir süreçte çalışır; tepe bellek şema derlendikten sonraki ru_maxrss artışıdır
+# (libxml2 ayırmaları tracemalloc'a görünmez).
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLES = os.path.join(ROOT, 'UBLTR_1.2.1_Paketi', 'xml')
+sys.path.insert(0, ROOT)
+
+MODES = ('parse-then-validate', 'parse-validate')
+
+
+def make_corpus(directory: str, lines: int = 20000) -> list:
+    with open(os.path.join(SAMPLES, 'TicariFaturaOrnegi.xml'), 'rb') as f:
+        source = f.read()
+
+    invoice_lines = re.findall(rb'<cac:InvoiceLine>.*?</cac:InvoiceLine>\s*', source, re.S)
+    head = source[:source.index(invoice_lines[0])]
+    body = b''.join(invoice_lines) * (lines // len(invoice_lines))
+    large = head + body + b'</Invoice>'
+    broken = large.replace(b'<cbc:UBLVersionID>', b'<cbc:Bilinmeyen/><cbc:UBLVersionID>', 1)
+
+    paths = [os.path.join(SAMPLES, 'HKS-Ornek1.xml'), os.path.join(SAMPLES, 'TicariFaturaOrnegi.xml')]
+    for name, data in (('buyuk-gecerli.xml', large), ('buyuk-hatali.xml', broken)):
+        path = os.path.join(directory, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        paths.append(path)
+    return paths
+
+
+def run_mode(mode: str, path: str, repeat: int) -> dict:
+    """Alt süreçte çalışır: şemayı derler, dosyayı repeat kez doğrular."""
+    import resource
+    from ubl_tr_py.validate_xml import _init_worker, validate_file
+
+    _init_worker()
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = validate_file(path, parse_validate=mode == 'parse-validate')
+        timings.append(time.perf_counter() - started)
+
+    return {
+        'mode': mode,
+        'file': os.path.basename(path),
+        'size': result['size'],
+        'valid': result['valid'],
+        'median_ms': round(statistics.median(timings) * 1000, 3),
+        'peak_rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline,
+    }
+
+
+def measure(mode: str, path: str, repeat: int) -> dict:
+    # Tepe bellek süreç başına tutulduğundan her ölçüm temiz bir süreçte yapılır.
+    output = subprocess.check_output([sys.executable, __file__, '--child', mode, path, '--repeat', str(repeat)])
+    return json.loads(output)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Doğrulama modlarının karşılaştırması: ayrıştır-sonra-doğrula ve okurken doğrula')
+    parser.add_argument('files', nargs='*', help='Doğrulanacak dosyalar (varsayılan: örnekler + üretilen büyük belge)')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--lines', type=int, default=20000, help='Üretilen büyük faturanın kalem sayısı')
+    parser.add_argument('--json', action='store_true', help='Sonuçları JSON olarak yazdır')
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'FILE'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(run_mode(args.child[0], args.child[1], args.repeat)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        paths = args.files or make_corpus(directory, args.lines)
+        results = [measure(mode, path, args.repeat) for path in paths for mode in MODES]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'file':<24} {'size':>10} {'valid':>6} {'mode':<20} {'median ms':>10} {'peak rss kb':>12}")
+    for r in results:
+        print(f"{r['file']:<24} {r['size']:>10} {str(r['valid']):>6} {r['mode']:<20} {r['median_ms']:>10} {r['peak_rss_kb']:>12}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,7 +6,10 @@ with open('requirements.txt') as f:
 setup(
     name="ubl-tr-py",
     version='0.1.0',
-    packages=find_packages(),
+    packages=find_packages() + ['ubl_tr_py.xsdrt'],
+    # GİB şema paketi kurulumda ubl_tr_py/xsdrt altına kopyalanır, bkz. ubl_tr_py/schemas.py
+    package_dir={'ubl_tr_py.xsdrt': 'UBLTR_1.2.1_Paketi/xsdrt'},
+    package_data={'ubl_tr_py.xsdrt': ['common/*.xsd', 'maindoc/*.xsd']},
     install_requires=required,
 
     entry_points=None,
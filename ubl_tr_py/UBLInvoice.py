@@ -20,18 +20,144 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import copy
+from decimal import ROUND_HALF_UP
+from types import MappingProxyType
+
 from lxml import etree
-import os
-from typing import Union, List, Any, Optional
+from typing import Union, List, Any, Optional, NamedTuple, Iterable, Dict, Mapping, Tuple
+
+from .codelists import get_code_list
+from .columns import ColumnTotals, VAT_TAX_SCHEME_NAME, VAT_TAX_TYPE_CODE, frame_columns, line_columns
+from .fragments import FragmentCache, customer_party_key, item_key, line_tax_category_key
+from .instrumentation import Instrumentation, instrument
+from .schemas import get_schema, schema_path
+
+xsd_path = schema_path('Invoice')
+
+
+def __getattr__(name):
+    # Şema artık import sırasında derlenmiyor; eski `UBLInvoice.schema` erişimi ilk kullanımda derler.
+    if name == 'schema':
+        return get_schema('Invoice')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class Model:
+    """
+    Model sınıflarının tabanı. Alt sınıflar niteliklerini __slots__ ile tanımlar; örneklerde __dict__ bulunmaz,
+    bir kalemin nesneleri (InvoiceLine, Item, Price, TaxTotal, ...) daha az bellek kaplar. Tanımlı olmayan bir
+    niteliğe atama AttributeError verir.
+    """
+    __slots__ = ()
+
+    def _asdict(self) -> Dict[str, Any]:
+        """Nitelik adı -> değer, __slots__ sırasıyla (hata ayıklama ve vars() yerine kullanım için)."""
+        model = getattr(type(self), '_model', type(self))
+        return {name: getattr(self, name, None) for cls in reversed(model.__mro__)
+                for name in getattr(cls, '__slots__', ())}
+
+    @classmethod
+    def interned(cls, *args, **kwargs):
+        """
+        Aynı değerler için her zaman aynı, değiştirilemez örneği döndürür (flyweight). Parametreler sınıfın
+        kendi parametreleridir; Model türündeki değerler de paylaşılan örneklerine çevrilir. Bkz. Interned.
 
-module_path = os.path.dirname(__file__)
-parent_path = os.path.dirname(module_path)
-xsd_path = os.path.join(parent_path, "UBLTR_1.2.1_Paketi", "xsdrt", "maindoc", "UBL-Invoice-2.1.xsd")
-schema_doc = etree.parse(xsd_path)
-schema = etree.XMLSchema(schema_doc)
+            TaxCategory.interned(TaxExemptionReasonCode='351', TaxScheme=TaxScheme.of('0015'))
+        """
+        return _intern(cls(*args, **kwargs))
+
+
+# Paylaşılan değer nesneleri: (model sınıfı, değerler) -> örnek. Bkz. Model.interned.
+_INTERNED: Dict[tuple, Model] = {}
+_INTERNED_CLASSES: Dict[type, type] = {}
 
 
-class Country:
+class Interned:
+    """
+    Model.interned ile oluşturulan paylaşılan örneklerin sınıfı; her model sınıfı için bir alt sınıf üretilir
+    (adı modelin adıdır, isinstance(x, TaxScheme) geçerlidir).
+
+    Örnekler değiştirilemez ve değerleriyle hash'lenir; hash bir kez hesaplanır. Aynı değerli iki paylaşılan örnek
+    zaten aynı nesne olduğundan karşılaştırma kimlikle O(1) yapılır. Düz model örnekleri (Model) de kimlikle
+    karşılaştırıldığından paylaşılan bir örnek, aynı değerli düz örneğe eşit değildir; karşılaştırmak için
+    Model.interned ile paylaşılan örneğe çevrilmelidir. Kopyalama aynı nesneyi döndürür, pickle ile aktarılan
+    örnek karşı tarafta yeniden paylaşılan örneğe bağlanır.
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is interned and cannot be modified')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'{type(self).__name__} is interned and cannot be modified')
+
+    def __eq__(self, other):
+        return self is other or NotImplemented
+
+    def __hash__(self):
+        return self._hash
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def __reduce__(self):
+        return _unpickle_interned, (self._model, tuple(self._asdict().items()))
+
+    def __repr__(self):
+        values = ', '.join(f'{name}={value!r}' for name, value in self._asdict().items() if value is not None)
+        return f'{type(self).__name__}.interned({values})'
+
+
+def _interned_class(model: type) -> type:
+    interned = _INTERNED_CLASSES.get(model)
+    if interned is None:
+        interned = type(model.__name__, (Interned, model), {'__slots__': ('_hash',), '__module__': model.__module__,
+                                                            '__doc__': model.__doc__, '_model': model})
+        interned = _INTERNED_CLASSES.setdefault(model, interned)
+    return interned
+
+
+def _intern(instance: Model) -> Model:
+    if isinstance(instance, Interned):
+        return instance
+    model = type(instance)
+    values = []
+    for name, value in instance._asdict().items():
+        if isinstance(value, Model):
+            value = _intern(value)
+        elif isinstance(value, list):
+            raise TypeError(f'{model.__name__}.{name} is a list, only scalar values and models can be interned')
+        values.append((name, value))
+
+    key = (model, tuple(value for _, value in values))
+    shared = _INTERNED.get(key)
+    if shared is None:
+        shared = object.__new__(_interned_class(model))
+        for name, value in values:
+            object.__setattr__(shared, name, value)
+        object.__setattr__(shared, '_hash', hash(key))
+        # Başka bir thread aynı anda eklediyse onunki kullanılır.
+        shared = _INTERNED.setdefault(key, shared)
+    return shared
+
+
+def _unpickle_interned(model: type, values: tuple) -> Model:
+    instance = object.__new__(model)
+    for name, value in values:
+        setattr(instance, name, value)
+    return _intern(instance)
+
+
+def _tax_type_name(tax_type_code: str) -> Optional[str]:
+    # Vergi kodu -> vergi adı, bkz. codelists.TAX_TYPE_CODES.
+    return get_code_list('TaxTypeCode').name_of(tax_type_code)
+
+
+class Country(Model):
     """
     Ülke bilgisi girilecektir.
     2.2.12 Country Ülke
@@ -46,11 +172,14 @@ class Country:
         <cbc:Name>Türkiye</cbc:Name>
     </cac:Country>
     """
+
+    __slots__ = ('Name', 'IdentificationCode')
+
     def __init__(self, Name: str, IdentificationCode: str = None):
         self.Name = Name
         self.IdentificationCode = IdentificationCode
 
-class Address:
+class Address(Model):
     """
     Bu eleman adres bilgilerinin tanımlanmasında kullanılacaktır.
     2.2.1 Adress Adres | UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 12/81
@@ -86,6 +215,9 @@ class Address:
     </cac:PostalAddress>
     """
 
+    __slots__ = ('id', 'postbox', 'room', 'street_name', 'block_name', 'building_name', 'building_number',
+                 'city_subdivision_name', 'city_name', 'postal_zone', 'region', 'district', 'country')
+
     def __init__(self, id: str = None, postbox: str = None, room: str = None, street_name: str = None, block_name: str = None,
                 building_name: str = None, building_number: Union[str, List[str]] = None, city_subdivision_name: str = None,
                 city_name: str = None, postal_zone: str = None, region: str = None, district: str = None, country: Country = None):
@@ -103,7 +235,7 @@ class Address:
         self.district = district
         self.country = country
 
-class Location:
+class Location(Model):
     """
     2.2.35 Location Konum Mekan bilgisi girilir. | UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 46/81
 
@@ -127,11 +259,13 @@ class Location:
     </cac:Location>
     """
 
+    __slots__ = ('id', 'address')
+
     def __init__(self, id: str = None, address: Address = None):
         self.id = id
         self.address = address
 
-class PostalAddress:
+class PostalAddress(Model):
     """
     Bu eleman adres bilgilerinin tanımlanmasında kullanılacaktır.
 
@@ -180,6 +314,10 @@ class PostalAddress:
             </cac:Country>
         </cac:PostalAddress>
     """
+
+    __slots__ = ('id', 'postbox', 'room', 'street_name', 'block_name', 'building_name', 'building_number',
+                 'city_subdivision_name', 'city_name', 'postal_zone', 'region', 'district', 'country')
+
     def __init__(self, ID: str = None, Postbox: str = None, Room: str = None, StreetName: str = None,
                 BlockName: str = None, BuildingName: str = None, BuildingNumber: str = None,
                 CitySubdivisionName: str = None, CityName: str = None, PostalZone: str = None,
@@ -198,7 +336,7 @@ class PostalAddress:
         self.district = District
         self.country = Country
 
-class TaxScheme:
+class TaxScheme(Model):
     """
     Bu eleman aracılığıyla vergi dairesi ile ilgili bilgiler verilebileceği gibi vergi ile ilgili bilgiler de verilebilir.
     Bu elemanın farklı kullanımları için ilgili belge açıklamalarına bakınız.
@@ -228,12 +366,40 @@ class TaxScheme:
                 </cac:TaxScheme>
     """
 
+    __slots__ = ('ID', 'Name', 'TaxTypeCode')
+
     def __init__(self, ID: str = None, Name: str = None, TaxTypeCode: str = None):
         self.ID = ID
         self.Name = Name
         self.TaxTypeCode = TaxTypeCode
 
-class PartyTaxScheme:
+    @classmethod
+    def of(cls, tax_type_code: str, name: str = None) -> 'TaxScheme':
+        """
+        Vergi kodu için paylaşılan, değiştirilemez TaxScheme. Her kalemde yeni nesne oluşturmak yerine kullanılır.
+
+            TaxScheme.of('0015')    # Name='GERÇEK USULDE KATMA DEĞER VERGİSİ', TaxTypeCode='0015'
+
+        :param tax_type_code: Vergi kodu, bkz. TaxTypeCode
+        :param name: Verilmezse vergi kodları listesindeki ad kullanılır.
+        :return: TaxScheme
+        """
+        shared = _TAX_SCHEMES.get((cls, tax_type_code, name))
+        if shared is None:
+            scheme_name = name if name is not None else _tax_type_name(tax_type_code)
+            if scheme_name is None:
+                raise ValueError(f'Unknown tax type code {tax_type_code!r}, pass the tax name explicitly')
+            shared = _TAX_SCHEMES.setdefault((cls, tax_type_code, name),
+                                             cls.interned(Name=scheme_name, TaxTypeCode=tax_type_code))
+        return shared
+
+
+# (sınıf, vergi kodu, ad) -> TaxScheme.of / TaxCategory.of sonucu.
+_TAX_SCHEMES: Dict[tuple, TaxScheme] = {}
+_TAX_CATEGORIES: Dict[tuple, Model] = {}
+
+
+class PartyTaxScheme(Model):
     """
     Bu eleman aracılığıyla Tarafın (Party) vergi dairesi ile ilgili bilgiler verilir.
 
@@ -254,12 +420,14 @@ class PartyTaxScheme:
 
     """
 
+    __slots__ = ('registration_name', 'company_id', 'tax_scheme')
+
     def __init__(self, RegistrationName: str = None, CompanyID: str = None, TaxScheme: Union[TaxScheme, str] = None):
         self.registration_name = RegistrationName
         self.company_id = CompanyID
         self.tax_scheme = TaxScheme
 
-class Communication:
+class Communication(Model):
     """
     Her türlü alternatif iletişim kanalının tanımlanmasında kullanılacaktır.
     2.2.9 Communication İletişim
@@ -276,12 +444,14 @@ class Communication:
             </cac:OtherCommunication>
     """
 
+    __slots__ = ('channel_code', 'channel', 'value')
+
     def __init__(self, ChannelCode: str, Channel: str = None, Value: str = None):
         self.channel_code = ChannelCode
         self.channel = Channel
         self.value = Value
 
-class Contact:
+class Contact(Model):
     """
     Bu elemana irtibat bilgileri yazılabilecektir.
     2.2.10 Contact İrtibat
@@ -302,6 +472,9 @@ class Contact:
                 <cbc:ElectronicMail>bb@bb.com.tr</cbc:ElectronicMail>
             </cac:Contact>
     """
+
+    __slots__ = ('id', 'name', 'telephone', 'telefax', 'electronic_mail', 'note', 'other_communication')
+
     def __init__(self, ID: str = None, Name: str = None, Telephone: str = None, Telefax: str = None,
                     ElectronicMail: str = None, Note: str = None, OtherCommunication: List[Communication] = None):
         self.id = ID
@@ -313,7 +486,7 @@ class Contact:
         self.other_communication = OtherCommunication
 
 
-class Party:
+class Party(Model):
     """
     Tarafları (kurum ve şahıslar) tanımlamak için kullanılır.
     2.2.41 Party Taraf
@@ -389,6 +562,9 @@ class Party:
 
     """
 
+    __slots__ = ('party_identification_id', 'party_name', 'postal_address', 'physical_location', 'party_tax_scheme',
+                 'party_legal_entity', 'contact', 'person', 'agent_party')
+
     def __init__(self, party_identification_id, party_name, postal_address, physical_location, party_tax_scheme, party_legal_entity, contact, person, agent_party):
         self.party_identification_id = party_identification_id
         self.party_name = party_name
@@ -400,7 +576,7 @@ class Party:
         self.person = person
         self.agent_party = agent_party
 
-class CorporateRegistrationScheme:
+class CorporateRegistrationScheme(Model):
     """
     Kurumun kayıtlı olduğu organizasyon hakkında bilgileri tutar. Örneğin sanayi odası veya ticaret odası.
     2.2.11 CorporateRegistrationScheme Kurumsal Sicil Şeması @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 20/81
@@ -424,13 +600,15 @@ class CorporateRegistrationScheme:
     </cac:CorporateRegistrationScheme>
     """
 
+    __slots__ = ('id', 'name', 'corporateRegistrationTypeCode', 'juridictionRegionAddress')
+
     def __init__(self, id: str = None, name: str = None, corporateRegistrationTypeCode: str = None, juridictionRegionAddress: Address = None):
         self.id = id
         self.name = name
         self.corporateRegistrationTypeCode = corporateRegistrationTypeCode
         self.juridictionRegionAddress = juridictionRegionAddress
 
-class PartyLegalEntity:
+class PartyLegalEntity(Model):
     """
     Tarafın sicil bilgilerini veya merkez bilgilerini içerir.
     2.2.42 PartyLegalEntity Taraf Sicil Bilgileri @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 54/81
@@ -479,6 +657,9 @@ class PartyLegalEntity:
     </cac:PartyLegalEntity>
     """
 
+    __slots__ = ('registrationName', 'companyID', 'registrationDate', 'solePrioprietorshipIndicator',
+                 'corporateStockAmount', 'fullyPaidSharesIndicator', 'corporateRegistrationScheme', 'headOfficeParty')
+
     def __init__(self, registrationName: str = None, companyID: str = None, registrationDate: str = None,
                 solePrioprietorshipIndicator: bool = None, corporateStockAmount: float = None,
                 fullyPaidSharesIndicator: bool = None, corporateRegistrationScheme: CorporateRegistrationScheme = None,
@@ -493,7 +674,7 @@ class PartyLegalEntity:
         self.corporateRegistrationScheme = corporateRegistrationScheme
         self.headOfficeParty = headOfficeParty
 
-class PartyIdentification:
+class PartyIdentification(Model):
     """
     Tarafın vergi kimlik numarası veya TC kimlik numarası metin olarak girilir.
     UBL-TR’de “PartyIdentification/ID” elemanının “schemeID” attribute’u zorunludur.
@@ -503,20 +684,29 @@ class PartyIdentification:
 
     UBL TR Ortak Elemanlarda tanımlanmamış.
     """
+
+    __slots__ = ('schemeID', 'value')
+
     def __init__(self, schemeID: str = None, value: str = None):
         self.schemeID = schemeID
         self.value = value
 
 
-class PartyData:
-    WebsiteURI: str = None
-    PartyIdentification: PartyIdentification
-    PartyName: str = None
-    PostalAddress: PostalAddress = None     # type: ignore
-    PartyTaxScheme: PartyTaxScheme = None   # type: ignore
-    Contact: Contact = None                 # type: ignore
+class PartyData(Model):
+    __slots__ = ('WebsiteURI', 'PartyIdentification', 'PartyName', 'PostalAddress', 'PartyTaxScheme', 'Contact')
+
+    def __init__(self, WebsiteURI: str = None, PartyIdentification: PartyIdentification = None,
+                 PartyName: str = None, PostalAddress: PostalAddress = None,   # type: ignore
+                 PartyTaxScheme: PartyTaxScheme = None, Contact: Contact = None):  # type: ignore
+        self.WebsiteURI = WebsiteURI
+        self.PartyIdentification = PartyIdentification
+        self.PartyName = PartyName
+        self.PostalAddress = PostalAddress
+        self.PartyTaxScheme = PartyTaxScheme
+        self.Contact = Contact
+
 
-class FinancialInstitution:
+class FinancialInstitution(Model):
     """
     Banka bilgisi girilebilir.
     2.2.26 FinancialInstitution Finansal Kurum
@@ -529,11 +719,13 @@ class FinancialInstitution:
                 </cac:FinancialInstitution>
     """
 
+    __slots__ = ('Name',)
+
     def __init__(self, Name: str = None):
         self.Name = Name
 
 
-class Branch:
+class Branch(Model):
     """
     Şube bilgisi girilir. (Banka)
     2.2.7 Branch Şube
@@ -550,11 +742,13 @@ class Branch:
                 </cac:FinancialInstitutionBranch>
     """
 
+    __slots__ = ('Name', 'FinancialInstitution')
+
     def __init__(self, Name: str = None, FinancialInstitution: FinancialInstitution = None):
         self.Name = Name
         self.FinancialInstitution = FinancialInstitution
 
-class FinancialAccount:
+class FinancialAccount(Model):
     """
     Hesap bilgilerinin tutulduğu bölümdür.
     2.2.25 FinancialAccount Hesap Bilgisi
@@ -572,6 +766,8 @@ class FinancialAccount:
                 </cac:PayeeFinancialAccount>
     """
 
+    __slots__ = ('id', 'currency_code', 'payment_note', 'financial_institution_branch')
+
     def __init__(self, ID: str = None, CurrencyCode: str = None, PaymentNote: str = None,
                     FinancialInstitutionBranch: Branch = None):
         self.id = ID
@@ -579,7 +775,7 @@ class FinancialAccount:
         self.payment_note = PaymentNote
         self.financial_institution_branch = FinancialInstitutionBranch
 
-class Period:
+class Period(Model):
     """
     Belgelerde dönem kullanılması halinde dönem bu elemanda gösterilir.
     2.2.46 Period Periyod
@@ -616,6 +812,8 @@ class Period:
         </cac:InvoicePeriod>
     """
 
+    __slots__ = ('start_date', 'start_time', 'end_date', 'end_time', 'duration_measure', 'description')
+
     def __init__(self, StartDate: str = None, StartTime: str = None, EndDate: str = None, EndTime: str = None,
                     DurationMeasure: str = None, Description: str = None):
         self.start_date = StartDate
@@ -625,7 +823,7 @@ class Period:
         self.duration_measure = DurationMeasure
         self.description = Description
 
-class ExternalReference:
+class ExternalReference(Model):
     """
     Belgelerde ilişkilendirilmek istenen dokümanların referanslarının yer aldığı elemandır.
 
@@ -639,10 +837,12 @@ class ExternalReference:
     </cac:ExternalReference>
     """
 
+    __slots__ = ('uri',)
+
     def __init__(self, URI: str = None):
         self.uri = URI
 
-class Attachment:
+class Attachment(Model):
     """
     Belgelerde referans verilmek istenen referansların ya da belgelere eklenmek istenen dokümanların yer aldığı elemandır.
     2.2.4 Attachment Ekli Dosya, UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 14/81
@@ -671,11 +871,13 @@ class Attachment:
         </cac:Attachment>
     """
 
+    __slots__ = ('external_reference', 'embedded_document_binary_object')
+
     def __init__(self, ExternalReference: str = None, EmbeddedDocumentBinaryObject: str = None):
         self.external_reference = ExternalReference
         self.embedded_document_binary_object = EmbeddedDocumentBinaryObject
 
-class DocumentReference:
+class DocumentReference(Model):
     """
     Referans verilen yada eklenen belgelere ilişkin bilgiler girilecektir.
     2.2.20 DocumentReference Doküman Bilgisi @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 29/81
@@ -699,7 +901,10 @@ class DocumentReference:
             </cac:AdditionalDocumentReference>
     """
 
-    def __init(self, ID: str = None, IssueDate: str = None, DocumentTypeCode: str = None,
+    __slots__ = ('id', 'issue_date', 'document_type_code', 'document_type', 'document_description', 'attachment',
+                 'validity_period', 'issuer_party')
+
+    def __init__(self, ID: str = None, IssueDate: str = None, DocumentTypeCode: str = None,
                 DocumentType: str = None, DocumentDescription: str = None, Attachment: Attachment = None,
                 ValidityPeriod: Period = None, IssuerParty: Party = None):
         self.id = ID
@@ -712,7 +917,7 @@ class DocumentReference:
         self.issuer_party = IssuerParty
 
 
-class Person:
+class Person(Model):
     """
     Şahısla ilgili bilgiler girilecektir.
     2.2.47 Person Kişi
@@ -735,6 +940,10 @@ class Person:
                     <cbc:NameSuffix>PhD.</cbc:NameSuffix>
                 </cac:Person>
     """
+
+    __slots__ = ('first_name', 'family_name', 'title', 'middle_name', 'name_suffix', 'nationality_id',
+                 'financial_account', 'identity_document_reference')
+
     def __init__(self, FirstName: str = None, FamilyName: str = None, Title: str = None, MiddleName: str = None,
                 NameSuffix: str = None, NationalityID: str = None, FinancialAccount: FinancialAccount = None,
                 IdentityDocumentReference: DocumentReference = None):
@@ -747,7 +956,7 @@ class Person:
         self.financial_account = FinancialAccount
         self.identity_document_reference = IdentityDocumentReference
 
-class CustomerParty:
+class CustomerParty(Model):
     """
     Alıcı tarafın bilgilerini tutan elemandır.
     2.2.13 CustomerParty Alıcı
@@ -798,6 +1007,8 @@ class CustomerParty:
             </cac:AccountingCustomerParty>
     """
 
+    __slots__ = ('party', 'delivery_contact')
+
     def __init__(self, Party: Party = None, DeliveryContact: Contact = None):
         self.party = Party
         self.delivery_contact = DeliveryContact
@@ -812,6 +1023,8 @@ class SignatoryParty:
     imza ile sertifikalara ilişkin bilgilere yer verilecektir.
     Kullanım Bknz. Ortak Sınıflar: Signature
     """
+    __slots__ = ()
+
     VKN_TCKN = None
     VKN = None
     ROOM = None
@@ -829,6 +1042,8 @@ class KolaysoftSignature(SignatoryParty):
     """
     Example signatory party: Kolaysoft Signature
     """
+    __slots__ = ()
+
     VKN_TCKN = "5750464002"
     VKN = "5750464002"
     ROOM = "201-204"
@@ -842,7 +1057,7 @@ class KolaysoftSignature(SignatoryParty):
     URI = "#Signature_cf981f3d-3be5-4b9d-8b6d-7f5e18175a2f"
 
 
-class PayeeFinancialAccount:
+class PayeeFinancialAccount(Model):
     """
     Alacaklı hesap bilgileri.
 
@@ -853,13 +1068,15 @@ class PayeeFinancialAccount:
     </cac:PayeeFinancialAccount>
     """
 
+    __slots__ = ('ID', 'CurrencyCode', 'PaymentNote')
+
     def __init__(self, ID: str = None, CurrencyCode: str = None, PaymentNote: str = None):
         self.ID = ID
         self.CurrencyCode = CurrencyCode
         self.PaymentNote = PaymentNote
 
 
-class PaymentMeans:
+class PaymentMeans(Model):
     """
     2.3.34 PaymentMeans: Ödeme Şekli Ödeme Şekline İlişkin Bilgiler
     Kardinalite: Seçimli(0..n)
@@ -910,6 +1127,8 @@ class PaymentMeans:
     </cac:PaymentMeans>
     """
 
+    __slots__ = ('PaymentMeansCode', 'PaymentDueDate', 'PaymentChannelCode', 'InstructionNote', 'PayeeFinancialAccount')
+
     def __init__(self, PaymentMeansCode: str = None, PaymentDueDate: str = None, PaymentChannelCode: str = None,
                 InstructionNote: str = None, PayeeFinancialAccount: PayeeFinancialAccount = None):
         self.PaymentMeansCode = PaymentMeansCode
@@ -919,7 +1138,7 @@ class PaymentMeans:
         self.PayeeFinancialAccount = PayeeFinancialAccount
 
 
-class PaymentTerms:
+class PaymentTerms(Model):
     """
     Bu elemana ödeme koşulları ve ödemenin yapılmaması halinde uygulanacak müeyyideler yazılabilecektir.
     2.3.35 PaymentTerms Ödeme Koşulları
@@ -965,6 +1184,8 @@ class PaymentTerms:
                         </cac:PaymentTerms>
     """
 
+    __slots__ = ('Note', 'PenaltySurchargePercent', 'PaymentDueDate', 'Amount', 'CurrencyID')
+
     def __init__(self, Note: str = None, PenaltySurchargePercent: str = None, PaymentDueDate: str = None,
                 Amount: str = None, CurrencyID: str = None):
         self.Note = Note
@@ -974,7 +1195,7 @@ class PaymentTerms:
         self.CurrencyID = CurrencyID
 
 
-class TaxCategory:
+class TaxCategory(Model):
     """
     2.2.58 TaxCategory TaxCategory Vergi Türü
     Belge üzerinde yer alan vergi türü, muafiyet ve istisnalara ilişkin bilgiler girilir.
@@ -1001,6 +1222,8 @@ class TaxCategory:
         </cac:TaxCategory>
     """
 
+    __slots__ = ('Name', 'TaxExemptionReasonCode', 'TaxExemptionReason', 'TaxScheme')
+
     def __init__(self, Name: str = None, TaxExemptionReasonCode: str = None, TaxExemptionReason: str = None,
                 TaxScheme: TaxScheme = None):
         self.Name = Name
@@ -1008,8 +1231,33 @@ class TaxCategory:
         self.TaxExemptionReason = TaxExemptionReason
         self.TaxScheme = TaxScheme
 
+    @classmethod
+    def of(cls, tax_type_code: str, name: str = None, tax_exemption_reason_code: str = None,
+           tax_exemption_reason: str = None) -> 'TaxCategory':
+        """
+        Vergi kodu (ve varsa muafiyet/istisna sebebi) için paylaşılan, değiştirilemez TaxCategory.
+        TaxScheme, TaxScheme.of(tax_type_code) ile doldurulur.
+
+            line_tax_category = TaxCategory.of('0015')
+            exempt_tax_category = TaxCategory.of('0015', tax_exemption_reason_code='351',
+                                                 tax_exemption_reason='KDV - İstisna Olmayan Diğer')
 
-class TaxSubtotal:
+        :param name: TaxCategory Name (vergi türü ismi); belge düzeyindeki TaxTotal'da yazılır. Verilmezse vergi
+                     kodları listesindeki ad (TaxScheme.Name) kullanılır.
+        :return: TaxCategory
+        """
+        key = (cls, tax_type_code, name, tax_exemption_reason_code, tax_exemption_reason)
+        shared = _TAX_CATEGORIES.get(key)
+        if shared is None:
+            tax_scheme = TaxScheme.of(tax_type_code)
+            shared = _TAX_CATEGORIES.setdefault(key, cls.interned(Name=name if name is not None else tax_scheme.Name,
+                                                                  TaxExemptionReasonCode=tax_exemption_reason_code,
+                                                                  TaxExemptionReason=tax_exemption_reason,
+                                                                  TaxScheme=tax_scheme))
+        return shared
+
+
+class TaxSubtotal(Model):
     """
     Vergi ve diğer yasal yükümlülüklerin hesaplaması ile ilgili bilgilere yer verilecektir.
     2.2.60 TaxSubtotal Vergi Ara Toplamı
@@ -1039,6 +1287,9 @@ class TaxSubtotal:
         </cac:TaxSubtotal>
     """
 
+    __slots__ = ('TaxableAmount', 'TaxAmount', 'CalculationSequenceNumeric', 'TransactionCurrencyTaxAmount', 'Percent',
+                 'BaseUnitMeasure', 'PerUnitAmount', 'TaxCategory')
+
     def __init__(self, TaxableAmount: str = None, TaxAmount: str = None, CalculationSequenceNumeric: str = None,
                     TransactionCurrencyTaxAmount: str = None, Percent: str = None, BaseUnitMeasure: str = None,
                     PerUnitAmount: str = None, TaxCategory: TaxCategory = None):
@@ -1051,7 +1302,7 @@ class TaxSubtotal:
         self.PerUnitAmount = PerUnitAmount
         self.TaxCategory = TaxCategory
 
-class TaxTotal:
+class TaxTotal(Model):
     """
     Vergi ve diğer yasal yükümlülüklerin hesaplaması ile ilgili bilgiler ile belge üzerinde hesaplanan toplam vergi ve yasal yükümlülük tutarı girilecektir.
     2.2.61 TaxTotal Vergi Toplamı
@@ -1124,12 +1375,14 @@ class TaxTotal:
 	</cac:TaxTotal>
     """
 
+    __slots__ = ('TaxAmount', 'TaxSubtotal', 'CurrencyID')
+
     def __init__(self, TaxAmount: str = None, TaxSubtotal: Union[TaxSubtotal, List[TaxSubtotal]] = None, CurrencyID: str = "TRY"):
         self.TaxAmount = TaxAmount
         self.TaxSubtotal = TaxSubtotal
         self.CurrencyID = CurrencyID
 
-class MonetaryTotal:
+class MonetaryTotal(Model):
     """
             <cac:LegalMonetaryTotal>
                 <cbc:LineExtensionAmount
@@ -1142,6 +1395,9 @@ class MonetaryTotal:
             </cac:LegalMonetaryTotal>
     """
 
+    __slots__ = ('LineExtensionAmount', 'TaxExclusiveAmount', 'TaxInclusiveAmount', 'AllowanceTotalAmount',
+                 'ChargeTotalAmount', 'PayableRoundingAmount', 'PayableAmount', 'CurrencyID')
+
     def __init__(self, LineExtensionAmount: str = None, TaxExclusiveAmount: str = None, TaxInclusiveAmount: str = None,
                 AllowanceTotalAmount: str = None, ChargeTotalAmount: str = None, PayableRoundingAmount: str = None,
                 PayableAmount: str = None,
@@ -1156,7 +1412,7 @@ class MonetaryTotal:
         self.CurrencyID = CurrencyID
 
 
-class InvoicedQuantity:
+class InvoicedQuantity(Model):
     """
     1.5 InvoicedQuantity, UBL-TR Kod Listeleri Ocak 2023 Versiyon: 1.31 8/20
     Bu elemanın “unitCode” attribute’unun değer kümesi öncelikle aşağıdaki listeden alınmalıdır
@@ -1212,12 +1468,14 @@ class InvoicedQuantity:
     <cbc:InvoicedQuantity unitCode="C62">1.0</cbc:InvoicedQuantity>
     """
 
+    __slots__ = ('UnitCode', 'Qty')
+
     def __init__(self, UnitCode: str = None, Qty: str = None):
         self.UnitCode = UnitCode
         self.Qty = Qty
 
 
-class AllowanceCharge:
+class AllowanceCharge(Model):
     """
     Iskonto veya artırımların tanımlandığı elemandır.
     2.2.3 AllowanceCharge Iskonto/Artırım @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 13/81
@@ -1241,6 +1499,9 @@ class AllowanceCharge:
 
     """
 
+    __slots__ = ('ChargeIndicator', 'AllowanceChargeReason', 'MultiplierFactorNumeric', 'SequenceNumeric', 'Amount',
+                 'BaseAmount', 'PerUnitAmount', 'CurrencyID')
+
     def __init__(self, ChargeIndicator: str, Amount: str, AllowanceChargeReason: str = None,
                 MultiplierFactorNumeric: str = None,
                 SequenceNumeric: str = None, BaseAmount: str = None, PerUnitAmount: str = None,
@@ -1254,7 +1515,7 @@ class AllowanceCharge:
         self.PerUnitAmount = PerUnitAmount
         self.CurrencyID = CurrencyID
 
-class ItemIdentification:
+class ItemIdentification(Model):
     """
     Ürün numaralandırlması için kullanılır. Her türlü numaralandırılma için kullanılabilir.
     Örneğin, ilaç sektöründe PluKod’u veya otomotiv sektöründe aracın motor numarası gibi.
@@ -1269,10 +1530,12 @@ class ItemIdentification:
     </cac:ManufacturersItemIdentification>
     """
 
+    __slots__ = ('ID',)
+
     def __init__(self, ID: str = None):
         self.ID = ID
 
-class CommodityClassification:
+class CommodityClassification(Model):
     """
     Ürün hakkında uluslararası standart veya ulusal kodlar (örneğin, Sağlık Uygulama Tebliği) tabanlı sınıflandırma bilgisi vermek istenmesi durumunda girilir.
 
@@ -1287,6 +1550,8 @@ class CommodityClassification:
     </cac:CommodityClassification>
     """
 
+    __slots__ = ('ItemClassificationCode', 'listAgencyID', 'listID')
+
     def __init__(self, ItemClassificationCode: str = None, listAgencyID: str = None, listID: str = None):
         self.ItemClassificationCode = ItemClassificationCode
         self.listAgencyID = listAgencyID
@@ -1294,7 +1559,7 @@ class CommodityClassification:
 
 
 
-class Item:
+class Item(Model):
     """
     Mal/Hizmet bilgilerinin girildiği bölümdür.
     2.2.30 Item Kalem @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 41/81
@@ -1334,6 +1599,10 @@ class Item:
     </cac:Item>
     """
 
+    __slots__ = ('Description', 'Name', 'Keyword', 'BrandName', 'ModelName', 'BuyersItemIdentification',
+                 'SellersItemIdentification', 'ManufacturersItemIdentification', 'AdditionalItemIdentification',
+                 'OriginCountry', 'CommodityClassification', 'ItemInstance')
+
     def __init__(self, Name: str, Description: str = None, Keyword: str = None, BrandName: str = None, ModelName: str = None,
                     BuyersItemIdentification: ItemIdentification = None, SellersItemIdentification: ItemIdentification = None,
                     ManufacturersItemIdentification: ItemIdentification = None, AdditionalItemIdentification: list = None,
@@ -1351,7 +1620,7 @@ class Item:
         self.CommodityClassification = CommodityClassification
         self.ItemInstance = ItemInstance
 
-class OrderReference:
+class OrderReference(Model):
     """
     Siparişe ait bilgiler girilecektir.
     2.2.39 OrderReference Sipariş Bilgisi, UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 49/81
@@ -1369,6 +1638,8 @@ class OrderReference:
 
     """
 
+    __slots__ = ('ID', 'SalesOrderID', 'IssueDate', 'OrderTypeCode', 'DocumentReference')
+
     def __init__(self, ID: str = None, SalesOrderID: str = None, IssueDate: str = None, OrderTypeCode: str = None, DocumentReference: list = None):
         self.ID = ID
         self.SalesOrderID = SalesOrderID
@@ -1376,7 +1647,7 @@ class OrderReference:
         self.OrderTypeCode = OrderTypeCode
         self.DocumentReference = DocumentReference
 
-class OrderLineReference:
+class OrderLineReference(Model):
     """
     Siparişin kalemlerine referans atmak için kullanılır.
     2.2.38 OrderLineReference Sipariş Kalemi Referansı, UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 48/81
@@ -1393,6 +1664,8 @@ class OrderLineReference:
     </cac:OrderLineReference>
     """
 
+    __slots__ = ('LineID', 'SalesOrderLineID', 'UUID', 'LineStatusCode', 'OrderReference')
+
     def __init__(self, LineID: str = None, SalesOrderLineID: str = None, UUID: str = None, LineStatusCode: str = None, OrderReference: OrderReference = None):
         self.LineID = LineID
         self.SalesOrderLineID = SalesOrderLineID
@@ -1400,7 +1673,7 @@ class OrderLineReference:
         self.LineStatusCode = LineStatusCode
         self.OrderReference = OrderReference
 
-class LineReference:
+class LineReference(Model):
     """
     Kalem ile ilgili tanımlayıcı bilgilere bu elemanda yer verilecektir.
     2.2.33 LineReference Referans Satır, UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 43/81
@@ -1414,12 +1687,14 @@ class LineReference:
     </cac:LineReference>
     """
 
+    __slots__ = ('LineID', 'LineStatusCode', 'DocumentReference')
+
     def __init__(self, LineID: str = None, LineStatusCode: str = None, DocumentReference: DocumentReference = None):
         self.LineID = LineID
         self.LineStatusCode = LineStatusCode
         self.DocumentReference = DocumentReference
 
-class Despatch:
+class Despatch(Model):
     """
     Malların alıcıya gönderimlesi için satıcıdan teslim alınması kapsamında zaman ve mekan bilgileri girilir.
     2.2.17 Despatch İrsaliye Bilgisi @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 25/81
@@ -1461,6 +1736,9 @@ class Despatch:
     </cac:Despatch>
     """
 
+    __slots__ = ('ID', 'ActualDespatchDate', 'ActualDespatchTime', 'Instructions', 'DespatchAddress', 'DespatchParty',
+                 'Contact', 'EstimatedDespatchPeriod')
+
     def __init__(self, ID: str = None, ActualDespatchDate: str = None, ActualDespatchTime: str = None,
                 Instructions: str = None, DespatchAddress: Address = None, DespatchParty: Party = None, Contact: Contact = None,
                 EstimatedDespatchPeriod: Period = None):
@@ -1475,7 +1753,7 @@ class Despatch:
         self.EstimatedDespatchPeriod = EstimatedDespatchPeriod
 
 
-class DeliveryTerms:
+class DeliveryTerms(Model):
     """
     Teslimat koşulları girilir.
     2.2.16 DeliveryTerms Teslimat Koşulları @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 24/81
@@ -1490,13 +1768,15 @@ class DeliveryTerms:
     </cac:DeliveryTerms>
     """
 
+    __slots__ = ('ID_schemeID', 'ID', 'SpecialTerms', 'Amount')
+
     def __init__(self, ID: str = None, SpecialTerms: str = None, Amount: str = None):
         self.ID_schemeID = 'INCOTERMS'
         self.ID = ID
         self.SpecialTerms = SpecialTerms
         self.Amount = Amount
 
-class Temperature:
+class Temperature(Model):
     """
     Sıcaklık bilgisi girilir.
     2.2.62 Temperature Sıcaklık @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 75/81
@@ -1512,13 +1792,15 @@ class Temperature:
     </cac:MaximumTemperature>
     """
 
+    __slots__ = ('AttributeID', 'Measure', 'Description', 'unitCode')
+
     def __init__(self, AttributeID: str, Measure: str, unitCode: str = 'CEL', Description: str = None):
         self.AttributeID = AttributeID
         self.Measure = Measure
         self.Description = Description
         self.unitCode = unitCode
 
-class Dimension:
+class Dimension(Model):
     """
     Boyut bilgileri girilir.
     2.2.19 Dimension Boyut
@@ -1546,6 +1828,8 @@ class Dimension:
     </cac:MeasurementDimension>
     """
 
+    __slots__ = ('AttributeID', 'Measure', 'Description', 'MinimumMeasure', 'MaximumMeasure', 'unitCode')
+
     def __init__(self, AttributeID: str, unitCode: str, Measure: str = None, Description: list = None,
                 MinimumMeasure: str = None, MaximumMeasure: str = None):
         self.AttributeID = AttributeID
@@ -1556,7 +1840,7 @@ class Dimension:
         self.unitCode = unitCode
 
 
-class GoodsItem:
+class GoodsItem(Model):
     """
     Taşıması gerçekleşen mallar hakkındaki bilgileri içerir.
     2.2.27 GoodsItem Taşınan Mal @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 35/81
@@ -1620,6 +1904,13 @@ class GoodsItem:
 </cac:GoodsItem>
     """
 
+    __slots__ = ('ID', 'Description', 'HazardousRiskIndicator', 'DeclaredCustomsValueAmount',
+                 'DeclaredStatisticsValueAmount', 'FreeOnBoardValueAmount', 'InsuranceValueAmount', 'ValueAmount',
+                 'GrossWeightMeasure', 'NetWeightMeasure', 'GrossVolumeMeasure', 'NetVolumeMeasure', 'Quantity',
+                 'RequiredCustomsID', 'CustomsStatusCode', 'CustomsTariffQuantity', 'CustomsImportClassifiedIndicator',
+                 'ChargeableQuantity', 'ReturnableQuantity', 'TraceID', 'Item', 'FreightAllowanceCharge', 'InvoiceLine',
+                 'Temperature', 'OriginAddress', 'MeasurementDimension')
+
     def __init__(self, ID: str = None, Description: Union[str, list] = None, HazardousRiskIndicator: bool = None,
                     DeclaredCustomsValueAmount: str = None, DeclaredStatisticsValueAmount: str = None,
                     FreeOnBoardValueAmount: str = None, InsuranceValueAmount: str = None, ValueAmount: str = None,
@@ -1658,7 +1949,7 @@ class GoodsItem:
         self.MeasurementDimension = MeasurementDimension
 
 
-class Package:
+class Package(Model):
     """
     Taşıma sırasındaki paket bilgisi girilir.
     2.2.40 Package Paket @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 50/81
@@ -1688,6 +1979,9 @@ class Package:
     </cac:Package>
     """
 
+    __slots__ = ('ID', 'Quantity', 'ReturnableMaterialIndicator', 'PackageLevelCode', 'PackagingTypeCode',
+                 'PackagingMaterial', 'ContainedPackage', 'GoodsItem', 'MeasurementDimension')
+
     def __init__(self, ID: str = None, Quantity: str = None, ReturnableMaterialIndicator: str = None,
                     PackageLevelCode: str = None, PackagingTypeCode: str = None, PackagingMaterial: Union[str, list] = None,
                     ContainedPackage: Any = None, GoodsItem: Union[GoodsItem, list] = None,  # TODO: ContainedPackage list[Package], kendisine referans. Hata alırsak ContainedPackage: list = None yap
@@ -1703,7 +1997,7 @@ class Package:
         self.GoodsItem = GoodsItem
         self.MeasurementDimension = MeasurementDimension
 
-class Stowage:
+class Stowage(Model):
     """
     İstif yeri bilgisi girilir.
     2.2.56 Stowage İstif Yeri @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 69/81
@@ -1730,13 +2024,15 @@ class Stowage:
     </cac:Stowage>
     """
 
+    __slots__ = ('LocationID', 'Location', 'MeasurementDimension')
+
     def __init__(self, LocationID: str = None, Location: Optional[List[Location]] = None, MeasurementDimension: Optional[List[Dimension]] = None):
 
             self.LocationID = LocationID
             self.Location = Location
             self.MeasurementDimension = MeasurementDimension
 
-class AirTransport:
+class AirTransport(Model):
     """
     Hava taşımacılığında kullanılan hava aracının numarasını tanımlamak için kullanılır.
     2.2.2 AirTransport Hava Taşımacılığı @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 13/81
@@ -1750,11 +2046,13 @@ class AirTransport:
 
     """
 
+    __slots__ = ('AircraftID',)
+
     def __init__(self, AircraftID: str):
 
         self.AircraftID = AircraftID
 
-class RoadTransport:
+class RoadTransport(Model):
     """
     Karayolu taşımacılığında kullanılan araç bilgisini içerir.
     2.2.52 RoadTransport Karayolu Taşımacılığı @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 63/81
@@ -1767,11 +2065,13 @@ class RoadTransport:
     </cac:RoadTransport>
     """
 
+    __slots__ = ('LicensePlateID',)
+
     def __init__(self, LicensePlateID: str):
 
             self.LicensePlateID = LicensePlateID
 
-class RailTransport:
+class RailTransport(Model):
     """
     Tren bilgisini içerir.
     2.2.49 RailTransport Demiryolu Taşımacılığı @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 60/81
@@ -1786,12 +2086,14 @@ class RailTransport:
     </cac:RailTransport >
     """
 
+    __slots__ = ('TrainID', 'RailCarID')
+
     def __init__(self, TrainID: str, RailCarID: str = None):
 
         self.TrainID = TrainID
         self.RailCarID = RailCarID
 
-class MaritimeTransport:
+class MaritimeTransport(Model):
     """
     Deniz taşımacılığındaki gemi bilgileri girilir.
     2.2.36 MaritimeTransport Deniz Taşımacılığı @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 47/81
@@ -1812,6 +2114,9 @@ class MaritimeTransport:
     </cac:MaritimeTransport>
     """
 
+    __slots__ = ('VesselID', 'VesselName', 'RadioCallSignID', 'ShipsRequirements', 'GrossTonnageMeasure',
+                 'NetTonnageMeasure', 'RegistryCertificateDocumentReference', 'RegistryPortLocation')
+
     def __init__(self, VesselID: str = None, VesselName: str = None, RadioCallSignID: str = None,
                 ShipsRequirements: Optional[List[str]] = None, GrossTonnageMeasure: str = None,
                 NetTonnageMeasure: str = None, RegistryCertificateDocumentReference: DocumentReference = None,
@@ -1826,7 +2131,7 @@ class MaritimeTransport:
         self.RegistryCertificateDocumentReference = RegistryCertificateDocumentReference
         self.RegistryPortLocation = RegistryPortLocation
 
-class TransportMeans:
+class TransportMeans(Model):
     """
     Taşıma şekli bilgileri girilir.
     2.2.65 TransportMeans Taşıma Şekli @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 79/81
@@ -1859,6 +2164,10 @@ class TransportMeans:
 
     """
 
+    __slots__ = ('JourneyID', 'RegistrationNationalityID', 'RegistrationNationality', 'DirectionCode',
+                 'TransportMeansTypeCode', 'TradeServiceCode', 'Stowage', 'AirTransport', 'RoadTransport',
+                 'RailTransport', 'MaritimeTransport', 'OwnerParty', 'MeasurementDimension')
+
     def __init__(self, JourneyID: str = None, RegistrationNationalityID: str = None,
                 RegistrationNationality: Optional[List[str]] = None, DirectionCode: str = None,
                 TransportMeansTypeCode: str = None, TradeServiceCode: str = None, Stowage: Stowage = None,
@@ -1880,7 +2189,7 @@ class TransportMeans:
         self.OwnerParty = OwnerParty
         self.MeasurementDimension = MeasurementDimension
 
-class TransportEquipment:
+class TransportEquipment(Model):
     """
     Taşıma ekipmanı bilgileri girilir.
     2.2.63 TransportEquipment Taşıma Ekipmanı
@@ -1898,13 +2207,15 @@ class TransportEquipment:
     Ek parametre: ID schemeID
     """
 
+    __slots__ = ('ID', 'TransportEquipmentTypeCode', 'Description', 'ID_schemeID')
+
     def __init__(self, ID: str = None, TransportEquipmentTypeCode: str = None, Description: str = None, ID_schemeID: str = None):
         self.ID = ID
         self.TransportEquipmentTypeCode = TransportEquipmentTypeCode
         self.Description = Description
         self.ID_schemeID = ID_schemeID
 
-class HazardousGoodsTransit:
+class HazardousGoodsTransit(Model):
     """
     Taşıma sırasındaki tehlikeli malları anlatır.
     2.2.28 HazardousGoodsTransit Tehlikeli Mal @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 37/81
@@ -1935,6 +2246,9 @@ class HazardousGoodsTransit:
     </cac:HazardousGoodsTransit>
     """
 
+    __slots__ = ('TransportEmergencyCardCode', 'PackagingCriteriaCode', 'HazardousRegulationCode',
+                 'InhalationToxicityZoneCode', 'TransportAuthorizationCode', 'MaximumTemperature', 'MinimumTemperature')
+
     def __init__(self, TransportEmergencyCardCode: str = None, PackagingCriteriaCode: str = None,
                     HazardousRegulationCode: str = None, InhalationToxicityZoneCode: str = None,
                     TransportAuthorizationCode: str = None, MaximumTemperature: Temperature = None,
@@ -1948,7 +2262,7 @@ class HazardousGoodsTransit:
         self.MaximumTemperature = MaximumTemperature
         self.MinimumTemperature = MinimumTemperature
 
-class CustomsDeclaration:
+class CustomsDeclaration(Model):
     """
     Ürün hakkında gümrük numaralandırma bilgisi girilir.
     2.2.14 CustomsDeclaration Gümrük Kimliği @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 22/81
@@ -1962,11 +2276,13 @@ class CustomsDeclaration:
     </cac:CustomsIdentification>
     """
 
+    __slots__ = ('ID', 'IssuerParty')
+
     def __init__(self, ID: str, IssuerParty: Party = None):
         self.ID = ID
         self.IssuerParty = IssuerParty  # TODO: Tip Party mi serbest metin mi?
 
-class TransportHandlingUnit:
+class TransportHandlingUnit(Model):
     """
     Taşıma ünitesi hakkında detaylı bilgi girilir.
     2.2.64 TransportHandlingUnit Taşıma Yükleme-Boşaltma Üniteleri @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 76/81
@@ -2007,6 +2323,12 @@ class TransportHandlingUnit:
     </cac:TransportHandlingUnit>
     """
 
+    __slots__ = ('ID', 'TransportHandlingUnitTypeCode', 'HandlingCode', 'HandlingInstructions',
+                 'HazardousRiskIndicator', 'TotalGoodsItemQuantity', 'TotalPackageQuantity', 'DamageRemarks', 'TraceID',
+                 'ActualPackage', 'TransportEquipment', 'TransportMeans', 'HazardousGoodsTransit',
+                 'MeasurementDimension', 'MinimumTemperature', 'MaximumTemperature', 'FloorSpaceMeasurementDimension',
+                 'PalletSpaceMeasurementDimension', 'ShipmentDocumentReference', 'CustomsDeclaration')
+
     def __init__(self, ID: str = None, TransportHandlingUnitTypeCode: str = None, HandlingCode: str = None,
                 HandlingInstructions: str = None, HazardousRiskIndicator: bool = None, TotalGoodsItemQuantity: int = None,
                 TotalPackageQuantity: int = None, DamageRemarks: str = None, TraceID: str = None, ActualPackage: Package = None,
@@ -2036,7 +2358,7 @@ class TransportHandlingUnit:
         self.ShipmentDocumentReference = ShipmentDocumentReference
         self.CustomsDeclaration = CustomsDeclaration
 
-class Shipment:
+class Shipment(Model):
     """
     Gönderi (Kargo) bilgileri girilir.
     2.2.53 Shipment Gönderi @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 64/81
@@ -2077,6 +2399,13 @@ class Shipment:
     </cac:Shipment>
     """
 
+    __slots__ = ('ID', 'HandlingCode', 'HandlingInstructions', 'GrossWeightMeasure', 'NetWeightMeasure',
+                 'GrossVolumeMeasure', 'NetVolumeMeasure', 'TotalGoodsItemQuantity',
+                 'TotalTransportHandlingUnitQuantity', 'InsuranceValueAmount', 'DeclaredCustomsValueAmount',
+                 'DeclaredForCarriageValueAmount', 'DeclaredStatisticsValueAmount', 'FreeOnBoardValueAmount',
+                 'SpecialInstructions', 'GoodsItem', 'ShipmentStage', 'Delivery', 'TransportHandlingUnit',
+                 'ReturnAddress', 'FirstArrivalPortLocation', 'LastExitPortLocation')
+
     def __init__(self, ID: str, HandlingCode: str = None, HandlingInstructions: str = None, GrossWeightMeasure: str = None,
                     NetWeightMeasure: str = None, GrossVolumeMeasure: str = None, NetVolumeMeasure: str = None,
                     TotalGoodsItemQuantity: str = None, TotalTransportHandlingUnitQuantity: str = None,
@@ -2109,7 +2438,7 @@ class Shipment:
         self.LastExitPortLocation = LastExitPortLocation
 
 
-class Delivery:
+class Delivery(Model):
     """
     Ürün tesliman bilgileri detaylı olarak girilir.
     2.2.15 Delivery Gönderim, Taşıma, Sevkiyat Bilgileri @ UBL-TR Ortak Elemanlar Nisan 2017 Versiyon : 0.7 23/81
@@ -2170,6 +2499,10 @@ class Delivery:
     </cac:Delivery>
     """
 
+    __slots__ = ('ID', 'Quantity', 'ActualDeliveryDate', 'ActualDeliveryTime', 'LatestDeliveryDate',
+                 'LatestDeliveryTime', 'TrackingID', 'DeliveryAddress', 'AlternativeDeliveryLocation',
+                 'EstimatedDeliveryPeriod', 'CarrierParty', 'DeliveryParty', 'Despatch', 'DeliveryTerms', 'Shipment')
+
     def __init__(self, ID: str = None, Quantity: str = None, ActualDeliveryDate: str = None, ActualDeliveryTime: str = None,
                 LatestDeliveryDate: str = None, LatestDeliveryTime: str = None, TrackingID: str = None, DeliveryAddress: Address = None,
                 AlternativeDeliveryLocation: Location = None, EstimatedDeliveryPeriod: Period = None, CarrierParty: Party = None,
@@ -2190,7 +2523,7 @@ class Delivery:
         self.DeliveryTerms = DeliveryTerms
         self.Shipment = Shipment
 
-class Price:
+class Price(Model):
     """
     Mal/hizmetin birim fiyatı girilir.
     2.2.48 Price Fiyat
@@ -2203,11 +2536,13 @@ class Price:
     </cac:Price>
     """
 
+    __slots__ = ('PriceAmount', 'currencyID')
+
     def __init__(self, PriceAmount: str = None, currencyID: str = "TRY"):
         self.PriceAmount = PriceAmount
         self.currencyID = currencyID
 
-class InvoiceLine:
+class InvoiceLine(Model):
     """
     Belgede geçen mal/hizmete ilişkin bilgilerin girildiği elemandır.
 
@@ -2278,6 +2613,10 @@ class InvoiceLine:
     </cac:InvoiceLine>
     """
 
+    __slots__ = ('ID', 'InvoicedQuantity', 'InvoicedQuantity_unitCode', 'LineExtensionAmount', 'Note',
+                 'OrderLineReference', 'DespatchLineReference', 'ReceiptLineReference', 'Delivery', 'AllowanceCharge',
+                 'TaxTotal', 'WithholdingTaxTotal', 'Item', 'Price', 'SubInvoiceLine', 'currencyID')
+
     def __init__(self, ID: str, InvoicedQuantity: str, InvoicedQuantity_unitCode: str, LineExtensionAmount: str, Item: Item,
                 Price: Price, Note: str = None, OrderLineReference: list = None, DespatchLineReference: list = None,
                 ReceiptLineReference: list = None, Delivery: list = None, AllowanceCharge: Union[AllowanceCharge, list] = None, TaxTotal: TaxTotal = None,
@@ -2299,9 +2638,155 @@ class InvoiceLine:
         self.SubInvoiceLine = SubInvoiceLine
         self.currencyID = currencyID
 
+class ValidationError(NamedTuple):
+    """
+    UBLInvoice.validate() hata kaydı.
+
+    section : Hatalı elemanı üreten add_* metodu, örn. 'add_invoice_line'. Bulunamazsa None.
+    path    : libxml2'nin verdiği eleman yolu, örn. '/*/cac:InvoiceLine[2]/cac:Price'
+    message : Şema doğrulama mesajı
+    """
+    section: Optional[str]
+    path: str
+    message: str
+
+
+# Kök altındaki eleman adı -> o elemanı üreten UBLInvoice metodu
+SECTIONS = {
+    'UBLExtensions': 'add_ubl_extension',
+    'UBLVersionID': 'add_ubl_version_id',
+    'CustomizationID': 'add_customisation_id',
+    'ProfileID': 'add_profile_id',
+    'ID': 'add_id',
+    'CopyIndicator': 'add_copy_indicator',
+    'UUID': 'add_uuid',
+    'IssueDate': 'add_issue_date',
+    'IssueTime': 'add_issue_time',
+    'InvoiceTypeCode': 'add_invoice_type_code',
+    'Note': 'add_note',
+    'DocumentCurrencyCode': 'add_document_currency_code',
+    'LineCountNumeric': 'add_line_count_numeric',
+    'DespatchDocumentReference': 'add_despatch_document_reference',
+    'Signature': 'add_signature',
+    'AccountingSupplierParty': 'add_accounting_supplier_party',
+    'AccountingCustomerParty': 'add_accounting_customer_party',
+    'PaymentMeans': 'add_paymentmeans',
+    'PaymentTerms': 'add_paymentterms',
+    'TaxTotal': 'add_taxtotal',
+    'WithholdingTaxTotal': 'add_withholdingtaxtotal',
+    'LegalMonetaryTotal': 'add_legalmonetarytotal',
+    'InvoiceLine': 'add_invoice_line',
+}
+
+
+def _section_of(path: Optional[str]) -> Optional[str]:
+    # '/*/cac:InvoiceLine[2]/cac:Price' -> 'InvoiceLine' -> 'add_invoice_line'
+    steps = (path or '').split('/')
+    if len(steps) < 3:
+        return None
+    name = steps[2].split('[', 1)[0].rsplit(':', 1)[-1]
+    return SECTIONS.get(name)
+
+
+# Şemada LineCountNumeric'ten önce gelen kök elemanları, bkz. UBLInvoice.finalize_totals
+_BEFORE_LINE_COUNT = frozenset(('UBLExtensions', 'UBLVersionID', 'CustomizationID', 'ProfileID', 'ID', 'CopyIndicator',
+                                'UUID', 'IssueDate', 'IssueTime', 'InvoiceTypeCode', 'Note', 'DocumentCurrencyCode',
+                                'TaxCurrencyCode', 'PricingCurrencyCode', 'PaymentCurrencyCode',
+                                'PaymentAlternativeCurrencyCode', 'AccountingCostCode', 'AccountingCost'))
+
+
+def _write_element(xf, element, depth: int, pretty_print: bool):
+    # xmlfile.write(element) her elemanda bütün isim alanlarını yeniden tanımlıyor;
+    # xf.element() ise açık olan üst elemanın isim alanlarını kullanır.
+    if pretty_print:
+        xf.write('\n' + '  ' * depth)
+    with xf.element(element.tag, element.attrib):
+        if element.text:
+            xf.write(element.text)
+        children = [child for child in element if isinstance(child.tag, str)]
+        for child in children:
+            _write_element(xf, child, depth + 1, pretty_print)
+        if children and pretty_print:
+            xf.write('\n' + '  ' * depth)
+
+
+class InvoicePrototype:
+    """
+    Bir firmanın (tenant) bütün faturalarında aynı kalan bölümleri bir kez oluşturur:
+    UBLExtensions, UBLVersionID, CustomizationID, Signature, AccountingSupplierParty, PaymentMeans
+    ve varsayılan belge para birimi.
+
+    UBLInvoice(prototype=...) bu elemanların kopyalarını kullanır; kopyalamak her faturada
+    add_* metodlarıyla yeniden oluşturmaktan çok daha ucuzdur. Prototipin kendi elemanları
+    dışarı verilmez, değiştirilmemelidir; farklı bilgiler için yeni prototip oluşturulmalıdır.
+
+    Örnek:
+        register_prototype('gotur', InvoicePrototype(KolaysoftSignature(), supplier, payment_means))
+
+        ubl_doc = UBLInvoice(prototype='gotur')     # UBLExtensions, UBLVersionID, CustomizationID
+        ubl_doc.add_profile_id('EARSIVFATURA')
+        ...
+        ubl_doc.add_document_currency_code()         # prototipin para birimi
+        ubl_doc.add_line_count_numeric('1')
+        ubl_doc.add_signature()                      # prototipten kopya
+        ubl_doc.add_accounting_supplier_party()      # prototipten kopya
+        ubl_doc.add_accounting_customer_party(customer)
+        ubl_doc.add_paymentmeans()                   # prototipten kopya (varsa)
+    """
+
+    def __init__(self, signatory: 'SignatoryParty', supplier_party: 'PartyData', payment_means: 'PaymentMeans' = None,
+                 document_currency_code: str = 'TRY', ubl_version_id: str = '2.1', customisation_id: str = 'TR1.2'):
+        self.document_currency_code = document_currency_code
+        # Aynı prototipi başka süreçte yeniden oluşturmak için (lxml elemanları pickle edilemiyor, bkz. ubl_tr_py.batch).
+        self.options = dict(signatory=signatory, supplier_party=supplier_party, payment_means=payment_means,
+                            document_currency_code=document_currency_code, ubl_version_id=ubl_version_id,
+                            customisation_id=customisation_id)
+
+        builder = UBLInvoice()
+        builder.add_ubl_extension()
+        builder.add_ubl_version_id(ubl_version_id)
+        builder.add_customisation_id(customisation_id)
+        self.head = tuple(builder.root)
+
+        builder.add_signature(signatory)
+        builder.add_accounting_supplier_party(supplier_party)
+        builder.add_paymentmeans(payment_means)
+        fragments = builder.root[len(self.head):]
+        self.signature = fragments[0]
+        self.supplier_party = fragments[1]
+        self.payment_means = fragments[2] if payment_means else None
+
+
+# Kayıtlı prototipler, UBLInvoice(prototype='ad') ile kullanılır.
+PROTOTYPES: Dict[str, InvoicePrototype] = {}
+
+
+def register_prototype(name: str, prototype: InvoicePrototype) -> InvoicePrototype:
+    PROTOTYPES[name] = prototype
+    return prototype
+
+
 class UBLInvoice:
-    def __init__(self):
-        self.root = etree.Element("Invoice", nsmap={
+    def __init__(self, prototype: Union[InvoicePrototype, str] = None, fragment_cache: FragmentCache = None,
+                 totals: 'InvoiceTotals' = None, instrumentation: Instrumentation = None):
+        """
+        add_* metodları parametre olarak verilen model nesnelerini değiştirmez; aynı nesneler (müşteri, TaxTotal,
+        kalemler) birden çok faturada ve thread'de kopyalanmadan kullanılabilir. UBLInvoice nesnesinin kendisi
+        tek thread'de oluşturulmalıdır.
+
+        :param prototype: InvoicePrototype veya register_prototype ile kaydedilmiş adı. Verilirse UBLExtensions,
+                          UBLVersionID ve CustomizationID prototipten kopyalanır; add_signature(),
+                          add_accounting_supplier_party(), add_paymentmeans() ve add_document_currency_code()
+                          parametresiz çağrıldığında prototipteki bilgiler kullanılır.
+        :param fragment_cache: Verilirse AccountingCustomerParty ile kalemlerdeki Item ve TaxCategory alt ağaçları
+                               içeriklerine göre önbellekten kopyalanır (bkz. ubl_tr_py.fragments).
+                               Birden çok fatura arasında paylaşılmak üzere tasarlanmıştır.
+        :param totals: ubl_tr_py.totals.InvoiceTotals. Verilirse eklenen kalemlerden toplamlar biriktirilir,
+                       finalize_totals() LineCountNumeric, TaxTotal ve LegalMonetaryTotal elemanlarını ekler.
+        :param instrumentation: Verilirse add_* metodları, finalize_totals, xml(), tobytes(), write(), dump_xml() ve
+                                validate() için süre, eleman ve bayt ölçülür (bkz. ubl_tr_py.instrumentation).
+        """
+        self.root = etree.Element("{urn:oasis:names:specification:ubl:schema:xsd:Invoice-2}Invoice", nsmap={
             None: "urn:oasis:names:specification:ubl:schema:xsd:Invoice-2",
             "xsd": "http://www.w3.org/2001/XMLSchema",
             "ext": "urn:oasis:names:specification:ubl:schema:xsd:CommonExtensionComponents-2",
@@ -2309,6 +2794,18 @@ class UBLInvoice:
             "cac": "urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2"
         })
 
+        if isinstance(prototype, str):
+            try:
+                prototype = PROTOTYPES[prototype]
+            except KeyError:
+                raise ValueError(f'Unknown invoice prototype: {prototype}')
+        self.prototype = prototype
+        self.fragment_cache = fragment_cache
+        self.totals = totals
+        if prototype is not None:
+            for element in prototype.head:
+                self.root.append(copy.deepcopy(element))
+
         # InputDocument nesnesine eklenmesi gereken alanlar.
         # Bazıları Xml'e eklenmiyor.
 
@@ -2328,9 +2825,152 @@ class UBLInvoice:
         self.line_count_numeric = None
         self.despatch_document_reference = None
 
+        if instrumentation is not None:
+            instrument(self, instrumentation)
+
     def xml(self):
         return etree.tostring(self.root, pretty_print=True, encoding='unicode')
 
+    def tobytes(self) -> bytes:
+        """UTF-8 kodlanmış, XML bildirimi olmadan xml(); UBLInvoiceEmitter.tobytes() ile aynı."""
+        return etree.tostring(self.root, pretty_print=True, encoding='UTF-8')
+
+    @staticmethod
+    def from_xml(source, invoice_lines: bool = True) -> 'ParsedInvoice':
+        """
+        Gelen UBL-TR faturasını model sınıflarına okur (iterparse, tek geçiş): PartyData, TaxTotal,
+        MonetaryTotal, InvoiceLine, ... Fatura ağacı oluşturulmaz, bkz. ubl_tr_py.reader.
+
+            invoice = UBLInvoice.from_xml('gelen/fatura.xml')
+            invoice.AccountingSupplierParty.PartyIdentification.value, invoice.LegalMonetaryTotal.PayableAmount
+
+        :param source: Dosya yolu, okunabilir dosya nesnesi veya bytes.
+        :param invoice_lines: False ise kalemler okunmaz.
+        :return: ubl_tr_py.reader.ParsedInvoice
+        :raises ValueError: Belge Invoice değilse (örn. DespatchAdvice, ApplicationResponse).
+        """
+        from .reader import read_invoice
+        return read_invoice(source, invoice_lines)
+
+    def _append_from_prototype(self, name: str) -> bool:
+        """Prototipteki elemanın kopyasını ekler. Prototip yoksa veya eleman tanımlı değilse False."""
+        element = getattr(self.prototype, name, None)
+        if element is None:
+            return False
+        self.root.append(copy.deepcopy(element))
+        return True
+
+    def _append_cached(self, parent, key: tuple) -> bool:
+        """Önbellekteki parçanın kopyasını parent'a ekler. Önbellekte yoksa False."""
+        element = self.fragment_cache.get(key)
+        if element is None:
+            return False
+        parent.append(copy.deepcopy(element))
+        return True
+
+    def validate(self, assert_valid: bool = False) -> List['ValidationError']:
+        """
+        Faturayı serileştirip yeniden parse etmeden, doğrudan self.root üzerinde XSD doğrulaması yapar.
+        Şema ilk kullanımda derlenir ve önbellekte tutulur (bkz. ubl_tr_py.schemas).
+
+        :param assert_valid: True ise hata eşleme yapılmaz, geçersiz belgede lxml.etree.DocumentInvalid fırlatılır.
+                             Sıcak yol (hot path) için en ucuz kullanım.
+        :return: ValidationError listesi, geçerli belgede boş liste.
+        """
+        schema = get_schema('Invoice')
+        if assert_valid:
+            schema.assertValid(self.root)
+            return []
+
+        if schema.validate(self.root):
+            return []
+        return [ValidationError(section=_section_of(error.path), path=error.path, message=error.message)
+                for error in schema.error_log]
+
+    def write(self, output, invoice_lines: Iterable['InvoiceLine'] = None, encoding: str = 'UTF-8',
+              pretty_print: bool = True):
+        """
+        Faturayı lxml.etree.xmlfile ile parça parça yazar. Binlerce kalemli (HKS, toptan satış) faturalarda
+        kalemler ağaca eklenmeden bir iterator'dan okunur; her kalem yazıldıktan sonra bellekten silinir,
+        bellek kullanımı kalem sayısından bağımsızdır.
+
+        UBL-TR şemasında InvoiceLine elemanları en sonda, TaxTotal ve LegalMonetaryTotal'dan sonra gelir.
+        Bu yüzden toplamlar ve LineCountNumeric kalemlerden önce (add_* metodlarıyla) eklenmiş olmalıdır.
+
+        :param output: Dosya yolu veya write() metodu olan dosya benzeri nesne (soket için socket.makefile('wb')).
+        :param invoice_lines: Ağaçtaki kalemlerden sonra yazılacak InvoiceLine nesneleri, örn. bir generator.
+        :param pretty_print: xml() ile aynı girintileme.
+
+        Örnek:
+            ubl_doc.add_line_count_numeric(str(line_count))
+            ubl_doc.add_taxtotal(tax_total)
+            ubl_doc.add_legalmonetarytotal(monetary_total)
+            with open('fatura.xml', 'wb') as f:
+                ubl_doc.write(f, invoice_lines=(InvoiceLine(...) for row in cursor))
+        """
+        with etree.xmlfile(output, encoding=encoding) as xf:
+            xf.write_declaration()
+            with xf.element(self.root.tag, self.root.attrib, nsmap=self.root.nsmap):
+                for child in self.root:
+                    _write_element(xf, child, 1, pretty_print)
+
+                if invoice_lines is not None:
+                    # Her kalem add_invoice_line ile geçici bir köke eklenir, yazılır ve silinir.
+                    # Parça önbelleği bu faturanınkidir. Ölçüm verilmez: yalnızca dıştaki write ölçülür, bu
+                    # kalemlerin süresi onun içindedir (bkz. ubl_tr_py.instrumentation).
+                    scratch = UBLInvoice(fragment_cache=self.fragment_cache)
+                    for invoice_line in invoice_lines:
+                        scratch.add_invoice_line(invoice_line)
+                        for child in scratch.root:
+                            _write_element(xf, child, 1, pretty_print)
+                        scratch.root.clear()
+
+                if pretty_print:
+                    xf.write('\n')
+
+    def finalize_totals(self, allowance_total_amount=None, charge_total_amount=None, payable_rounding_amount=None):
+        """
+        UBLInvoice(totals=InvoiceTotals(...)) ile biriktirilen toplamları yazar: LineCountNumeric (eklenmemişse),
+        (TaxTypeCode, Percent) grubu başına bir TaxSubtotal içeren TaxTotal ve LegalMonetaryTotal.
+        Elemanlar kalemlerden sonra çağrılsa da şemadaki yerlerine, ilk InvoiceLine'dan önceye eklenir.
+
+        :param allowance_total_amount: Toplam ıskonto, TaxExclusiveAmount'tan düşülür.
+        :param charge_total_amount: Toplam artırım, TaxExclusiveAmount'a eklenir.
+        :param payable_rounding_amount: Yuvarlama tutarı, PayableAmount'a eklenir.
+        :return: (TaxTotal, MonetaryTotal) yazılan modeller
+        :raises ValueError: Faturada zaten TaxTotal veya LegalMonetaryTotal varsa (add_taxtotal /
+                            add_legalmonetarytotal ya da önceki bir finalize_totals çağrısı).
+        """
+        if self.totals is None:
+            raise ValueError('finalize_totals() requires UBLInvoice(totals=InvoiceTotals())')
+        if self.root.find("{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}TaxTotal") is not None \
+                or self.root.find("{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}LegalMonetaryTotal") is not None:
+            raise ValueError('finalize_totals(): the invoice already has a TaxTotal or LegalMonetaryTotal')
+
+        tax_total = self.totals.tax_total()
+        monetary_total = self.totals.monetary_total(allowance_total_amount, charge_total_amount,
+                                                    payable_rounding_amount)
+
+        count = len(self.root)
+        if self.root.find("{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}LineCountNumeric") is None:
+            self.add_line_count_numeric(str(self.totals.line_count))
+            position = 0
+            for index, child in enumerate(self.root[:count]):
+                if etree.QName(child).localname in _BEFORE_LINE_COUNT:
+                    position = index + 1
+            self.root.insert(position, self.root[count])
+        count = len(self.root)
+        self.add_taxtotal(tax_total)
+        self.add_legalmonetarytotal(monetary_total)
+
+        first_line = self.root.find("{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}InvoiceLine")
+        if first_line is not None:
+            position = self.root.index(first_line)
+            for element in self.root[count:]:
+                self.root.insert(position, element)
+                position += 1
+        return tax_total, monetary_total
+
     def add_ubl_extension(self):
         """
         2.3.1 UBLExtensions
@@ -2351,7 +2991,10 @@ class UBLInvoice:
         extension_content = etree.SubElement(
             ubl_extension, "{urn:oasis:names:specification:ubl:schema:xsd:CommonExtensionComponents-2}ExtensionContent"
         )
-        auto_generated_wildcard = etree.SubElement(extension_content, "auto-generated-wildcard")
+        # Varsayılan (Invoice) namespace'inde; serileştirildiğinde <auto-generated-wildcard/> olarak yazılır.
+        auto_generated_wildcard = etree.SubElement(
+            extension_content, "{urn:oasis:names:specification:ubl:schema:xsd:Invoice-2}auto-generated-wildcard"
+        )
 
     def add_ubl_version_id(self, version_id_str: str = "2.1"):
         """
@@ -2588,7 +3231,7 @@ class UBLInvoice:
         )
         note.text = note_text
 
-    def add_document_currency_code(self, document_currency_code_text: str = 'TRY'):
+    def add_document_currency_code(self, document_currency_code_text: str = None):
         """
         2.3.12 DocumentCurrencyCode
         DocumentCurrency Code   : Belge Para Birim Kodu
@@ -2599,9 +3242,11 @@ class UBLInvoice:
         Örnek                   : <cbc:DocumentCurrencyCode>TRY</cbc:DocumentCurrencyCode>
 
         ISO 4217 Para Birimi Kodlarından (alfanumerik) alınmalıdır.
-        :param document_currency_code_text:
+        :param document_currency_code_text: Verilmezse prototipin para birimi, prototip yoksa 'TRY'.
         :return:
         """
+        if document_currency_code_text is None:
+            document_currency_code_text = self.prototype.document_currency_code if self.prototype else 'TRY'
 
         document_currency_code = etree.SubElement(
             self.root, "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}DocumentCurrencyCode"
@@ -2697,7 +3342,7 @@ class UBLInvoice:
 
         DespatchDocumentReference_IssueDate.text = IssueDate
 
-    def add_signature(self, signatory: SignatoryParty):
+    def add_signature(self, signatory: SignatoryParty = None):
         """
         2.3.27 Signature
         Signature       : Mali Mühür/İmza
@@ -2711,9 +3356,15 @@ class UBLInvoice:
         TODO: External reference URI'de bir UUID var.
         TODO: UUID sabit yada rastgele olabilir. Test et.
         TODO: Örnek, <cbc:URI>#Signature_cf981f3d-3be5-4b9d-8b6d-7f5e18175a2f</cbc:URI>
-        :param signatory: SignatoryParty Sınıfı, imzalayan (entegratör) bilgileri
+        :param signatory: SignatoryParty Sınıfı, imzalayan (entegratör) bilgileri. Verilmezse prototipten kopyalanır,
+                          prototip yoksa KolaysoftSignature kullanılır.
         :return:
         """
+        if signatory is None:
+            if self._append_from_prototype('signature'):
+                return
+            signatory = KolaysoftSignature()
+
         # Create the Signature element
         signature = etree.SubElement(
             self.root, "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}Signature"
@@ -2793,7 +3444,7 @@ class UBLInvoice:
         )
         external_reference_URI.text = signatory.URI  # TODO: Dinamik?
 
-    def add_accounting_supplier_party(self, supplier_party: PartyData):
+    def add_accounting_supplier_party(self, supplier_party: PartyData = None):
         """
         AccountingSupplier Party: Satıcı
         Kardinalite             : Zorunlu (1)
@@ -2801,9 +3452,14 @@ class UBLInvoice:
         Kullanım                : Bknz. Ortak Sınıflar: SupplierParty
         Örnek
 
-        :param supplier_party:
+        :param supplier_party: Verilmezse prototipten kopyalanır.
         :return:
         """
+        if supplier_party is None:
+            if not self._append_from_prototype('supplier_party'):
+                raise ValueError('supplier_party is required when the invoice has no prototype')
+            return
+
         # add accounting supplier party
         accounting_supplier_party = etree.SubElement(self.root,
                                                     "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}AccountingSupplierParty"
@@ -2820,7 +3476,8 @@ class UBLInvoice:
         party_identification_ID = etree.SubElement(
             party_identification, "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}ID"
         )
-        party_identification_ID.set("schemeID", supplier_party.PartyIdentification.schemeID)
+        if supplier_party.PartyIdentification.schemeID is not None:
+            party_identification_ID.set("schemeID", supplier_party.PartyIdentification.schemeID)
         party_identification_ID.text = supplier_party.PartyIdentification.value
         # Create the PartyName element
         party_name = etree.SubElement(
@@ -2867,6 +3524,12 @@ class UBLInvoice:
         :param customer_party:
         :return:
         """
+        key = None
+        if self.fragment_cache is not None:
+            key = customer_party_key(customer_party)
+            if self._append_cached(self.root, key):
+                return
+
         # add accounting customer party
         accounting_customer_party = etree.SubElement(
             self.root,
@@ -2890,7 +3553,8 @@ class UBLInvoice:
         party_identification_ID = etree.SubElement(
             party_identification, "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}ID"
         )
-        party_identification_ID.set("schemeID", customer_party.PartyIdentification.schemeID)
+        if customer_party.PartyIdentification.schemeID is not None:
+            party_identification_ID.set("schemeID", customer_party.PartyIdentification.schemeID)
         party_identification_ID.text = customer_party.PartyIdentification.value
         # Create the PartyName element
         party_name = etree.SubElement(
@@ -2951,7 +3615,10 @@ class UBLInvoice:
             )
             country_name.text = customer_party.PostalAddress.country
 
-    def add_paymentmeans(self, pmeans: PaymentMeans):
+        if key is not None:
+            self.fragment_cache.put(key, copy.deepcopy(accounting_customer_party))
+
+    def add_paymentmeans(self, pmeans: PaymentMeans = None):
         """
         2.3.34 Payment Means
         PaymentMeans        : Ödeme Şekli
@@ -2961,10 +3628,11 @@ class UBLInvoice:
         Kullanım            : Bknz. Ortak Sınıflar: PaymentMeans
         Örnek               : Bknz. 2.3.34 Payment Means Örnek
 
-        :param payment_means:
+        :param payment_means: Verilmezse prototipte ödeme şekli varsa o kopyalanır.
         :return:
         """
         if not pmeans:
+            self._append_from_prototype('payment_means')
             return
 
         payment_means = etree.SubElement(self.root,
@@ -2975,6 +3643,9 @@ class UBLInvoice:
                                                 "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}PaymentMeansCode")
             payment_means_code.text = pmeans.PaymentMeansCode
 
+        if pmeans.PayeeFinancialAccount is None:
+            return
+
         # Create the PayeeFinancialAccount element
         payee_financial_account = etree.SubElement(payment_means,
                                                 "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}PayeeFinancialAccount")
@@ -3062,59 +3733,54 @@ class UBLInvoice:
                                     "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}TaxAmount")
         tax_amount.set("currencyID", taxt.CurrencyID)
         tax_amount.text = taxt.TaxAmount
-        # Create the TaxSubtotal element
-        tax_subtotal = etree.SubElement(tax_total,
-                                        "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}TaxSubtotal")
-        # TODO: İlk elementi alıyoruz. Daha sonra düzenlenecek.
         # TODO: Vergi girilmediyse hata veriyor.
 
-        print(taxt.TaxSubtotal, type(taxt.TaxSubtotal))
-        from pprint import pprint
-        pprint(taxt.__dict__)
-
-        if taxt.TaxSubtotal and isinstance(taxt.TaxSubtotal, list):
-            taxt.TaxSubtotal = taxt.TaxSubtotal[0]
-
-        # Create the TaxableAmount element
-        taxable_amount = etree.SubElement(tax_subtotal,
-                                        "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}TaxableAmount")
-        taxable_amount.set("currencyID", taxt.CurrencyID)
-        taxable_amount.text = taxt.TaxSubtotal.TaxableAmount
-        # Create the TaxAmount element
-        tax_amount = etree.SubElement(tax_subtotal,
-                                    "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}TaxAmount")
-        tax_amount.set("currencyID", taxt.CurrencyID)
-        tax_amount.text = taxt.TaxSubtotal.TaxAmount
-
-        # # Create the CalculationSequenceNumeric element
-        # calculation_sequence_numeric = etree.SubElement(
-        #     tax_subtotal,
-        #     "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}CalculationSequenceNumeric"
-        # )
-        # calculation_sequence_numeric.text = taxt.TaxSubtotal.CalculationSequenceNumeric
-        # Create the Percent element
-        percent = etree.SubElement(tax_subtotal,
-                                "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}Percent")
-        percent.text = taxt.TaxSubtotal.Percent
-        # Create the TaxCategory element
-        tax_category = etree.SubElement(tax_subtotal,
-                                        "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}TaxCategory")
-        # Create the TaxScheme element
-        """
-        lxml.etree.DocumentInvalid: Element '{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}TaxScheme', attribute 'schemeID': The attribute 'schemeID' is not allowed., line 102
-        """
-        tax_scheme = etree.SubElement(tax_category,
-                                    "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}TaxScheme")  # , schemeID='UN/ECE 5153', schemeAgencyID='6')
-        # Create the Name element
-        name = etree.SubElement(tax_scheme,
-                                "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}Name")
-        name.text = taxt.TaxSubtotal.TaxCategory.Name
-        # Create the TaxTypeCode element
-        """
-        lxml.etree.DocumentInvalid: Element '{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}TaxTypeCode', attribute 'schemeID': The attribute 'schemeID' is not allowed., line 104
-        """
-        tax_type_code = etree.SubElement(tax_scheme, "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}TaxTypeCode")  # , schemeID='UN/ECE 5305', schemeAgencyID='6')
-        tax_type_code.text = taxt.TaxSubtotal.TaxCategory.TaxScheme.TaxTypeCode
+        # Birden fazla vergi türü/oranı için her alt toplam ayrı TaxSubtotal olarak yazılır.
+        subtotals = taxt.TaxSubtotal if isinstance(taxt.TaxSubtotal, list) else [taxt.TaxSubtotal]
+        for subtotal in subtotals:
+            # Create the TaxSubtotal element
+            tax_subtotal = etree.SubElement(tax_total,
+                                            "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}TaxSubtotal")
+            # Create the TaxableAmount element
+            taxable_amount = etree.SubElement(tax_subtotal,
+                                            "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}TaxableAmount")
+            taxable_amount.set("currencyID", taxt.CurrencyID)
+            taxable_amount.text = subtotal.TaxableAmount
+            # Create the TaxAmount element
+            tax_amount = etree.SubElement(tax_subtotal,
+                                        "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}TaxAmount")
+            tax_amount.set("currencyID", taxt.CurrencyID)
+            tax_amount.text = subtotal.TaxAmount
+
+            # # Create the CalculationSequenceNumeric element
+            # calculation_sequence_numeric = etree.SubElement(
+            #     tax_subtotal,
+            #     "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}CalculationSequenceNumeric"
+            # )
+            # calculation_sequence_numeric.text = subtotal.CalculationSequenceNumeric
+            # Create the Percent element
+            percent = etree.SubElement(tax_subtotal,
+                                    "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}Percent")
+            percent.text = subtotal.Percent
+            # Create the TaxCategory element
+            tax_category = etree.SubElement(tax_subtotal,
+                                            "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}TaxCategory")
+            # Create the TaxScheme element
+            """
+            lxml.etree.DocumentInvalid: Element '{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}TaxScheme', attribute 'schemeID': The attribute 'schemeID' is not allowed., line 102
+            """
+            tax_scheme = etree.SubElement(tax_category,
+                                        "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}TaxScheme")  # , schemeID='UN/ECE 5153', schemeAgencyID='6')
+            # Create the Name element
+            name = etree.SubElement(tax_scheme,
+                                    "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}Name")
+            name.text = subtotal.TaxCategory.Name
+            # Create the TaxTypeCode element
+            """
+            lxml.etree.DocumentInvalid: Element '{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}TaxTypeCode', attribute 'schemeID': The attribute 'schemeID' is not allowed., line 104
+            """
+            tax_type_code = etree.SubElement(tax_scheme, "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}TaxTypeCode")  # , schemeID='UN/ECE 5305', schemeAgencyID='6')
+            tax_type_code.text = subtotal.TaxCategory.TaxScheme.TaxTypeCode
 
     def add_withholdingtaxtotal(self):
         """
@@ -3361,6 +4027,9 @@ class UBLInvoice:
             invoice_line = [invoice_line]
 
         for InvoiceLine in invoice_line:
+            if self.totals is not None:
+                self.totals.add_invoice_line(InvoiceLine)
+
             # InvoiceLine root element
             invoice_line = etree.SubElement(self.root,
                                             "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}InvoiceLine")
@@ -3371,7 +4040,8 @@ class UBLInvoice:
 
             invoiced_quantity = etree.SubElement(invoice_line,
                                                 "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}InvoicedQuantity")
-            invoiced_quantity.set("unitCode", InvoiceLine.InvoicedQuantity_unitCode)
+            if InvoiceLine.InvoicedQuantity_unitCode is not None:
+                invoiced_quantity.set("unitCode", InvoiceLine.InvoicedQuantity_unitCode)
             invoiced_quantity.text = InvoiceLine.InvoicedQuantity
             line_extension_amount = etree.SubElement(invoice_line,
                                                     "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}LineExtensionAmount")
@@ -3385,16 +4055,19 @@ class UBLInvoice:
                                             "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}TaxAmount")
                 tax_amount.set("currencyID", InvoiceLine.currencyID)
                 tax_amount.text = InvoiceLine.TaxTotal.TaxAmount
-                tax_subtotal = etree.SubElement(tax_total,
-                                                "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}TaxSubtotal")
-                taxable_amount = etree.SubElement(tax_subtotal,
-                                                "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}TaxableAmount")
-                taxable_amount.set("currencyID", InvoiceLine.currencyID)
-
-                if not isinstance(InvoiceLine.TaxTotal.TaxSubtotal, list):
-                    InvoiceLine.TaxTotal.TaxSubtotal = [InvoiceLine.TaxTotal.TaxSubtotal]
 
-                for subtotal in InvoiceLine.TaxTotal.TaxSubtotal:
+                # Girdi değiştirilmez; aynı TaxTotal birden çok faturada/thread'de kullanılabilir.
+                subtotals = InvoiceLine.TaxTotal.TaxSubtotal
+                if not isinstance(subtotals, list):
+                    subtotals = [subtotals]
+
+                # Her vergi (örn. KDV ve ÖTV) ayrı bir TaxSubtotal.
+                for subtotal in subtotals:
+                    tax_subtotal = etree.SubElement(tax_total,
+                                                    "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}TaxSubtotal")
+                    taxable_amount = etree.SubElement(tax_subtotal,
+                                                      "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}TaxableAmount")
+                    taxable_amount.set("currencyID", InvoiceLine.currencyID)
                     taxable_amount.text = subtotal.TaxableAmount
                     # Create the TaxAmount element
                     tax_amount = etree.SubElement(tax_subtotal,
@@ -3405,6 +4078,11 @@ class UBLInvoice:
                     percent = etree.SubElement(tax_subtotal,
                                             "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}Percent")
                     percent.text = subtotal.Percent
+
+                    key = line_tax_category_key(subtotal) if self.fragment_cache is not None else None
+                    if key is not None and self._append_cached(tax_subtotal, key):
+                        continue
+
                     # Create the TaxCategory element
                     tax_category = etree.SubElement(tax_subtotal,
                                                     "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}TaxCategory")
@@ -3421,21 +4099,29 @@ class UBLInvoice:
                                                     "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}TaxTypeCode")
                     tax_type_code.text = subtotal.TaxCategory.TaxScheme.TaxTypeCode  # "0015"
 
-            # Create the Item element
-            item = etree.SubElement(invoice_line,
-                                    "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}Item")
-            # Create the Name element
-            name = etree.SubElement(item, "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}Name")
-            name.text = InvoiceLine.Item.Name
-
-            if InvoiceLine.Item.SellersItemIdentification:
-                # Create the SellersItemIdentification element
-                sellers_item_identification = etree.SubElement(item,
-                                                            "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}SellersItemIdentification")
-                # Create the ID element
-                id = etree.SubElement(sellers_item_identification,
-                                    "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}ID")
-                id.text = InvoiceLine.Item.SellersItemIdentification.ID
+                    if key is not None:
+                        self.fragment_cache.put(key, copy.deepcopy(tax_category))
+
+            key = item_key(InvoiceLine.Item) if self.fragment_cache is not None else None
+            if key is None or not self._append_cached(invoice_line, key):
+                # Create the Item element
+                item = etree.SubElement(invoice_line,
+                                        "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}Item")
+                # Create the Name element
+                name = etree.SubElement(item, "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}Name")
+                name.text = InvoiceLine.Item.Name
+
+                if InvoiceLine.Item.SellersItemIdentification:
+                    # Create the SellersItemIdentification element
+                    sellers_item_identification = etree.SubElement(item,
+                                                                "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}SellersItemIdentification")
+                    # Create the ID element
+                    id = etree.SubElement(sellers_item_identification,
+                                        "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}ID")
+                    id.text = InvoiceLine.Item.SellersItemIdentification.ID
+
+                if key is not None:
+                    self.fragment_cache.put(key, copy.deepcopy(item))
 
             # Create the Price element
             price = etree.SubElement(invoice_line,
@@ -3446,6 +4132,82 @@ class UBLInvoice:
             price_amount.set("currencyID", InvoiceLine.currencyID)
             price_amount.text = InvoiceLine.Price.PriceAmount
 
+    def add_invoice_lines_from_columns(self, quantities, unit_codes, prices, vat_rates, item_names, item_ids=None,
+                                       line_ids=None, first_line_id: int = 1, currency_id: str = 'TRY',
+                                       rounding: str = ROUND_HALF_UP) -> ColumnTotals:
+        """
+        Kalemleri sütunlardan (liste, NumPy dizisi, pandas Series, Arrow dizisi) yazar; kalem başına model nesnesi
+        oluşturulmaz. Her kalem add_invoice_line'ın tek KDV alt toplamlı (0015) bir InvoiceLine için ürettiği
+        elemanlarla aynıdır. Tutarlar Decimal ile hesaplanır, bkz. ubl_tr_py.columns.line_columns.
+
+        :param quantities: Miktarlar
+        :param unit_codes: Birim kodları veya bütün kalemler için tek kod, örn. 'C62'
+        :param prices: Birim fiyatlar
+        :param vat_rates: KDV oranları (yüzde) veya bütün kalemler için tek oran
+        :param item_names: Mal/hizmet adları
+        :param item_ids: Satıcı ürün kodları (SellersItemIdentification), boş değerlerde eleman yazılmaz
+        :param line_ids: Kalem sıra numaraları, verilmezse first_line_id'den başlayarak numaralanır
+        :param rounding: Kalem tutarı ve KDV için decimal yuvarlama kipi
+        :return: ColumnTotals; TaxTotal, LegalMonetaryTotal ve LineCountNumeric için toplamlar
+        """
+        columns = line_columns(quantities, unit_codes, prices, vat_rates, item_names, item_ids, line_ids,
+                               first_line_id, rounding)
+        if self.totals is not None:
+            self.totals.add_column_totals(columns.totals)
+
+        cac = "{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}"
+        cbc = "{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}"
+        currency = {"currencyID": currency_id}
+        tax_category_key = ('TaxCategory', VAT_TAX_SCHEME_NAME, VAT_TAX_TYPE_CODE)
+
+        for line_id, quantity, unit_code, amount, tax_amount, percent, price, item_name, item_id in zip(
+                columns.ids, columns.quantities, columns.unit_codes, columns.amounts, columns.tax_amounts,
+                columns.percents, columns.prices, columns.item_names, columns.item_ids):
+            invoice_line = etree.SubElement(self.root, cac + "InvoiceLine")
+            etree.SubElement(invoice_line, cbc + "ID").text = line_id
+            etree.SubElement(invoice_line, cbc + "InvoicedQuantity", unitCode=unit_code).text = quantity
+            etree.SubElement(invoice_line, cbc + "LineExtensionAmount", currency).text = amount
+
+            tax_total = etree.SubElement(invoice_line, cac + "TaxTotal")
+            etree.SubElement(tax_total, cbc + "TaxAmount", currency).text = tax_amount
+            tax_subtotal = etree.SubElement(tax_total, cac + "TaxSubtotal")
+            etree.SubElement(tax_subtotal, cbc + "TaxableAmount", currency).text = amount
+            etree.SubElement(tax_subtotal, cbc + "TaxAmount", currency).text = tax_amount
+            etree.SubElement(tax_subtotal, cbc + "Percent").text = percent
+            if self.fragment_cache is None or not self._append_cached(tax_subtotal, tax_category_key):
+                tax_category = etree.SubElement(tax_subtotal, cac + "TaxCategory")
+                tax_scheme = etree.SubElement(tax_category, cac + "TaxScheme")
+                etree.SubElement(tax_scheme, cbc + "Name").text = VAT_TAX_SCHEME_NAME
+                etree.SubElement(tax_scheme, cbc + "TaxTypeCode").text = VAT_TAX_TYPE_CODE
+                if self.fragment_cache is not None:
+                    self.fragment_cache.put(tax_category_key, copy.deepcopy(tax_category))
+
+            key = ('Item', item_name, item_id is not None, item_id)
+            if self.fragment_cache is None or not self._append_cached(invoice_line, key):
+                item = etree.SubElement(invoice_line, cac + "Item")
+                etree.SubElement(item, cbc + "Name").text = item_name
+                if item_id is not None:
+                    sellers_item_identification = etree.SubElement(item, cac + "SellersItemIdentification")
+                    etree.SubElement(sellers_item_identification, cbc + "ID").text = item_id
+                if self.fragment_cache is not None:
+                    self.fragment_cache.put(key, copy.deepcopy(item))
+
+            price_element = etree.SubElement(invoice_line, cac + "Price")
+            etree.SubElement(price_element, cbc + "PriceAmount", currency).text = price
+
+        return columns.totals
+
+    def add_invoice_lines_from_frame(self, frame, columns: Dict[str, str] = None, **kwargs) -> ColumnTotals:
+        """
+        add_invoice_lines_from_columns'ın tablo sürümü: pandas DataFrame, pyarrow Table, NumPy yapılandırılmış
+        dizisi veya sütun adı -> dizi sözlüğü. pandas/pyarrow bu modülde import edilmez.
+
+        :param columns: Parametre adı -> sütun adı, örn. {'quantities': 'qty', 'vat_rates': 'kdv'}. Eşlenmeyen
+                        parametreler için aynı adlı sütun aranır.
+        :param kwargs: Tablodan gelmeyen parametreler, örn. unit_codes='C62', vat_rates=20, currency_id='EUR'.
+        """
+        return self.add_invoice_lines_from_columns(**{**frame_columns(frame, columns), **kwargs})
+
 
 
     def add_ContractDocumentReference(self, cdr: DocumentReference):
@@ -3470,9 +4232,11 @@ class UBLInvoice:
         """
 
 
-    def dump_xml(self):  # TODO: Move to utils.py
+    def dump_xml(self) -> int:  # TODO: Move to utils.py
+        xml_bytes = etree.tostring(self.root, pretty_print=True, xml_declaration=True, encoding="UTF-8")
         with open("invoice-dump.xml", "w") as f:
-            f.write(etree.tostring(self.root, pretty_print=True, xml_declaration=True, encoding="UTF-8").decode("UTF-8"))
+            f.write(xml_bytes.decode("UTF-8"))
+        return len(xml_bytes)
 
 
 
@@ -3487,37 +4251,18 @@ class TaxTypeCode:
     UBLTR_1.2.1_Kilavuzlar/KOD LİSTELERİ/UBL-TR Kod Listeleri-V 1.31.pdf Versiyon: 1.31 13/20
     """
 
-    def __init__(self):
-        self.tax_type_codes = {
-            "0003": ("GELİR VERGİSİ STOPAJI", "GV STOPAJI"),
-            "0011": ("KURUMLAR VERGİSİ STOPAJI", "KV STOPAJI"),
-            "0015": ("GERÇEK USULDE KATMA DEĞER VERGİSİ", "KDV GERCEK"),
-            "0021": ("BANKA MUAMELELERİ VERGİSİ", "BMV"),
-            "0022": ("SİGORTA MUAMELELERİ VERGİSİ", "SMV"),
-            "0059": ("KONAKLAMA VERGİSİ", "KONAKLAMA VERGİSİ"),
-            "0061": ("KAYNAK KULLANIMI DESTEKLEME FONU KESİNTİSİ", "KKDF KESİNTİ"),
-            "0071": ("PETROL VE DOĞALGAZ ÜRÜNLERİNE İLİŞKİN ÖZEL TÜKETİM VERGİSİ", "ÖTV 1.LİSTE"),
-            "0073": ("KOLALI GAZOZ, ALKOLLÜ İÇEÇEKLER VE TÜTÜN MAMÜLLERİNE İLİŞKİN ÖZEL TÜKETİM VERGİSİ", "ÖTV 3.LİSTE"),
-            "0074": ("DAYANIKLI TÜKETİM VE DİĞER MALLARA İLİŞKİN ÖZEL TÜKETİM VERGİSİ", "ÖTV 4.LİSTE"),
-            "0075": ("ALKOLLÜ İÇEÇEKLERE İLİŞKİN ÖZEL TÜKETİM VERGİSİ", "ÖTV 3A LİSTE"),
-            "0076": ("TÜTÜN MAMÜLLERİNE İLİŞKİN ÖZEL TÜKETİM VERGİSİ", "ÖTV 3B LİSTE"),
-            "0077": ("KOLALI GAZOZLARA İLİŞKİN ÖZEL TÜKETİM VERGİSİ", "ÖTV 3C LİSTE"),
-            "1047": ("DAMGA VERGİSİ", "DAMGA V"),
-            "1048": ("5035 SAYILI KANUNA GÖRE DAMGA VERGİSİ", "5035SKDAMGAV"),
-            "4071": ("ELEKTRİK VE HAVALI GAZ TÜKETİM VERGİSİ", "ELK.HAVAGAZ.TÜK.VER."),
-            "4080": ("ÖZEL İLETİŞİM VERGİSİ", "Ö.İLETİŞİM V"),
-            "4081": ("5035 SAYILI KAUNA GÖRE ÖZEL İLETİŞİM VERGİSİ", "5035ÖZİLETV."),
-            "4171": ("PETROL VE DOĞALGAZ ÜRÜNLERİNE İLİŞKİN ÖTV TEVKİFATI", "PTR-DGZ ÖTV TEVKİFAT"),
-            "8001": ("BORSA TESCİL ÜCRETİ", "BORSA TES.ÜC."),
-            "8002": ("ENERJİ FONU", "ENERJİ FONU"),
-            "8004": ("TRT PAYI", "TRT PAYI"),
-            "8005": ("ELEKTRİK TÜKETİM VERGİSİ", "ELK.TÜK.VER."),
-            "8006": ("TELSİZ KULLANI ÜCRETİ", "TK KULLANIM"),
-            "8007": ("TELSİZ RUHSAT ÜCRETİ", "TK RUHSAT"),
-            "8008": ("ÇEVRE TEMİZLİK VERGİSİ", "ÇEV. TEM .VER."),
-            "9021": ("4961 BANKA SİGORTA MUAMELELERİ VERGİSİ", "4961BANKASMV"),
-            "9040": ("MERA FONU", "MERA FONU"),
-            "9077": ("MOTORLU TAŞIT ARAÇLARINA İLİŞKİN ÖZEL TÜKETİM VERGİSİ (TESCİLE TABİ OLANLAR)", "ÖTV 2.LİSTE"),
-            "9944": ("BELEDİYELERE ÖDENEN HAL RÜSUMU", "BEL.ÖD.HAL RÜSUM"),
-        }
+    # (CodeList, kod -> (ad, kısa ad)); liste register_code_list ile değiştirilirse yeniden kurulur.
+    _tax_type_codes: Optional[tuple] = None
 
+    @property
+    def tax_type_codes(self) -> Mapping[str, Tuple[str, str]]:
+        """
+        Vergi kodu -> (ad, kısa ad), salt okunur. Liste her örnekte yeniden kurulmaz; kodlar ve aramalar için
+        bkz. codelists.get_code_list('TaxTypeCode').
+        """
+        code_list = get_code_list('TaxTypeCode')
+        cached = TaxTypeCode._tax_type_codes
+        if cached is None or cached[0] is not code_list:
+            cached = TaxTypeCode._tax_type_codes = (code_list, MappingProxyType(
+                {entry.code: (entry.name, entry.short_name) for entry in code_list.entries}))
+        return cached[1]
@@ -0,0 +1,233 @@
+# Gelen faturalardaki ekler (cac:AdditionalDocumentReference/cac:Attachment/cbc:EmbeddedDocumentBinaryObject):
+# base64 içerik çözülmeden listelenir, seçilen ek parça parça çözülerek dosyaya yazılır.
+#
+#   from ubl_tr_py.attachments import list_attachments, save_attachment, read_attachment
+#   for attachment in list_attachments('gelen/hks.xml'):
+#       attachment.index, attachment.filename, attachment.mimeCode, attachment.encoded_size
+#   save_attachment('gelen/hks.xml', '0012020000000010.xslt', 'fatura.xslt')   # sıra numarası, dosya adı
+#   xslt = read_attachment('gelen/hks.xml', 0)                                    # bütün ek bellekte (bytes)
+#
+# Belge SAX benzeri bir parser target'ı ile okunur; ağaç oluşturulmaz. base64 metni parser'dan parçalar halinde
+# gelir: listelerken yalnızca uzunluğu sayılır, çözülürken her parça (4 karakterin katı) çözülüp hemen yazılır.
+# Bellekte en fazla bir okuma parçası (CHUNK_SIZE) kadar base64 ve karşılığı tutulur; read_attachment dışında ekin
+# çözülmüş bir kopyası bellekte oluşmaz.
+#
+# UBL-TR şemasında AdditionalDocumentReference elemanları imza (cac:Signature) ve taraflardan önce gelir; okuma
+# bunlardan birine gelince bırakılır, faturanın geri kalanı (taraflar, kalemler) okunmaz. Yalnızca kök elemanın
+# doğrudan çocuğu olan AdditionalDocumentReference'lar ele alınır.
+
+import binascii
+import io
+import os
+from typing import Any, BinaryIO, Iterator, List, Union
+
+from lxml import etree
+
+from .UBLInvoice import Model
+from .reader import INVOICE, CAC, CBC
+
+CHUNK_SIZE = 1 << 16
+
+_DOCUMENT_REFERENCE = CAC + 'AdditionalDocumentReference'
+_ATTACHMENT = CAC + 'Attachment'
+_BINARY_OBJECT = CBC + 'EmbeddedDocumentBinaryObject'
+_REFERENCE_FIELDS = {CBC + 'ID': 'ID', CBC + 'IssueDate': 'IssueDate', CBC + 'DocumentType': 'DocumentType'}
+# Şema sırasında eklerden sonra gelen zorunlu elemanlar.
+_AFTER_ATTACHMENTS = frozenset((CAC + 'Signature', CAC + 'AccountingSupplierParty'))
+_WHITESPACE = str.maketrans('', '', ' \t\r\n')
+
+
+class Attachment(Model):
+    """
+    Faturadaki bir ek. index: eklerin belgedeki sırası (0'dan); ID, IssueDate, DocumentType: ekin
+    AdditionalDocumentReference alanları; filename, mimeCode, encodingCode, characterSetCode:
+    EmbeddedDocumentBinaryObject attribute'ları; encoded_size: base64 metnin boşluklar hariç uzunluğu (karakter).
+    Çözülmüş boyut yaklaşık encoded_size * 3 / 4'tür.
+    """
+    __slots__ = ('index', 'ID', 'IssueDate', 'DocumentType', 'filename', 'mimeCode', 'encodingCode',
+                 'characterSetCode', 'encoded_size')
+
+    def __init__(self, index: int, ID: str = None, IssueDate: str = None, DocumentType: str = None,
+                 filename: str = None, mimeCode: str = None, encodingCode: str = None, characterSetCode: str = None,
+                 encoded_size: int = 0):
+        self.index = index
+        self.ID = ID
+        self.IssueDate = IssueDate
+        self.DocumentType = DocumentType
+        self.filename = filename
+        self.mimeCode = mimeCode
+        self.encodingCode = encodingCode
+        self.characterSetCode = characterSetCode
+        self.encoded_size = encoded_size
+
+
+class _AttachmentTarget:
+    """
+    Parser target'ı. Ekleri listeler; select verilirse o ekin base64 içeriğini çözüp decoded listesine ekler.
+    done: okumaya devam etmeye gerek kalmadı (ekler bitti veya seçilen ek çözüldü).
+    """
+
+    def __init__(self, select: Union[int, str] = None):
+        self.select = select
+        self.attachments = []
+        self.decoded = []
+        self.done = False
+        self._depth = 0
+        self._reference = None
+        self._field = None
+        self._text = []
+        self._attachment = None
+        self._decoding = False
+        self._pending = ''
+
+    def _selected(self, attachment: Attachment) -> bool:
+        if isinstance(self.select, int):
+            return attachment.index == self.select
+        return self.select is not None and attachment.filename == self.select
+
+    def start(self, tag, attrib):
+        self._depth += 1
+        depth = self._depth
+        if depth == 1:
+            if tag != INVOICE:
+                raise ValueError(f'Not a UBL-TR Invoice document: {tag}')
+        elif depth == 2:
+            if tag == _DOCUMENT_REFERENCE:
+                self._reference = {}
+            elif tag in _AFTER_ATTACHMENTS:
+                self.done = True
+        elif self._reference is None:
+            return
+        elif depth == 3:
+            self._field = _REFERENCE_FIELDS.get(tag)
+        elif depth == 4 and tag == _BINARY_OBJECT:
+            self._attachment = Attachment(len(self.attachments), filename=attrib.get('filename'),
+                                          mimeCode=attrib.get('mimeCode'), encodingCode=attrib.get('encodingCode'),
+                                          characterSetCode=attrib.get('characterSetCode'), **self._reference)
+            self._decoding = self._selected(self._attachment)
+
+    def data(self, data):
+        if self._attachment is not None:
+            data = data.translate(_WHITESPACE)
+            self._attachment.encoded_size += len(data)
+            if self._decoding:
+                data = self._pending + data
+                end = len(data) - len(data) % 4
+                if end:
+                    self.decoded.append(binascii.a2b_base64(data[:end]))
+                self._pending = data[end:]
+        elif self._field is not None:
+            self._text.append(data)
+
+    def end(self, tag):
+        depth = self._depth
+        self._depth -= 1
+        if self._reference is None:
+            return
+        if depth == 2:
+            self._reference = None
+        elif depth == 3 and self._field is not None:
+            self._reference[self._field] = ''.join(self._text)
+            self._field = None
+            self._text = []
+        elif depth == 4 and self._attachment is not None:
+            self.attachments.append(self._attachment)
+            self._attachment = None
+            if self._decoding:
+                if self._pending:
+                    raise ValueError(f'Attachment {self.select!r}: invalid base64 length')
+                self._decoding = False
+                self.done = True
+
+    def close(self):
+        return self.attachments
+
+
+def _chunks(source: Union[str, os.PathLike, bytes, Any], size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as f:
+            yield from _chunks(f, size)
+        return
+    while True:
+        chunk = source.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _parse(source, target: _AttachmentTarget) -> Iterator[None]:
+    # Her okuma parçasından sonra bir kez döner; target.done olunca dosyanın kalanı okunmaz.
+    parser = etree.XMLParser(target=target, huge_tree=True, resolve_entities=False, no_network=True)
+    for chunk in _chunks(source):
+        parser.feed(chunk)
+        yield
+        if target.done:
+            return
+    parser.close()
+
+
+def list_attachments(source: Union[str, os.PathLike, bytes, Any]) -> List[Attachment]:
+    """
+    Faturadaki ekleri içeriklerini çözmeden listeler.
+
+    :param source: Dosya yolu, okunabilir (binary) dosya nesnesi veya bytes.
+    :return: Attachment listesi, belgedeki sırayla.
+    :raises ValueError: Belge UBL-TR Invoice değilse.
+    """
+    target = _AttachmentTarget()
+    for _ in _parse(source, target):
+        pass
+    return target.attachments
+
+
+def iter_attachment(source: Union[str, os.PathLike, bytes, Any], attachment: Union[int, str, Attachment]
+                    ) -> Iterator[bytes]:
+    """
+    Seçilen ekin çözülmüş içeriğini parça parça verir (her okuma parçası için en fazla bir bytes).
+
+    :param source: Dosya yolu, okunabilir (binary) dosya nesnesi veya bytes.
+    :param attachment: Ekin sıra numarası (Attachment.index), dosya adı (filename) veya list_attachments'tan
+                       dönen Attachment.
+    :raises KeyError: Belgede böyle bir ek yoksa.
+    :raises ValueError: Belge UBL-TR Invoice değilse veya base64 içerik bozuksa (binascii.Error da ValueError'dır).
+    """
+    target = _AttachmentTarget(attachment.index if isinstance(attachment, Attachment) else attachment)
+    for _ in _parse(source, target):
+        if target.decoded:
+            yield from target.decoded
+            target.decoded.clear()
+    if not any(target._selected(found) for found in target.attachments):
+        raise KeyError(f'Attachment not found: {target.select!r}')
+
+
+def save_attachment(source: Union[str, os.PathLike, bytes, Any], attachment: Union[int, str, Attachment],
+                    output: Union[str, os.PathLike, BinaryIO]) -> int:
+    """
+    Seçilen eki çözerek parça parça output'a yazar; çözülmüş içerik bellekte tutulmaz.
+
+    :param source: Dosya yolu, okunabilir (binary) dosya nesnesi veya bytes.
+    :param attachment: Bkz. iter_attachment.
+    :param output: Dosya yolu veya yazılabilir binary dosya nesnesi.
+    :return: Yazılan bayt sayısı.
+    :raises KeyError: Belgede böyle bir ek yoksa (dosya yolu verildiyse dosya yine de oluşturulmuş olur).
+    """
+    if isinstance(output, (str, os.PathLike)):
+        with open(output, 'wb') as f:
+            return save_attachment(source, attachment, f)
+    size = 0
+    for data in iter_attachment(source, attachment):
+        output.write(data)
+        size += len(data)
+    return size
+
+
+def read_attachment(source: Union[str, os.PathLike, bytes, Any], attachment: Union[int, str, Attachment]) -> bytes:
+    """
+    Seçilen ekin çözülmüş içeriğinin tamamı (bytes). Büyük ekler için save_attachment / iter_attachment.
+
+    :param source: Dosya yolu, okunabilir (binary) dosya nesnesi veya bytes.
+    :param attachment: Bkz. iter_attachment.
+    """
+    return b''.join(iter_attachment(source, attachment))
@@ -0,0 +1,388 @@
+# Çok sayıda faturayı süreç havuzunda oluşturur, serileştirir ve isteğe bağlı olarak doğrular.
+#
+# Bir günün bütün siparişleri için e-Arşiv faturaları tek çalıştırmada üretilir. Her kayıt düz bir sözlüktür
+# (veya aynı alanlara sahip bir nesne); alanlar add_* metodlarının parametreleridir ve şemadaki sırayla
+# uygulanır (bkz. RECORD_FIELDS). Model nesneleri (PartyData, TaxTotal, InvoiceLine, ...) olduğu gibi
+# kullanılabilir, worker'lara pickle ile gönderilir.
+#
+#   register_prototype('gotur', InvoicePrototype(KolaysoftSignature(), supplier, payment_means))
+#   records = ({'prototype': 'gotur', 'profile_id': 'EARSIVFATURA', 'id': order.invoice_no,
+#               'issue_date': order.date, 'invoice_type_code': 'SATIS', 'customer_party': order.customer,
+#               'tax_total': order.tax_total, 'legal_monetary_total': order.totals,
+#               'invoice_lines': order.lines} for order in orders)
+#
+#   for invoice_id, uuid, xml_bytes, errors in build_many(records, workers=8, validate=True):
+#       ...
+#
+# check_codes=True ise kayıttaki kodlu alanlar (senaryo, fatura tipi, para birimi, birim, vergi, tevkifat ve
+# muafiyet kodları) UBL-TR kod listelerinde aranır; listede olmayan kodlar errors listesine yazılır.
+#
+# Worker'lar başlarken şemayı derler ve kayıtlı prototipleri bir kez oluşturur (InvoicePrototype.options).
+# Kayıtlar chunksize'lık gruplar halinde gönderilir; aynı anda en fazla max_pending grup işlenir ya da
+# sonucu bekler. Kayıt iterator'ı sonuçlar tüketildikçe okunur, bütün gün bellekte tutulmaz.
+
+import functools
+import itertools
+import os
+import queue
+import time
+from collections import deque
+from collections.abc import Mapping
+from multiprocessing import Pool
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from lxml import etree
+
+from ubl_tr_py.UBLInvoice import (UBLInvoice, InvoiceLine, InvoicePrototype, ValidationError, PROTOTYPES, register_prototype,
+                                  _section_of)
+from ubl_tr_py.codelists import get_code_list
+from ubl_tr_py.emitter import UBLInvoiceEmitter
+from ubl_tr_py.fragments import FragmentCache
+from ubl_tr_py.instrumentation import Instrumentation, SectionTimer
+from ubl_tr_py.schemas import get_schema
+
+# Alan verilmezse metod çağrılmaz.
+OPTIONAL = object()
+# Alan verilmezse hata.
+REQUIRED = object()
+
+# (kayıt alanı, UBLInvoice metodu, varsayılan) şemadaki sırayla. Liste/demet verilen alanlarda metod her eleman
+# için çağrılır (note, payment_terms, tax_total). Varsayılanı None olan alanlarda metod parametresiz çağrılır,
+# değer prototipten veya metodun kendi varsayılanından gelir.
+RECORD_FIELDS = (
+    ('profile_id', 'add_profile_id', 'TEMELFATURA'),
+    ('id', 'add_id', REQUIRED),
+    ('copy_indicator', 'add_copy_indicator', 'false'),
+    ('uuid', 'add_uuid', None),
+    ('issue_date', 'add_issue_date', REQUIRED),
+    ('issue_time', 'add_issue_time', OPTIONAL),
+    ('invoice_type_code', 'add_invoice_type_code', REQUIRED),
+    ('note', 'add_note', OPTIONAL),
+    ('document_currency_code', 'add_document_currency_code', None),
+    ('line_count_numeric', 'add_line_count_numeric', None),
+    ('despatch_document_reference', 'add_despatch_document_reference', OPTIONAL),
+    ('signatory', 'add_signature', None),
+    ('supplier_party', 'add_accounting_supplier_party', None),
+    ('customer_party', 'add_accounting_customer_party', REQUIRED),
+    ('payment_means', 'add_paymentmeans', None),
+    ('payment_terms', 'add_paymentterms', OPTIONAL),
+    ('tax_total', 'add_taxtotal', REQUIRED),
+    ('legal_monetary_total', 'add_legalmonetarytotal', REQUIRED),
+    ('invoice_lines', 'add_invoice_line', REQUIRED),
+)
+
+# Prototipten gelen alanlar; UBLInvoiceEmitter prototip kopyalamadığı için bunları kayda ekleriz.
+_PROTOTYPE_FIELDS = ('signatory', 'supplier_party', 'payment_means', 'document_currency_code')
+
+# (kayıt alanı, kod listesi, eleman yolu) belge düzeyindeki kodlu alanlar, bkz. code_errors.
+CODED_FIELDS = (
+    ('profile_id', 'ProfileID', '/*/cbc:ProfileID'),
+    ('invoice_type_code', 'InvoiceTypeCode', '/*/cbc:InvoiceTypeCode'),
+    ('document_currency_code', 'CurrencyCode', '/*/cbc:DocumentCurrencyCode'),
+)
+
+# build_many sonucu: (fatura numarası, ETTN, UTF-8 XML, hatalar). Oluşturulamayan kayıtta XML None'dır.
+BuildResult = Tuple[Optional[str], Optional[str], Optional[bytes], List[ValidationError]]
+
+
+def _fields(record: Any) -> Dict[str, Any]:
+    """
+    Kaydın alanlarının kopyası (sözlük, __dict__'li veya __slots__'lu nesne); kayda geri yazılmaz.
+    invoice_lines her zaman liste olarak döner (tek kalem, demet veya herhangi bir iterable verilebilir).
+    """
+    if isinstance(record, Mapping):
+        fields = dict(record)
+    else:
+        fields = {}
+        for cls in type(record).__mro__:
+            slots = cls.__dict__.get('__slots__', ())
+            for name in (slots,) if isinstance(slots, str) else slots:
+                if name not in fields and name not in ('__dict__', '__weakref__') and hasattr(record, name):
+                    fields[name] = getattr(record, name)
+        fields.update(getattr(record, '__dict__', {}))
+    lines = fields.get('invoice_lines')
+    if lines is not None and not isinstance(lines, list):
+        # add_invoice_line liste veya tek kalem bekler; demet ve generator'lar bir kez listeye çevrilir.
+        fields['invoice_lines'] = list(lines) if isinstance(lines, Iterable) and not isinstance(lines, InvoiceLine) \
+            else [lines]
+    return fields
+
+
+def build_invoice(record: Any, emitter: bool = False, fragment_cache: FragmentCache = None,
+                  instrumentation: Instrumentation = None):
+    """
+    Kayıttan faturayı oluşturur.
+
+    :param record: RECORD_FIELDS alanlarını içeren sözlük veya nesne. 'prototype' alanı verilirse kayıtlı
+                   prototip kullanılır (bkz. register_prototype). line_count_numeric verilmezse kalem sayısı yazılır.
+    :param emitter: True ise UBLInvoiceEmitter ile doğrudan metin üretilir.
+    :param instrumentation: Faturaya verilir, bkz. ubl_tr_py.instrumentation.
+    :return: UBLInvoice veya UBLInvoiceEmitter
+    """
+    fields = _fields(record)
+    prototype = fields.get('prototype')
+    if prototype is not None and prototype not in PROTOTYPES:
+        raise ValueError(f'Unknown invoice prototype: {prototype}')
+    options = PROTOTYPES[prototype].options if prototype else {}
+
+    if emitter:
+        doc = UBLInvoiceEmitter(fragment_cache=fragment_cache, instrumentation=instrumentation)
+        for name in _PROTOTYPE_FIELDS:
+            if fields.get(name) is None and options.get(name) is not None:
+                fields[name] = options[name]
+    else:
+        doc = UBLInvoice(prototype=prototype, fragment_cache=fragment_cache, instrumentation=instrumentation)
+
+    if emitter or not prototype:
+        doc.add_ubl_extension()
+        doc.add_ubl_version_id(options.get('ubl_version_id', '2.1'))
+        doc.add_customisation_id(options.get('customisation_id', 'TR1.2'))
+
+    if fields.get('line_count_numeric') is None and fields.get('invoice_lines') is not None:
+        fields['line_count_numeric'] = str(len(fields['invoice_lines']))
+
+    for name, method, default in RECORD_FIELDS:
+        value = fields.get(name)
+        if value is None:
+            if default is REQUIRED:
+                raise ValueError(f'Invoice record has no {name!r}')
+            if default is OPTIONAL:
+                continue
+            value = default
+        add = getattr(doc, method)
+        if name == 'despatch_document_reference':
+            if isinstance(value, Mapping):
+                add(**value)
+            else:
+                add(*value)
+        elif name in ('note', 'payment_terms', 'tax_total') and isinstance(value, (list, tuple)):
+            for item in value:
+                add(item)
+        elif value is None:
+            add()
+        else:
+            add(value)
+    return doc
+
+
+def code_errors(record: Any) -> List[ValidationError]:
+    """
+    Kayıttaki kodları UBL-TR kod listelerinde arar (bkz. codelists), listede olmayanlar için hata döndürür.
+    Belge düzeyindeki alanlar (CODED_FIELDS), para birimleri, TaxTotal/kalem vergi kodları ve muafiyet sebepleri,
+    kalem birim kodları ve tevkifat kodları kontrol edilir.
+    """
+    fields = _fields(record)
+    errors = []
+
+    def check(list_name: str, code: Optional[str], path: str):
+        if code is not None and code not in get_code_list(list_name):
+            errors.append(ValidationError(section=_section_of(path), path=path,
+                                          message=f'{code!r} is not in UBL-TR code list {list_name}'))
+
+    def check_tax_total(tax_total, path: str, list_name: str = 'TaxTypeCode'):
+        if tax_total is None:
+            return
+        check('CurrencyCode', tax_total.CurrencyID, f'{path}/cbc:TaxAmount/@currencyID')
+        subtotals = tax_total.TaxSubtotal if isinstance(tax_total.TaxSubtotal, list) else [tax_total.TaxSubtotal]
+        for i, subtotal in enumerate(subtotals, 1):
+            tax_category = subtotal.TaxCategory
+            if tax_category is None:
+                continue
+            category_path = f'{path}/cac:TaxSubtotal[{i}]/cac:TaxCategory'
+            check('TaxExemptionReasonCode', tax_category.TaxExemptionReasonCode,
+                  f'{category_path}/cbc:TaxExemptionReasonCode')
+            if tax_category.TaxScheme is not None:
+                check(list_name, tax_category.TaxScheme.TaxTypeCode, f'{category_path}/cac:TaxScheme/cbc:TaxTypeCode')
+
+    for name, list_name, path in CODED_FIELDS:
+        value = fields.get(name)
+        if value is not None:
+            check(list_name, value, path)
+
+    tax_totals = fields.get('tax_total')
+    for tax_total in tax_totals if isinstance(tax_totals, (list, tuple)) else [tax_totals]:
+        check_tax_total(tax_total, '/*/cac:TaxTotal')
+    monetary_total = fields.get('legal_monetary_total')
+    if monetary_total is not None:
+        check('CurrencyCode', monetary_total.CurrencyID, '/*/cac:LegalMonetaryTotal/cbc:PayableAmount/@currencyID')
+
+    for i, line in enumerate(fields.get('invoice_lines') or (), 1):
+        path = f'/*/cac:InvoiceLine[{i}]'
+        check('UnitCode', line.InvoicedQuantity_unitCode, f'{path}/cbc:InvoicedQuantity/@unitCode')
+        check('CurrencyCode', line.currencyID, f'{path}/cbc:LineExtensionAmount/@currencyID')
+        check_tax_total(line.TaxTotal, f'{path}/cac:TaxTotal')
+        withholding = line.WithholdingTaxTotal
+        for j, tax_total in enumerate(withholding if isinstance(withholding, (list, tuple)) else [withholding], 1):
+            check_tax_total(tax_total, f'{path}/cac:WithholdingTaxTotal[{j}]', 'WithholdingTaxTypeCode')
+    return errors
+
+
+def build_record(record: Any, validate: bool = False, emitter: bool = False,
+                 fragment_cache: FragmentCache = None, check_codes: bool = False,
+                 instrumentation: Instrumentation = None) -> BuildResult:
+    """
+    Tek kaydı oluşturur, serileştirir ve istenirse doğrular. Kayıttaki hatalar istisna fırlatmaz,
+    sonuçtaki hata listesine yazılır; toplu üretimde tek bir hatalı sipariş bütün çalıştırmayı durdurmaz.
+
+    :param check_codes: True ise kodlu alanlar kod listelerinde aranır, bkz. code_errors.
+    :param instrumentation: Verilirse fatura bölümleri, serileştirme, doğrulama ve kod kontrolü ölçülür.
+    """
+    fields = _fields(record)
+    invoice_id = fields.get('id')
+    try:
+        errors = []
+        if check_codes:
+            start = time.perf_counter()
+            errors = code_errors(fields)
+            if instrumentation is not None:
+                _record(instrumentation, 'check_codes', time.perf_counter() - start)
+        # Alanların kopyası: invoice_lines bir generator ise code_errors'ta tükenmiş olmaz.
+        doc = build_invoice(fields, emitter, fragment_cache, instrumentation)
+    except Exception as e:
+        return invoice_id, fields.get('uuid'), None, [ValidationError(section=None, path=None,
+                                                                      message=f'{type(e).__name__}: {e}')]
+
+    xml_bytes = doc.tobytes()
+    if validate and not emitter:
+        errors += doc.validate()
+    elif validate:
+        # Emitter çıktısı doğrulama için parse edilir.
+        start = time.perf_counter()
+        schema = get_schema('Invoice')
+        if not schema.validate(etree.fromstring(xml_bytes)):
+            errors += [ValidationError(section=_section_of(error.path), path=error.path, message=error.message)
+                       for error in schema.error_log]
+        if instrumentation is not None:
+            _record(instrumentation, 'validate', time.perf_counter() - start)
+    return invoice_id, doc.uuid, xml_bytes, errors
+
+
+def _record(instrumentation: Instrumentation, section: str, seconds: float, elements: int = 0, size: int = 0):
+    getattr(instrumentation, 'record', instrumentation)(section, seconds, elements, size)
+
+
+# Worker süreçlerinin parça önbelleği ve ölçümü, bkz. _init_worker.
+_worker_fragment_cache: Optional[FragmentCache] = None
+_worker_timer: Optional[SectionTimer] = None
+
+
+def _init_worker(prototypes: Dict[str, dict] = None, fragment_cache_options: dict = None, validate: bool = False,
+                 instrumented: bool = False):
+    # Şemayı ve prototipleri worker başlarken oluştur, ilk faturaların süresine eklenmesin.
+    global _worker_fragment_cache, _worker_timer
+    if validate:
+        get_schema('Invoice')
+    for name, options in (prototypes or {}).items():
+        register_prototype(name, InvoicePrototype(**options))
+    if fragment_cache_options is not None:
+        _worker_fragment_cache = FragmentCache(**fragment_cache_options)
+    if instrumented:
+        _worker_timer = SectionTimer()
+
+
+def _build_chunk(records: List[Any], validate: bool = False, emitter: bool = False,
+                 check_codes: bool = False) -> Tuple[List[BuildResult], Optional[Dict[str, dict]]]:
+    # Sonuçlar ve worker ölçümü varsa bu gruptaki bölüm süreleri (ana süreçte SectionTimer.merge ile toplanır).
+    results = [build_record(record, validate, emitter, _worker_fragment_cache, check_codes, _worker_timer)
+               for record in records]
+    return results, _worker_timer.drain() if _worker_timer is not None else None
+
+
+def _chunks(records: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    records = iter(records)
+    while True:
+        chunk = list(itertools.islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def build_many(records: Iterable[Any], workers: int = None, validate: bool = False, ordered: bool = True,
+               chunksize: int = 8, max_pending: int = None, emitter: bool = False,
+               prototypes: Dict[str, dict] = None, fragment_cache_options: dict = None,
+               check_codes: bool = False, instrumentation: Instrumentation = None) -> Iterator[BuildResult]:
+    """
+    Kayıtlardan faturaları süreç havuzunda oluşturur; her kayıt için (invoice_id, uuid, xml_bytes, errors) döndürür.
+    workers=1 ise havuz kurulmadan aynı süreçte çalışır. Döngü erken bırakılırsa havuz kapatılır,
+    kalan kayıtlar oluşturulmaz.
+
+    :param validate: True ise her fatura XSD şemasına göre doğrulanır, hatalar errors listesine yazılır.
+    :param ordered: True ise sonuçlar kayıt sırasıyla, False ise tamamlandıkça döner.
+    :param chunksize: Worker'a tek seferde gönderilen kayıt sayısı.
+    :param max_pending: Aynı anda işlenen veya tüketilmeyi bekleyen en fazla grup sayısı (varsayılan: 2 x workers).
+                        Dolunca yeni kayıt okunmaz; yavaş tüketicide bellek kullanımı sınırlı kalır.
+    :param emitter: True ise faturalar UBLInvoiceEmitter ile üretilir (doğrulama için ayrıca parse edilir).
+    :param prototypes: Worker'larda kaydedilecek prototipler, ad -> InvoicePrototype parametreleri.
+                       Verilmezse bu süreçte kayıtlı bütün prototipler (PROTOTYPES) kullanılır.
+    :param fragment_cache_options: Verilirse her worker bu parametrelerle bir FragmentCache kurar,
+                                   örn. {'max_entries': 10000}.
+    :param check_codes: True ise kayıtlardaki kodlar UBL-TR kod listelerinde aranır, bkz. code_errors.
+    :param instrumentation: Bölüm süreleri, örn. SectionTimer(). Havuzda her worker kendi SectionTimer'ını tutar,
+                            ölçümler gruplarla birlikte döner ve instrumentation.merge() ile toplanır.
+    """
+    build = functools.partial(_build_chunk, validate=validate, emitter=emitter, check_codes=check_codes)
+    chunks = _chunks(records, chunksize)
+
+    if workers == 1:
+        # Aynı süreçte: önbellek bu çağrıya ait, verilen prototipler yalnızca çağrı süresince kayıtlı.
+        added = [name for name in (prototypes or {}) if name not in PROTOTYPES]
+        for name in added:
+            register_prototype(name, InvoicePrototype(**prototypes[name]))
+        fragment_cache = FragmentCache(**fragment_cache_options) if fragment_cache_options is not None else None
+        if validate:
+            get_schema('Invoice')
+        try:
+            for chunk in chunks:
+                for record in chunk:
+                    yield build_record(record, validate, emitter, fragment_cache, check_codes, instrumentation)
+        finally:
+            for name in added:
+                PROTOTYPES.pop(name, None)
+        return
+
+    if instrumentation is not None and not hasattr(instrumentation, 'merge'):
+        raise ValueError('build_many() with a process pool needs an instrumentation with merge(), '
+                         'e.g. SectionTimer(); use workers=1 for other instrumentation')
+
+    def merged(chunk_result) -> List[BuildResult]:
+        results, stats = chunk_result
+        if stats:
+            instrumentation.merge(stats)
+        return results
+
+    if prototypes is None:
+        prototypes = {name: prototype.options for name, prototype in PROTOTYPES.items()}
+    workers = workers or os.cpu_count()
+    max_pending = max_pending or 2 * workers
+
+    with Pool(processes=workers, initializer=_init_worker,
+              initargs=(prototypes, fragment_cache_options, validate, instrumentation is not None)) as pool:
+        if ordered:
+            pending = deque()
+            for chunk in chunks:
+                if len(pending) >= max_pending:
+                    yield from merged(pending.popleft().get())
+                pending.append(pool.apply_async(build, (chunk,)))
+            while pending:
+                yield from merged(pending.popleft().get())
+            return
+
+        # Tamamlanan grupların sonuçları (veya worker'daki istisna) callback ile kuyruğa düşer.
+        done = queue.Queue()
+
+        def completed() -> List[BuildResult]:
+            chunk_result = done.get()
+            if isinstance(chunk_result, BaseException):
+                raise chunk_result
+            return merged(chunk_result)
+
+        pending = 0
+        for chunk in chunks:
+            if pending >= max_pending:
+                yield from completed()
+                pending -= 1
+            pool.apply_async(build, (chunk,), callback=done.put, error_callback=done.put)
+            pending += 1
+        while pending:
+            yield from completed()
+            pending -= 1
@@ -0,0 +1,513 @@
+# UBL-TR kod listeleri: vergi kodları, senaryolar (ProfileID), fatura tipleri, birim ve para birimi kodları,
+# tevkifat kodları ve muafiyet/istisna sebepleri.
+#
+# Listeler ilk kullanımda bir kez kurulur ve süreç boyunca paylaşılır; her liste değiştirilemez bir CodeList'tir,
+# kod -> kayıt ve ad/kısa ad -> kod aramaları sözlükle yapılır. Toplu üretimde kodlu alanların kontrolü
+# (bkz. batch.build_many(check_codes=True)) bu aramalarla yapılır.
+#
+#   get_code_list('TaxTypeCode').name_of('0015')            # 'GERÇEK USULDE KATMA DEĞER VERGİSİ'
+#   get_code_list('TaxTypeCode').code_of('KDV GERCEK')       # '0015' (ad veya kısa ad)
+#   'SATIS' in get_code_list('InvoiceTypeCode')              # True
+#   get_code_list('WithholdingTaxTypeCode')['606'].percent   # 90
+#
+# Kaynak: UBL-TR Kod Listeleri (GİB). Birim kodlarında GİB listesinde olmayanlar UN/ECE Rec 20 listesinden
+# alınır; burada yalnızca sık kullanılanları vardır. GİB listeleri güncellendiğinde veya eksik bir kod
+# gerektiğinde liste register_code_list ile değiştirilir:
+#
+#   unit_codes = get_code_list('UnitCode')
+#   register_code_list('UnitCode', unit_codes.entries + (('XPP', 'PAKET (TEK)'),))
+
+import threading
+from types import MappingProxyType
+from typing import Dict, Iterable, Iterator, Mapping, NamedTuple, Optional, Tuple
+
+
+class Code(NamedTuple):
+    """
+    Kod listesi kaydı.
+
+    code        : Kod, örn. '0015'
+    name        : Adı
+    short_name  : Kısa adı (vergi kodlarında), yoksa None
+    percent     : Oran (tevkifat kodlarında yüzde olarak, örn. 90 = 9/10), yoksa None
+    """
+    code: str
+    name: str
+    short_name: Optional[str] = None
+    percent: Optional[int] = None
+
+
+class CodeList:
+    """
+    Değiştirilemez kod listesi. Kod, ad ve kısa ad aramaları için indeksler bir kez kurulur.
+
+    :param name: Liste adı, örn. 'TaxTypeCode'
+    :param entries: (kod, ad[, kısa ad[, oran]]) demetleri veya Code kayıtları
+    """
+    __slots__ = ('name', 'entries', '_by_code', '_by_name', '_by_short_name')
+
+    def __init__(self, name: str, entries: Iterable[tuple]):
+        entries = tuple(entry if isinstance(entry, Code) else Code(*entry) for entry in entries)
+        by_code = {}
+        by_name = {}
+        by_short_name = {}
+        for entry in entries:
+            if entry.code in by_code:
+                raise ValueError(f'Duplicate code {entry.code!r} in code list {name}')
+            by_code[entry.code] = entry
+            # Aynı adı taşıyan kodlarda ilk kod kullanılır.
+            by_name.setdefault(entry.name, entry.code)
+            if entry.short_name is not None:
+                by_short_name.setdefault(entry.short_name, entry.code)
+
+        set_attribute = object.__setattr__
+        set_attribute(self, 'name', name)
+        set_attribute(self, 'entries', entries)
+        set_attribute(self, '_by_code', MappingProxyType(by_code))
+        set_attribute(self, '_by_name', MappingProxyType(by_name))
+        set_attribute(self, '_by_short_name', MappingProxyType(by_short_name))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'CodeList {self.name} cannot be modified')
+
+    def __contains__(self, code) -> bool:
+        return code in self._by_code
+
+    def __getitem__(self, code: str) -> Code:
+        try:
+            return self._by_code[code]
+        except KeyError:
+            raise KeyError(f'{code!r} is not in code list {self.name}') from None
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._by_code)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __repr__(self):
+        return f'<CodeList {self.name}: {len(self.entries)} codes>'
+
+    def get(self, code: str, default=None) -> Optional[Code]:
+        return self._by_code.get(code, default)
+
+    def name_of(self, code: str) -> Optional[str]:
+        """Kodun adı, listede yoksa None."""
+        entry = self._by_code.get(code)
+        return entry.name if entry is not None else None
+
+    def short_name_of(self, code: str) -> Optional[str]:
+        entry = self._by_code.get(code)
+        return entry.short_name if entry is not None else None
+
+    def code_of(self, name: str) -> Optional[str]:
+        """Ad veya kısa addan kod, bulunamazsa None."""
+        code = self._by_name.get(name)
+        if code is None:
+            code = self._by_short_name.get(name)
+        return code
+
+    def code_of_short_name(self, short_name: str) -> Optional[str]:
+        return self._by_short_name.get(short_name)
+
+    def as_dict(self) -> Mapping[str, Code]:
+        """Kod -> kayıt, salt okunur."""
+        return self._by_code
+
+
+# 1.9 Vergi Kodları (TaxTypeCode): kod, ad, kısa ad
+TAX_TYPE_CODES = (
+    ("0003", "GELİR VERGİSİ STOPAJI", "GV STOPAJI"),
+    ("0011", "KURUMLAR VERGİSİ STOPAJI", "KV STOPAJI"),
+    ("0015", "GERÇEK USULDE KATMA DEĞER VERGİSİ", "KDV GERCEK"),
+    ("0021", "BANKA MUAMELELERİ VERGİSİ", "BMV"),
+    ("0022", "SİGORTA MUAMELELERİ VERGİSİ", "SMV"),
+    ("0059", "KONAKLAMA VERGİSİ", "KONAKLAMA VERGİSİ"),
+    ("0061", "KAYNAK KULLANIMI DESTEKLEME FONU KESİNTİSİ", "KKDF KESİNTİ"),
+    ("0071", "PETROL VE DOĞALGAZ ÜRÜNLERİNE İLİŞKİN ÖZEL TÜKETİM VERGİSİ", "ÖTV 1.LİSTE"),
+    ("0073", "KOLALI GAZOZ, ALKOLLÜ İÇEÇEKLER VE TÜTÜN MAMÜLLERİNE İLİŞKİN ÖZEL TÜKETİM VERGİSİ", "ÖTV 3.LİSTE"),
+    ("0074", "DAYANIKLI TÜKETİM VE DİĞER MALLARA İLİŞKİN ÖZEL TÜKETİM VERGİSİ", "ÖTV 4.LİSTE"),
+    ("0075", "ALKOLLÜ İÇEÇEKLERE İLİŞKİN ÖZEL TÜKETİM VERGİSİ", "ÖTV 3A LİSTE"),
+    ("0076", "TÜTÜN MAMÜLLERİNE İLİŞKİN ÖZEL TÜKETİM VERGİSİ", "ÖTV 3B LİSTE"),
+    ("0077", "KOLALI GAZOZLARA İLİŞKİN ÖZEL TÜKETİM VERGİSİ", "ÖTV 3C LİSTE"),
+    ("1047", "DAMGA VERGİSİ", "DAMGA V"),
+    ("1048", "5035 SAYILI KANUNA GÖRE DAMGA VERGİSİ", "5035SKDAMGAV"),
+    ("4071", "ELEKTRİK VE HAVALI GAZ TÜKETİM VERGİSİ", "ELK.HAVAGAZ.TÜK.VER."),
+    ("4080", "ÖZEL İLETİŞİM VERGİSİ", "Ö.İLETİŞİM V"),
+    ("4081", "5035 SAYILI KAUNA GÖRE ÖZEL İLETİŞİM VERGİSİ", "5035ÖZİLETV."),
+    ("4171", "PETROL VE DOĞALGAZ ÜRÜNLERİNE İLİŞKİN ÖTV TEVKİFATI", "PTR-DGZ ÖTV TEVKİFAT"),
+    ("8001", "BORSA TESCİL ÜCRETİ", "BORSA TES.ÜC."),
+    ("8002", "ENERJİ FONU", "ENERJİ FONU"),
+    ("8004", "TRT PAYI", "TRT PAYI"),
+    ("8005", "ELEKTRİK TÜKETİM VERGİSİ", "ELK.TÜK.VER."),
+    ("8006", "TELSİZ KULLANI ÜCRETİ", "TK KULLANIM"),
+    ("8007", "TELSİZ RUHSAT ÜCRETİ", "TK RUHSAT"),
+    ("8008", "ÇEVRE TEMİZLİK VERGİSİ", "ÇEV. TEM .VER."),
+    ("9021", "4961 BANKA SİGORTA MUAMELELERİ VERGİSİ", "4961BANKASMV"),
+    ("9040", "MERA FONU", "MERA FONU"),
+    ("9077", "MOTORLU TAŞIT ARAÇLARINA İLİŞKİN ÖZEL TÜKETİM VERGİSİ (TESCİLE TABİ OLANLAR)", "ÖTV 2.LİSTE"),
+    ("9944", "BELEDİYELERE ÖDENEN HAL RÜSUMU", "BEL.ÖD.HAL RÜSUM"),
+)
+
+# Senaryolar (ProfileID)
+PROFILE_IDS = (
+    ("TEMELFATURA", "Temel Fatura"),
+    ("TICARIFATURA", "Ticari Fatura"),
+    ("YOLCUBERABERFATURA", "Yolcu Beraber Eşya Faturası"),
+    ("IHRACAT", "İhracat Faturası"),
+    ("EARSIVFATURA", "e-Arşiv Fatura"),
+    ("KAMU", "Kamu Faturası"),
+    ("HKS", "Hal Kayıt Sistemi Faturası"),
+    ("ENERJI", "Enerji Faturası"),
+    ("ILAC_TIBBICIHAZ", "İlaç ve Tıbbi Cihaz Faturası"),
+    ("YATIRIMTESVIK", "Yatırım Teşvik Faturası"),
+    ("IDIS", "İDİS Faturası"),
+    ("TEMELIRSALIYE", "Temel e-İrsaliye"),
+)
+
+# Fatura tipleri (InvoiceTypeCode)
+INVOICE_TYPE_CODES = (
+    ("SATIS", "Satış"),
+    ("IADE", "İade"),
+    ("TEVKIFAT", "Tevkifat"),
+    ("TEVKIFATIADE", "Tevkifat İade"),
+    ("ISTISNA", "İstisna"),
+    ("OZELMATRAH", "Özel Matrah"),
+    ("IHRACKAYITLI", "İhraç Kayıtlı"),
+    ("SGK", "SGK"),
+    ("KOMISYONCU", "Komisyoncu"),
+    ("HKSSATIS", "HKS Satış"),
+    ("HKSKOMISYONCU", "HKS Komisyoncu"),
+    ("KONAKLAMAVERGISI", "Konaklama Vergisi"),
+    ("SARJ", "Şarj"),
+    ("SARJANLIK", "Anlık Şarj"),
+    ("TEKNOLOJIDESTEK", "Teknoloji Destek"),
+    ("YTBSATIS", "Yatırım Teşvik Satış"),
+    ("YTBIADE", "Yatırım Teşvik İade"),
+    ("YTBISTISNA", "Yatırım Teşvik İstisna"),
+    ("YTBTEVKIFAT", "Yatırım Teşvik Tevkifat"),
+    ("YTBTEVKIFATIADE", "Yatırım Teşvik Tevkifat İade"),
+)
+
+# 1.5 Birim kodları (unitCode): GİB listesi ve sık kullanılan UN/ECE Rec 20 kodları
+UNIT_CODES = (
+    ("B32", "KG-METRE KARE"),
+    ("C62", "ADET(UNIT)"),
+    ("CCT", "TON BAŞINA TAŞIMA KAPASİTESİ"),
+    ("PR", "ÇİFT"),
+    ("D30", "BRÜT KALORİ DEĞERİ"),
+    ("D40", "BİN LİTRE"),
+    ("GFI", "FISSILE İZOTOP GRAMI"),
+    ("GRM", "GRAM"),
+    ("GT", "GROSS TON"),
+    ("CEN", "YÜZ ADET"),
+    ("KPO", "KİLOGRAM POTASYUM OKSİT"),
+    ("MND", "KURUTULMUŞ NET AĞIRLIKLI KİLOGRAMI"),
+    ("3I", "KİLOGRAM-ADET"),
+    ("KFO", "DİFOSFOR PENTAOKSİT KİLOGRAMI"),
+    ("KGM", "KİLOGRAM"),
+    ("KHY", "HİDROJEN PEROKSİT KİLOGRAMI"),
+    ("KMA", "METİL AMİNLERİN KİLOGRAMI"),
+    ("KNI", "AZOTUN KİLOGRAMI"),
+    ("KPH", "KİLOGRAM POTASYUM HİDROKSİT"),
+    ("KSD", "%90 KURU ÜRÜN KİLOGRAMI"),
+    ("KSH", "SODYUM HİDROKSİT KİLOGRAMI"),
+    ("KUR", "URANYUM KİLOGRAMI"),
+    ("D32", "TERAWATT SAAT"),
+    ("GWH", "GİGAWATT SAAT"),
+    ("MWH", "MEGAWATT SAAT (1000 kW.h)"),
+    ("KWH", "KİLOWATT SAAT"),
+    ("KWT", "KİLOWATT"),
+    ("LPA", "SAF ALKOL LİTRESİ"),
+    ("LTR", "LİTRE"),
+    ("MTK", "METRE KARE"),
+    ("DMK", "DESİMETRE KARE"),
+    ("MTQ", "METRE KÜP"),
+    ("MTR", "METRE"),
+    ("NCL", "HÜCRE ADEDİ"),
+    ("CTM", "KARAT"),
+    ("SM3", "STANDART METREKÜP"),
+    ("R9", "BİN METRE KÜP"),
+    ("SET", "SET"),
+    ("T3", "BİN ADET"),
+    # UN/ECE Rec 20
+    ("NIU", "NUMBER OF INTERNATIONAL UNITS"),
+    ("BX", "BOX"),
+    ("PA", "PACKET"),
+    ("PK", "PACK"),
+    ("CT", "CARTON"),
+    ("TNE", "TONNE (METRIC TON)"),
+    ("MGM", "MILLIGRAM"),
+    ("MLT", "MILLILITRE"),
+    ("CMT", "CENTIMETRE"),
+    ("MMT", "MILLIMETRE"),
+    ("KMT", "KILOMETRE"),
+    ("CMK", "SQUARE CENTIMETRE"),
+    ("CMQ", "CUBIC CENTIMETRE"),
+    ("SEC", "SECOND"),
+    ("MIN", "MINUTE"),
+    ("HUR", "HOUR"),
+    ("DAY", "DAY"),
+    ("WEE", "WEEK"),
+    ("MON", "MONTH"),
+    ("ANN", "YEAR"),
+    ("CEL", "DEGREE CELSIUS"),
+    ("KJO", "KILOJOULE"),
+    ("MAW", "MEGAWATT"),
+    ("E48", "SERVICE UNIT"),
+    ("H87", "PIECE"),
+    ("EA", "EACH"),
+    ("DZN", "DOZEN"),
+    ("GRO", "GROSS"),
+)
+
+# ISO 4217 para birimi kodları (DocumentCurrencyCode, currencyID)
+CURRENCY_CODES = (
+    ("TRY", "Türk Lirası"),
+    ("USD", "US Dollar"),
+    ("EUR", "Euro"),
+    ("GBP", "Pound Sterling"),
+    ("CHF", "Swiss Franc"),
+    ("JPY", "Yen"),
+    ("CNY", "Yuan Renminbi"),
+    ("RUB", "Russian Ruble"),
+    ("SAR", "Saudi Riyal"),
+    ("AED", "UAE Dirham"),
+    ("QAR", "Qatari Rial"),
+    ("KWD", "Kuwaiti Dinar"),
+    ("BHD", "Bahraini Dinar"),
+    ("OMR", "Rial Omani"),
+    ("JOD", "Jordanian Dinar"),
+    ("IQD", "Iraqi Dinar"),
+    ("IRR", "Iranian Rial"),
+    ("ILS", "New Israeli Sheqel"),
+    ("EGP", "Egyptian Pound"),
+    ("LYD", "Libyan Dinar"),
+    ("TND", "Tunisian Dinar"),
+    ("DZD", "Algerian Dinar"),
+    ("MAD", "Moroccan Dirham"),
+    ("AZN", "Azerbaijan Manat"),
+    ("GEL", "Lari"),
+    ("AMD", "Armenian Dram"),
+    ("KZT", "Tenge"),
+    ("UZS", "Uzbekistan Sum"),
+    ("TMT", "Turkmenistan New Manat"),
+    ("KGS", "Som"),
+    ("TJS", "Somoni"),
+    ("UAH", "Hryvnia"),
+    ("BYN", "Belarusian Ruble"),
+    ("MDL", "Moldovan Leu"),
+    ("RON", "Romanian Leu"),
+    ("BGN", "Bulgarian Lev"),
+    ("RSD", "Serbian Dinar"),
+    ("MKD", "Denar"),
+    ("ALL", "Lek"),
+    ("BAM", "Convertible Mark"),
+    ("HUF", "Forint"),
+    ("CZK", "Czech Koruna"),
+    ("PLN", "Zloty"),
+    ("DKK", "Danish Krone"),
+    ("NOK", "Norwegian Krone"),
+    ("SEK", "Swedish Krona"),
+    ("ISK", "Iceland Krona"),
+    ("CAD", "Canadian Dollar"),
+    ("AUD", "Australian Dollar"),
+    ("NZD", "New Zealand Dollar"),
+    ("HKD", "Hong Kong Dollar"),
+    ("SGD", "Singapore Dollar"),
+    ("KRW", "Won"),
+    ("INR", "Indian Rupee"),
+    ("PKR", "Pakistan Rupee"),
+    ("BDT", "Taka"),
+    ("LKR", "Sri Lanka Rupee"),
+    ("IDR", "Rupiah"),
+    ("MYR", "Malaysian Ringgit"),
+    ("THB", "Baht"),
+    ("VND", "Dong"),
+    ("PHP", "Philippine Peso"),
+    ("TWD", "New Taiwan Dollar"),
+    ("MNT", "Tugrik"),
+    ("AFN", "Afghani"),
+    ("ZAR", "Rand"),
+    ("NGN", "Naira"),
+    ("KES", "Kenyan Shilling"),
+    ("ETB", "Ethiopian Birr"),
+    ("GHS", "Ghana Cedi"),
+    ("XOF", "CFA Franc BCEAO"),
+    ("XAF", "CFA Franc BEAC"),
+    ("SDG", "Sudanese Pound"),
+    ("MXN", "Mexican Peso"),
+    ("BRL", "Brazilian Real"),
+    ("ARS", "Argentine Peso"),
+    ("CLP", "Chilean Peso"),
+    ("COP", "Colombian Peso"),
+    ("PEN", "Sol"),
+    ("UYU", "Peso Uruguayo"),
+    ("VES", "Bolívar Soberano"),
+    ("XDR", "SDR (Special Drawing Right)"),
+    ("XAU", "Gold"),
+)
+
+# Tevkifat kodları (WithholdingTaxTotal TaxTypeCode): kod, ad, kısa ad, tevkifat oranı (yüzde)
+WITHHOLDING_TAX_TYPE_CODES = (
+    ("601", "YAPIM İŞLERİ İLE BU İŞLERLE BİRLİKTE İFA EDİLEN MÜHENDİSLİK-MİMARLIK VE ETÜT-PROJE HİZMETLERİ", None, 40),
+    ("602", "ETÜT, PLAN-PROJE, DANIŞMANLIK, DENETİM VE BENZERİ HİZMETLER", None, 90),
+    ("603", "MAKİNE, TEÇHİZAT, DEMİRBAŞ VE TAŞITLARA AİT TADİL, BAKIM VE ONARIM HİZMETLERİ", None, 70),
+    ("604", "YEMEK SERVİS HİZMETİ", None, 50),
+    ("605", "ORGANİZASYON HİZMETİ", None, 50),
+    ("606", "İŞGÜCÜ TEMİN HİZMETLERİ", None, 90),
+    ("607", "ÖZEL GÜVENLİK HİZMETİ", None, 90),
+    ("608", "YAPI DENETİM HİZMETLERİ", None, 90),
+    ("609", "FASON OLARAK YAPTIRILAN TEKSTİL VE KONFEKSİYON İŞLERİ, ÇANTA VE AYAKKABI DİKİM İŞLERİ VE BU İŞLERE "
+            "ARACILIK HİZMETLERİ", None, 70),
+    ("610", "TURİSTİK MAĞAZALARA VERİLEN MÜŞTERİ BULMA / GÖTÜRME HİZMETLERİ", None, 90),
+    ("611", "SPOR KULÜPLERİNİN YAYIN, REKLAM VE İSİM HAKKI GELİRLERİNE KONU İŞLEMLERİ", None, 90),
+    ("612", "TEMİZLİK HİZMETİ", None, 90),
+    ("613", "ÇEVRE VE BAHÇE BAKIM HİZMETLERİ", None, 90),
+    ("614", "SERVİS TAŞIMACILIĞI HİZMETİ", None, 50),
+    ("615", "HER TÜRLÜ BASKI VE BASIM HİZMETLERİ", None, 70),
+    ("616", "5018 SAYILI KANUNA EKLİ CETVELLERDEKİ İDARE, KURUM VE KURULUŞLARA YAPILAN DİĞER HİZMETLER", None, 50),
+    ("617", "HURDA METALDEN ELDE EDİLEN KÜLÇE TESLİMLERİ", None, 70),
+    ("618", "HURDA METALDEN ELDE EDİLENLER DIŞINDAKİ BAKIR, ÇİNKO, ALÜMİNYUM VE KURŞUN KÜLÇE TESLİMLERİ", None, 70),
+    ("619", "BAKIR, ÇİNKO, ALÜMİNYUM VE KURŞUN ÜRÜNLERİNİN TESLİMİ", None, 70),
+    ("620", "İSTİSNADAN VAZGEÇENLERİN HURDA VE ATIK TESLİMİ", None, 70),
+    ("621", "METAL, PLASTİK, LASTİK, KAUÇUK, KAĞIT VE CAM HURDA VE ATIKLARDAN ELDE EDİLEN HAMMADDE TESLİMİ", None, 90),
+    ("622", "PAMUK, TİFTİK, YÜN VE YAPAĞI İLE HAM POST VE DERİ TESLİMLERİ", None, 90),
+    ("623", "AĞAÇ VE ORMAN ÜRÜNLERİ TESLİMİ", None, 50),
+    ("624", "YÜK TAŞIMACILIĞI HİZMETİ", None, 20),
+    ("625", "TİCARİ REKLAM HİZMETLERİ", None, 30),
+    ("626", "DİĞER TESLİMLER", None, 20),
+    ("627", "DEMİR-ÇELİK ÜRÜNLERİNİN TESLİMİ", None, 50),
+    ("650", "DİĞERLERİ", None, None),
+)
+
+# Muafiyet/istisna sebepleri (TaxExemptionReasonCode): kısmi istisna (2xx), tam istisna (3xx),
+# yolcu beraberi (501), ihraç kayıtlı (7xx), özel matrah (8xx)
+TAX_EXEMPTION_REASON_CODES = (
+    ("201", "17/1 Kültür ve Eğitim Amacı Taşıyan İşlemler"),
+    ("202", "17/2-a Sağlık, Çevre ve Sosyal Yardım Amaçlı İşlemler"),
+    ("204", "17/2-c Yabancı Diplomatik Organ ve Hayır Kurumlarının Yapacakları Bağışlarla İlgili Mal ve Hizmet Alışları"),
+    ("205", "17/2-d Taşınmaz Kültür Varlıklarına İlişkin Teslimler ve Mimarlık Hizmetleri"),
+    ("206", "17/2-e Mesleki Kuruluşların İşlemleri"),
+    ("207", "17/3 Askeri Fabrika, Tersane ve Atölyelerin İşlemleri"),
+    ("208", "17/4-c Birleşme, Devir, Dönüşüm ve Bölünme İşlemleri"),
+    ("209", "17/4-e Banka ve Sigorta Muameleleri Vergisi Kapsamına Giren İşlemler"),
+    ("211", "17/4-h Zirai Amaçlı Su Teslimleri ile Köy Tüzel Kişiliklerince Yapılan İçme Suyu Teslimleri"),
+    ("212", "17/4-ı Serbest Bölgelerde Verilen Hizmetler"),
+    ("213", "17/4-j Boru Hattıyla Yapılan Petrol ve Gaz Taşımacılığı"),
+    ("214", "17/4-k Organize Sanayi Bölgelerindeki Arsa ve İşyeri Teslimleri ile Konut Yapı Kooperatiflerinin "
+            "Üyelerine Konut Teslimleri"),
+    ("215", "17/4-l Varlık Yönetim Şirketlerinin İşlemleri"),
+    ("216", "17/4-m Tasarruf Mevduatı Sigorta Fonunun İşlemleri"),
+    ("217", "17/4-n Basın-Yayın ve Enformasyon Genel Müdürlüğüne Verilen Haber Hizmetleri"),
+    ("218", "17/4-o Gümrük Antrepoları, Geçici Depolama Yerleri, Gümrüklü Sahalarda Vergisiz Satış Yapılan İşyeri, "
+            "Depo ve Ardiye Gibi Bağımsız Birimlerin Kiralanması"),
+    ("219", "17/4-p Hazine ve Arsa Ofisi Genel Müdürlüğünün İşlemleri"),
+    ("220", "17/4-r İki Tam Yıl Süreyle Sahip Olunan Taşınmaz ve İştirak Hisseleri Satışları"),
+    ("223", "Geçici 20/1 Teknoloji Geliştirme Bölgelerinde Yapılan İşlemler"),
+    ("225", "Geçici 23 Milli Eğitim Bakanlığına Yapılan Bilgisayar Bağışları ile İlgili Teslimler"),
+    ("250", "Diğerleri"),
+    ("301", "11/1-a Mal İhracatı"),
+    ("302", "11/1-a Hizmet İhracatı"),
+    ("303", "11/1-a Roaming Hizmetleri"),
+    ("304", "13/a Deniz, Hava ve Demiryolu Taşıma Araçlarının Teslimi"),
+    ("305", "13/b Deniz ve Hava Taşıma Araçları İçin Liman ve Hava Meydanlarında Yapılan Hizmetler"),
+    ("306", "13/c Petrol Aramaları ve Petrol Boru Hatlarının İnşa ve Modernizasyonuna İlişkin Teslim ve Hizmetler"),
+    ("307", "13/c Maden Arama, Altın, Gümüş ve Platin Madenleri İçin İşletme, Zenginleştirme ve Rafinaj "
+            "Faaliyetlerine İlişkin Teslim ve Hizmetler"),
+    ("308", "13/d Teşvikli Yatırım Mallarının Teslimi"),
+    ("309", "13/e Limanlar ve Hava Meydanlarının İnşası, Yenilenmesi ve Genişletilmesi"),
+    ("310", "13/f Ulusal Güvenlik Amaçlı Teslim ve Hizmetler"),
+    ("311", "14/1 Uluslararası Taşımacılık"),
+    ("312", "15/a Diplomatik Organ ve Misyonlara Yapılan Teslim ve Hizmetler"),
+    ("313", "15/b Uluslararası Kuruluşlara Yapılan Teslim ve Hizmetler"),
+    ("314", "19/2 Usulüne Göre Yürürlüğe Girmiş Uluslararası Anlaşmalar Kapsamındaki İstisnalar"),
+    ("315", "14/3 İhraç Konusu Eşyayı Taşıyan Kamyon, Çekici ve Yarı Römorklara Yapılan Motorin Teslimleri"),
+    ("316", "11/1-a Serbest Bölgelerdeki Müşteriler İçin Yapılan Fason Hizmetler"),
+    ("317", "17/4-s Engellilerin Eğitimleri, Meslekleri ve Günlük Yaşamlarına İlişkin Araç-Gereç ve Bilgisayar "
+            "Programları"),
+    ("319", "13/g Başbakanlık Merkez Teşkilatına Yapılan Araç Teslimleri"),
+    ("322", "11/1-c Türkiye'de İkamet Etmeyenlere Özel Fatura ile Yapılan Teslimler (Bavul Ticareti)"),
+    ("323", "13/ğ 5300 Sayılı Kanuna Göre Düzenlenen Ürün Senetlerinin İhtisas/Ticaret Borsaları Aracılığıyla "
+            "İlk Teslimi"),
+    ("324", "13/h Türkiye Kızılay Derneğine Yapılan Teslim ve Hizmetler ile Türkiye Kızılay Derneğinin Teslim ve "
+            "Hizmetleri"),
+    ("325", "13/ı Yem Teslimleri"),
+    ("326", "13/ı Gübrelerin Teslimi"),
+    ("327", "13/ı Gübrelerin İçeriğinde Bulunan Hammaddelerin Gübre Üreticilerine Teslimi"),
+    ("328", "13/i Konut veya İşyeri Teslimleri"),
+    ("350", "Diğerleri"),
+    ("351", "KDV - İstisna Olmayan Diğer"),
+    ("501", "Türkiye'de İkamet Etmeyenlere KDV Hesaplanarak Yapılan Satışlar (Yolcu Beraberi Eşya)"),
+    ("701", "3065 s. KDV Kanunu 11/1-c Maddesi Kapsamındaki İhraç Kaydıyla Teslimler"),
+    ("702", "DİİB ve Geçici Kabul Rejimi Kapsamındaki Satışlar"),
+    ("703", "4760 s. ÖTV Kanunu 8/2 Maddesi Kapsamındaki İhraç Kaydıyla Teslimler"),
+    ("704", "3065 s. KDV Kanunu 11/1-c Maddesi ve 4760 s. ÖTV Kanunu 8/2 Maddesi Kapsamındaki İhraç Kaydıyla Teslimler"),
+    ("801", "Milli Piyango, Spor Toto vb. Oyunlar"),
+    ("802", "At Yarışları ve Diğer Müşterek Bahis ve Talih Oyunları"),
+    ("803", "Profesyonel Sanatçıların Yer Aldığı Gösteriler, Konserler, Profesyonel Sporcuların Katıldığı Sportif "
+            "Faaliyetler, Maçlar, Yarışlar ve Yarışmalar"),
+    ("804", "Gümrük Depolarında ve Müzayede Mahallerinde Yapılan Satışlar"),
+    ("805", "Altından Mamul veya Altın İçeren Ziynet Eşyaları ile Sikke Altınların Teslimi"),
+    ("806", "Tütün Mamulleri ve Bazı Alkollü İçkiler"),
+    ("807", "Muzır Neşriyat Kapsamındaki Gazete, Dergi vb. Periyodik Yayınlar"),
+    ("808", "Külçe Gümüş ve Gümüşten Mamul Eşya Teslimi"),
+    ("809", "Belediyeler Tarafından Yapılan Şehir İçi Yolcu Taşımacılığında Kullanılan Biletlerin ve Kartların "
+            "Bayilere Teslimi"),
+    ("810", "Ön Ödemeli Elektronik Haberleşme Hizmetleri"),
+    ("811", "TŞOF Tarafından Araç Plakaları ile Sürücü Kurslarında Kullanılan Bir Kısım Evrakın Teslimi"),
+    ("812", "KDV Uygulanmadan Alınan İkinci El Motorlu Kara Taşıtı veya Taşınmaz Teslimi"),
+)
+
+# Liste adı -> kaynak kayıtlar. Listeler ilk get_code_list çağrısında kurulur.
+CODE_LIST_SOURCES = MappingProxyType({
+    'TaxTypeCode': TAX_TYPE_CODES,
+    'ProfileID': PROFILE_IDS,
+    'InvoiceTypeCode': INVOICE_TYPE_CODES,
+    'UnitCode': UNIT_CODES,
+    'CurrencyCode': CURRENCY_CODES,
+    'WithholdingTaxTypeCode': WITHHOLDING_TAX_TYPE_CODES,
+    'TaxExemptionReasonCode': TAX_EXEMPTION_REASON_CODES,
+})
+
+_code_lists: Dict[str, CodeList] = {}
+_lock = threading.Lock()
+
+
+def get_code_list(name: str) -> CodeList:
+    """
+    Adı verilen kod listesini döndürür; ilk çağrıda kurulur, sonra paylaşılır.
+
+    :param name: CODE_LIST_SOURCES anahtarlarından biri, örn. 'TaxTypeCode'
+    """
+    code_list = _code_lists.get(name)
+    if code_list is None:
+        with _lock:
+            code_list = _code_lists.get(name)
+            if code_list is None:
+                if name not in CODE_LIST_SOURCES:
+                    raise ValueError(f'Unknown UBL-TR code list: {name}')
+                code_list = _code_lists[name] = CodeList(name, CODE_LIST_SOURCES[name])
+    return code_list
+
+
+def register_code_list(name: str, entries: Iterable[tuple]) -> CodeList:
+    """
+    Kod listesini verilen kayıtlarla değiştirir (veya yeni bir liste ekler). Daha önce get_code_list ile
+    alınmış CodeList nesneleri değişmez; yeni liste sonraki çağrılarda döner.
+    """
+    code_list = CodeList(name, entries)
+    with _lock:
+        _code_lists[name] = code_list
+    return code_list
+
+
+def is_valid_code(name: str, code: str) -> bool:
+    """get_code_list(name) listesinde code var mı."""
+    return code in get_code_list(name)
+
+
+def code_lists() -> Tuple[str, ...]:
+    """Kayıtlı bütün liste adları."""
+    with _lock:
+        return tuple(dict.fromkeys(tuple(CODE_LIST_SOURCES) + tuple(_code_lists)))
@@ -0,0 +1,185 @@
+# Sütun (columnar) verisinden fatura kalemleri: miktar, birim, fiyat, KDV oranı ve ürün dizileri.
+#
+# Sipariş verisi zaten sütunlar halinde (pandas DataFrame, Arrow tablosu, NumPy dizileri, sorgu sonucu)
+# duruyorsa her kalem için InvoiceLine/Item/Price/TaxTotal/TaxSubtotal/TaxCategory/TaxScheme nesneleri
+# oluşturmaya gerek yok. Tutarlar sütun sütun Decimal ile hesaplanır (float yuvarlama hatası olmadan),
+# add_invoice_lines_from_columns kalemleri doğrudan yazar.
+#
+#   totals = ubl_doc.add_invoice_lines_from_columns(quantities=[3, 1], unit_codes=['C62', 'KGM'],
+#                                                   prices=['60', '12.50'], vat_rates=[20, 10],
+#                                                   item_names=['Notebook Çantası', 'Kahve'],
+#                                                   item_ids=['1234567', None])
+#   totals.line_extension_amount   # Decimal('192.50')
+#
+#   ubl_doc.add_invoice_lines_from_frame(df, {'quantities': 'qty', 'prices': 'unit_price', ...})
+#
+# pandas/pyarrow/numpy bağımlılık değildir; sütunlar .tolist() / .to_pylist() ile okunur.
+
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+# KDV alt toplamlarında kullanılan vergi. TaxScheme adı GİB kod listesindeki ad ile aynıdır.
+VAT_TAX_TYPE_CODE = '0015'
+VAT_TAX_SCHEME_NAME = 'GERÇEK USULDE KATMA DEĞER VERGİSİ'
+
+# add_invoice_lines_from_columns parametre adları; add_invoice_lines_from_frame eşlemesinde kullanılır.
+COLUMN_NAMES = ('quantities', 'unit_codes', 'prices', 'vat_rates', 'item_names', 'item_ids', 'line_ids')
+
+_CENT = Decimal('0.01')
+
+
+class ColumnTotals(NamedTuple):
+    """
+    add_invoice_lines_from_columns ile yazılan kalemlerin toplamları; TaxTotal ve LegalMonetaryTotal için.
+
+    line_count              : Yazılan kalem sayısı
+    line_extension_amount   : Kalem tutarlarının toplamı (vergiler hariç)
+    tax_amount              : Kalem KDV tutarlarının toplamı
+    vat                     : KDV oranı -> (matrah, vergi tutarı)
+    """
+    line_count: int
+    line_extension_amount: Decimal
+    tax_amount: Decimal
+    vat: Dict[Decimal, Tuple[Decimal, Decimal]]
+
+
+class LineColumns(NamedTuple):
+    """Yazılmaya hazır kalem sütunları: metinler XML'e olduğu gibi yazılır."""
+    ids: List[str]
+    quantities: List[str]
+    unit_codes: List[str]
+    amounts: List[str]
+    tax_amounts: List[str]
+    percents: List[str]
+    prices: List[str]
+    item_names: List[str]
+    item_ids: List[Optional[str]]
+    totals: ColumnTotals
+
+
+def to_list(column: Any) -> list:
+    """Dizi benzeri sütunu Python listesine çevirir (NumPy/pandas .tolist(), Arrow .to_pylist())."""
+    if column is None:
+        return None
+    if hasattr(column, 'to_pylist'):
+        return column.to_pylist()
+    if hasattr(column, 'tolist'):
+        return column.tolist()
+    return list(column)
+
+
+def to_decimal(value: Any) -> Decimal:
+    # float'lar str üzerinden çevrilir: Decimal(0.1) değil Decimal('0.1').
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, float):
+        return Decimal(repr(value))
+    return Decimal(str(value).strip())
+
+
+def _plain(value: Decimal) -> str:
+    # Decimal('18.0') -> '18', Decimal('2.50') -> '2.5', üstel gösterim olmadan.
+    return format(value.normalize(), 'f')
+
+
+def line_columns(quantities: Sequence, unit_codes: Any, prices: Sequence, vat_rates: Any, item_names: Sequence,
+                 item_ids: Sequence = None, line_ids: Sequence = None, first_line_id: int = 1,
+                 rounding: str = ROUND_HALF_UP) -> LineColumns:
+    """
+    Kalem tutarlarını ve KDV'yi hesaplar, XML metinlerini hazırlar.
+
+    LineExtensionAmount = miktar x fiyat, KDV = tutar x oran / 100; ikisi de kuruşa yuvarlanır.
+
+    :param unit_codes: Sütun veya bütün kalemler için tek birim kodu, örn. 'C62'.
+    :param vat_rates: Sütun veya bütün kalemler için tek oran, örn. 20.
+    :param line_ids: Verilmezse first_line_id'den başlayarak numaralanır.
+    :param rounding: decimal yuvarlama kipi, örn. decimal.ROUND_HALF_EVEN.
+    """
+    quantities = [to_decimal(value) for value in to_list(quantities)]
+    count = len(quantities)
+    prices = [to_decimal(value) for value in to_list(prices)]
+    item_names = to_list(item_names)
+
+    if isinstance(unit_codes, str):
+        unit_codes = [unit_codes] * count
+    else:
+        unit_codes = to_list(unit_codes)
+    if isinstance(vat_rates, (str, int, float, Decimal)):
+        vat_rates = [to_decimal(vat_rates)] * count
+    else:
+        vat_rates = [to_decimal(value) for value in to_list(vat_rates)]
+    item_ids = to_list(item_ids) if item_ids is not None else [None] * count
+    if line_ids is None:
+        line_ids = [str(i) for i in range(first_line_id, first_line_id + count)]
+    else:
+        line_ids = [str(value) for value in to_list(line_ids)]
+
+    for name, column in (('unit_codes', unit_codes), ('prices', prices), ('vat_rates', vat_rates),
+                         ('item_names', item_names), ('item_ids', item_ids), ('line_ids', line_ids)):
+        if len(column) != count:
+            raise ValueError(f'{name} has {len(column)} values, expected {count} (length of quantities)')
+
+    amounts = [(quantity * price).quantize(_CENT, rounding) for quantity, price in zip(quantities, prices)]
+    tax_amounts = [(amount * rate / 100).quantize(_CENT, rounding) for amount, rate in zip(amounts, vat_rates)]
+
+    vat = {}
+    for amount, tax_amount, rate in zip(amounts, tax_amounts, vat_rates):
+        taxable, tax = vat.get(rate, (Decimal(0), Decimal(0)))
+        vat[rate] = (taxable + amount, tax + tax_amount)
+    totals = ColumnTotals(line_count=count, line_extension_amount=sum(amounts, Decimal(0)),
+                          tax_amount=sum(tax_amounts, Decimal(0)), vat=vat)
+
+    # Oran sayısı az, metin çevrimi oran başına bir kez yapılır.
+    percent_text = {rate: _plain(rate) for rate in vat}
+    return LineColumns(
+        ids=line_ids,
+        quantities=[_plain(quantity) for quantity in quantities],
+        unit_codes=[str(code) for code in unit_codes],
+        amounts=[str(amount) for amount in amounts],
+        tax_amounts=[str(tax_amount) for tax_amount in tax_amounts],
+        percents=[percent_text[rate] for rate in vat_rates],
+        prices=[format(price, 'f') for price in prices],
+        item_names=[str(name) for name in item_names],
+        # pandas boş hücreleri NaN olarak verir.
+        item_ids=[None if item_id is None or item_id != item_id else str(item_id) for item_id in item_ids],
+        totals=totals,
+    )
+
+
+def frame_columns(frame: Any, columns: Mapping[str, str] = None) -> Dict[str, list]:
+    """
+    DataFrame, Arrow tablosu veya sütun adı -> dizi sözlüğünden add_invoice_lines_from_columns parametrelerini çıkarır.
+
+    :param columns: Parametre adı -> tablodaki sütun adı, örn. {'quantities': 'qty', 'prices': 'unit_price'}.
+                    Verilmeyen parametreler için tabloda aynı adlı sütun varsa o kullanılır.
+    """
+    columns = dict(columns or {})
+    unknown = set(columns) - set(COLUMN_NAMES)
+    if unknown:
+        raise ValueError(f'Unknown column parameters: {", ".join(sorted(unknown))}')
+
+    names = set(_column_names(frame))
+    selected = {}
+    for parameter in COLUMN_NAMES:
+        name = columns.get(parameter, parameter)
+        if name in names:
+            selected[parameter] = _column(frame, name)
+        elif parameter in columns:
+            raise KeyError(f'Column {name!r} not found')
+    return selected
+
+
+def _column_names(frame: Any) -> Iterable[str]:
+    if hasattr(frame, 'column_names'):       # pyarrow.Table
+        return frame.column_names
+    if hasattr(frame, 'columns'):            # pandas.DataFrame
+        return list(frame.columns)
+    if getattr(frame, 'dtype', None) is not None and frame.dtype.names:   # NumPy yapılandırılmış dizi
+        return frame.dtype.names
+    return frame.keys()
+
+
+def _column(frame: Any, name: str) -> list:
+    if hasattr(frame, 'column_names'):
+        return frame.column(name).to_pylist()
+    return to_list(frame[name])
@@ -0,0 +1,534 @@
+# lxml ağacı kurmadan, model nesnelerinden doğrudan XML metni üreten fatura oluşturucu.
+#
+# UBLInvoice her alan için etree.SubElement + .text/.set çağırıp sonunda ağacı serileştiriyor.
+# Birkaç kalemli TEMELFATURA/EARSIVFATURA faturalarında (hacmin çoğu) ağacı kurmanın maliyeti
+# çıktının boyutuyla orantısız. UBLInvoiceEmitter aynı add_* arayüzünü sunar, çıktıyı kaçışlanmış
+# metin parçaları olarak biriktirir.
+#
+# Referans gerçekleme UBLInvoice'tır: xml() çıktısı UBLInvoice.xml() ile bayt bayt aynı olmalıdır
+# (bkz. benchmarks/emitter.py, farklılıkta hata verir). UBLInvoice'a eklenen veya değişen her alan
+# burada da aynı sırayla yazılmalıdır.
+#
+#   ubl_doc = UBLInvoiceEmitter()
+#   ubl_doc.add_ubl_extension()
+#   ...
+#   data = ubl_doc.tobytes()
+
+import re
+from decimal import ROUND_HALF_UP
+from typing import Dict, List, Union
+
+from .UBLInvoice import (SignatoryParty, KolaysoftSignature, PartyData, PaymentMeans, PaymentTerms, TaxTotal,
+                         MonetaryTotal, InvoiceLine, DocumentReference)
+from .columns import ColumnTotals, VAT_TAX_SCHEME_NAME, VAT_TAX_TYPE_CODE, frame_columns, line_columns
+from .fragments import FragmentCache, customer_party_key, item_key, line_tax_category_key
+from .instrumentation import Instrumentation, instrument
+
+ROOT_START = ('<Invoice xmlns="urn:oasis:names:specification:ubl:schema:xsd:Invoice-2" '
+              'xmlns:xsd="http://www.w3.org/2001/XMLSchema" '
+              'xmlns:ext="urn:oasis:names:specification:ubl:schema:xsd:CommonExtensionComponents-2" '
+              'xmlns:cbc="urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2" '
+              'xmlns:cac="urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2"')
+
+# lxml'in kabul etmediği karakterler (XML 1.0 dışı kontrol karakterleri), lxml gibi ValueError verilir.
+_INVALID_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+
+_INDENTS = ['  ' * depth for depth in range(16)]
+
+
+def _text(value: str) -> str:
+    # libxml2 metin kaçışı: & < > ve \r
+    if _INVALID_CHARS.search(value):
+        raise ValueError('All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters')
+    if '&' in value:
+        value = value.replace('&', '&amp;')
+    if '<' in value:
+        value = value.replace('<', '&lt;')
+    if '>' in value:
+        value = value.replace('>', '&gt;')
+    if '\r' in value:
+        value = value.replace('\r', '&#13;')
+    return value
+
+
+def _attr(value: str) -> str:
+    # libxml2 öznitelik kaçışı: metin kaçışına ek olarak " ve \n \t
+    value = _text(value)
+    if '"' in value:
+        value = value.replace('"', '&quot;')
+    if '\n' in value:
+        value = value.replace('\n', '&#10;')
+    if '\t' in value:
+        value = value.replace('\t', '&#9;')
+    return value
+
+
+class UBLInvoiceEmitter:
+    """
+    UBLInvoice ile aynı add_* metodlarına sahip, çıktıyı doğrudan metin olarak üreten fatura.
+    validate() ve write() gibi ağaç gerektiren işlemler için UBLInvoice kullanılmalıdır.
+    UBLInvoice gibi model nesnelerini yalnızca okur.
+    """
+
+    def __init__(self, fragment_cache: FragmentCache = None, totals: 'InvoiceTotals' = None,
+                 instrumentation: Instrumentation = None):
+        """
+        :param fragment_cache: UBLInvoice ile aynı parçalar (AccountingCustomerParty, Item, TaxCategory) hazır metin
+                               olarak önbelleklenir. Anahtar türleri ':text' ekiyle ayrılır, aynı önbellek
+                               UBLInvoice ile paylaşılabilir.
+        :param totals: UBLInvoice ile aynı, bkz. finalize_totals.
+        :param instrumentation: UBLInvoice ile aynı; bayt sayısı add_* metodlarında da ölçülür.
+        """
+        self._parts: List[str] = []
+        self.fragment_cache = fragment_cache
+        self.totals = totals
+        # finalize_totals için ekleme noktaları: DocumentCurrencyCode'dan sonrası ve ilk kalem.
+        self._line_count_at = None
+        self._lines_at = None
+        self._has_line_count = False
+        self._has_totals = False
+
+        self.id = None
+        self.uuid = None
+        self.issue_date = None
+        self.issue_time = None
+        self.local_id = None        # XML'e eklenmiyor.
+        self.sourceUrn = None       # XML'e eklenmiyor.
+        self.destinationUrn = None  # XML'e eklenmiyor.
+        # -------------------------
+        self.profile_id = None
+        self.copy_indicator = None
+        self.invoice_type_code = None
+        self.note = None
+        self.document_currency_code = None
+        self.line_count_numeric = None
+        self.despatch_document_reference = None
+
+        if instrumentation is not None:
+            instrument(self, instrumentation)
+
+    def xml(self) -> str:
+        """UBLInvoice.xml() ile aynı çıktı (pretty_print, XML bildirimi olmadan)."""
+        if not self._parts:
+            return ROOT_START + '/>\n'
+        return ROOT_START + '>\n' + ''.join(self._parts) + '</Invoice>\n'
+
+    def tobytes(self) -> bytes:
+        """UTF-8 kodlanmış xml(); etree.tostring(ubl_doc.root, pretty_print=True, encoding='UTF-8') ile aynı."""
+        return self.xml().encode('utf-8')
+
+    # Yazma yardımcıları. depth: kök altındaki elemanlar için 1.
+
+    def _leaf(self, depth: int, tag: str, text: str = None, attrib: dict = None):
+        start = _INDENTS[depth] + '<' + tag
+        if attrib:
+            for name, value in attrib.items():
+                # Değeri None olan attribute yazılmaz (UBLInvoice'taki gibi).
+                if value is not None:
+                    start += ' ' + name + '="' + _attr(value) + '"'
+        if text is None:
+            self._parts.append(start + '/>\n')
+        else:
+            self._parts.append(start + '>' + _text(text) + '</' + tag + '>\n')
+
+    def _open(self, depth: int, tag: str):
+        self._parts.append(_INDENTS[depth] + '<' + tag + '>\n')
+
+    def _close(self, depth: int, tag: str):
+        start = _INDENTS[depth] + '<' + tag + '>\n'
+        if self._parts[-1] == start:
+            # Alt elemanı olmayan eleman, lxml gibi <tag/> yazılır.
+            self._parts[-1] = _INDENTS[depth] + '<' + tag + '/>\n'
+        else:
+            self._parts.append(_INDENTS[depth] + '</' + tag + '>\n')
+
+    @staticmethod
+    def _cache_key(key: tuple) -> tuple:
+        return (key[0] + ':text',) + key[1:]
+
+    def _append_cached(self, key: tuple) -> bool:
+        if key is None:
+            return False
+        fragment = self.fragment_cache.get(key)
+        if fragment is None:
+            return False
+        self._parts.append(fragment)
+        return True
+
+    def _put_cached(self, key: tuple, start: int):
+        if key is not None:
+            self.fragment_cache.put(key, ''.join(self._parts[start:]))
+
+    def add_ubl_extension(self):
+        self._open(1, 'ext:UBLExtensions')
+        self._open(2, 'ext:UBLExtension')
+        self._open(3, 'ext:ExtensionContent')
+        self._leaf(4, 'auto-generated-wildcard')
+        self._close(3, 'ext:ExtensionContent')
+        self._close(2, 'ext:UBLExtension')
+        self._close(1, 'ext:UBLExtensions')
+
+    def add_ubl_version_id(self, version_id_str: str = "2.1"):
+        self._leaf(1, 'cbc:UBLVersionID', version_id_str)
+
+    def add_customisation_id(self, customisation_id_text: str = "TR1.2"):
+        self._leaf(1, 'cbc:CustomizationID', customisation_id_text)
+
+    def add_profile_id(self, profile_id_text: str = "TEMELFATURA"):
+        self._leaf(1, 'cbc:ProfileID', profile_id_text)
+
+    def add_id(self, id_text: str):
+        self._leaf(1, 'cbc:ID', id_text)
+        self.id = id_text
+
+    def add_copy_indicator(self, copy_indicator_text: str = "false"):
+        self._leaf(1, 'cbc:CopyIndicator', copy_indicator_text)
+
+    def add_uuid(self, uuid_text: str = None):
+        if not uuid_text:
+            from uuid import uuid4
+            uuid_text = str(uuid4())
+        self._leaf(1, 'cbc:UUID', uuid_text)
+        self.uuid = uuid_text
+
+    def add_issue_date(self, issue_date_text: str):
+        self._leaf(1, 'cbc:IssueDate', issue_date_text)
+        self.issue_date = issue_date_text
+
+    def add_issue_time(self, issue_time_text: str):
+        self._leaf(1, 'cbc:IssueTime', issue_time_text)
+
+    def add_invoice_type_code(self, invoice_type_code_text: str):
+        self._leaf(1, 'cbc:InvoiceTypeCode', invoice_type_code_text)
+
+    def add_note(self, note_text: str = None):
+        self._leaf(1, 'cbc:Note', note_text)
+
+    def add_document_currency_code(self, document_currency_code_text: str = 'TRY'):
+        self._leaf(1, 'cbc:DocumentCurrencyCode', document_currency_code_text)
+        self._line_count_at = len(self._parts)
+
+    def add_tax_currency_code(self, tax_currency_code_text: str):
+        pass
+
+    def pricing_currency_code(self, pricing_currency_code_text: str):
+        pass
+
+    def add_line_count_numeric(self, line_count_numeric_text: str):
+        self._leaf(1, 'cbc:LineCountNumeric', line_count_numeric_text)
+        self._has_line_count = True
+
+    def add_despatch_document_reference(self, ID: str, IssueDate: str):
+        self._open(1, 'cac:DespatchDocumentReference')
+        self._leaf(2, 'cbc:ID', ID)
+        self._leaf(2, 'cbc:IssueDate', IssueDate)
+        self._close(1, 'cac:DespatchDocumentReference')
+
+    def add_signature(self, signatory: SignatoryParty = None):
+        # Emitter'da prototip yok (bkz. batch.build_invoice); UBLInvoice'ın prototipsiz varsayılanı.
+        if signatory is None:
+            signatory = KolaysoftSignature()
+        self._open(1, 'cac:Signature')
+        self._leaf(2, 'cbc:ID', signatory.VKN_TCKN, {'schemeID': 'VKN_TCKN'})
+        self._open(2, 'cac:SignatoryParty')
+        self._open(3, 'cac:PartyIdentification')
+        self._leaf(4, 'cbc:ID', signatory.VKN, {'schemeID': 'VKN'})
+        self._close(3, 'cac:PartyIdentification')
+        self._open(3, 'cac:PostalAddress')
+        self._leaf(4, 'cbc:StreetName', signatory.STREET_NAME)
+        self._leaf(4, 'cbc:BuildingNumber', signatory.BUILDING_NUMBER)
+        self._leaf(4, 'cbc:CitySubdivisionName', signatory.CITY_SUBDIVISION_NAME)
+        self._leaf(4, 'cbc:CityName', signatory.CITY_NAME)
+        self._leaf(4, 'cbc:PostalZone', signatory.POSTAL_ZONE)
+        self._open(4, 'cac:Country')
+        self._leaf(5, 'cbc:Name', signatory.COUNTRY_NAME)
+        self._close(4, 'cac:Country')
+        self._close(3, 'cac:PostalAddress')
+        self._close(2, 'cac:SignatoryParty')
+        self._open(2, 'cac:DigitalSignatureAttachment')
+        self._open(3, 'cac:ExternalReference')
+        self._leaf(4, 'cbc:URI', signatory.URI)
+        self._close(3, 'cac:ExternalReference')
+        self._close(2, 'cac:DigitalSignatureAttachment')
+        self._close(1, 'cac:Signature')
+
+    def add_accounting_supplier_party(self, supplier_party: PartyData):
+        self._open(1, 'cac:AccountingSupplierParty')
+        self._open(2, 'cac:Party')
+        self._open(3, 'cac:PartyIdentification')
+        self._leaf(4, 'cbc:ID', supplier_party.PartyIdentification.value,
+                   {'schemeID': supplier_party.PartyIdentification.schemeID})
+        self._close(3, 'cac:PartyIdentification')
+        self._open(3, 'cac:PartyName')
+        self._leaf(4, 'cbc:Name', supplier_party.PartyName)
+        self._close(3, 'cac:PartyName')
+        self._open(3, 'cac:PostalAddress')
+        self._leaf(4, 'cbc:CitySubdivisionName', supplier_party.PostalAddress.city_subdivision_name)
+        self._leaf(4, 'cbc:CityName', supplier_party.PostalAddress.city_name)
+        self._open(4, 'cac:Country')
+        self._leaf(5, 'cbc:Name', supplier_party.PostalAddress.country)
+        self._close(4, 'cac:Country')
+        self._close(3, 'cac:PostalAddress')
+        self._close(2, 'cac:Party')
+        self._close(1, 'cac:AccountingSupplierParty')
+
+    def add_accounting_customer_party(self, customer_party: PartyData):
+        key = self._cache_key(customer_party_key(customer_party)) if self.fragment_cache is not None else None
+        if self._append_cached(key):
+            return
+
+        start = len(self._parts)
+        address = customer_party.PostalAddress
+        self._open(1, 'cac:AccountingCustomerParty')
+        self._open(2, 'cac:Party')
+        if customer_party.WebsiteURI:
+            self._leaf(3, 'cbc:WebsiteURI', customer_party.WebsiteURI)
+        self._open(3, 'cac:PartyIdentification')
+        self._leaf(4, 'cbc:ID', customer_party.PartyIdentification.value,
+                   {'schemeID': customer_party.PartyIdentification.schemeID})
+        self._close(3, 'cac:PartyIdentification')
+        self._open(3, 'cac:PartyName')
+        self._leaf(4, 'cbc:Name', customer_party.PartyName)
+        self._close(3, 'cac:PartyName')
+        self._open(3, 'cac:PostalAddress')
+        if address.id:
+            self._leaf(4, 'cbc:ID', address.id)
+        if address.street_name:
+            self._leaf(4, 'cbc:StreetName', address.street_name)
+        if address.building_number:
+            self._leaf(4, 'cbc:BuildingNumber', address.building_number)
+        self._leaf(4, 'cbc:CitySubdivisionName', address.city_subdivision_name)
+        self._leaf(4, 'cbc:CityName', address.city_name)
+        if address.postal_zone:
+            self._leaf(4, 'cbc:PostalZone', address.postal_zone)
+        if address.country:
+            self._open(4, 'cac:Country')
+            self._leaf(5, 'cbc:Name', address.country)
+            self._close(4, 'cac:Country')
+        self._close(3, 'cac:PostalAddress')
+        self._close(2, 'cac:Party')
+        self._close(1, 'cac:AccountingCustomerParty')
+        self._put_cached(key, start)
+
+    def add_paymentmeans(self, pmeans: PaymentMeans = None):
+        if not pmeans:
+            return
+        self._open(1, 'cac:PaymentMeans')
+        if pmeans.PaymentMeansCode:
+            self._leaf(2, 'cbc:PaymentMeansCode', pmeans.PaymentMeansCode)
+        if pmeans.PayeeFinancialAccount is not None:
+            self._open(2, 'cac:PayeeFinancialAccount')
+            self._leaf(3, 'cbc:ID', pmeans.PayeeFinancialAccount.ID)
+            self._leaf(3, 'cbc:CurrencyCode', pmeans.PayeeFinancialAccount.CurrencyCode)
+            self._leaf(3, 'cbc:PaymentNote', pmeans.PayeeFinancialAccount.PaymentNote)
+            self._close(2, 'cac:PayeeFinancialAccount')
+        self._close(1, 'cac:PaymentMeans')
+
+    def add_paymentterms(self, pterms: PaymentTerms):
+        if not pterms:
+            return
+        self._open(1, 'cac:PaymentTerms')
+        if pterms.Note:
+            self._leaf(2, 'cbc:Note', pterms.Note)
+        if pterms.PenaltySurchargePercent:
+            self._leaf(2, 'cbc:PenaltySurchargePercent', pterms.PenaltySurchargePercent)
+        if pterms.PaymentDueDate:
+            self._leaf(2, 'cbc:PaymentDueDate', pterms.PaymentDueDate)
+        if pterms.Amount and pterms.CurrencyID:
+            self._leaf(2, 'cbc:Amount', pterms.Amount, {'currencyID': pterms.CurrencyID})
+        self._close(1, 'cac:PaymentTerms')
+
+    def add_taxtotal(self, taxt: TaxTotal):
+        subtotals = taxt.TaxSubtotal if isinstance(taxt.TaxSubtotal, list) else [taxt.TaxSubtotal]
+        currency = {'currencyID': taxt.CurrencyID}
+        self._has_totals = True
+        self._open(1, 'cac:TaxTotal')
+        self._leaf(2, 'cbc:TaxAmount', taxt.TaxAmount, currency)
+        for subtotal in subtotals:
+            self._open(2, 'cac:TaxSubtotal')
+            self._leaf(3, 'cbc:TaxableAmount', subtotal.TaxableAmount, currency)
+            self._leaf(3, 'cbc:TaxAmount', subtotal.TaxAmount, currency)
+            self._leaf(3, 'cbc:Percent', subtotal.Percent)
+            self._open(3, 'cac:TaxCategory')
+            self._open(4, 'cac:TaxScheme')
+            self._leaf(5, 'cbc:Name', subtotal.TaxCategory.Name)
+            self._leaf(5, 'cbc:TaxTypeCode', subtotal.TaxCategory.TaxScheme.TaxTypeCode)
+            self._close(4, 'cac:TaxScheme')
+            self._close(3, 'cac:TaxCategory')
+            self._close(2, 'cac:TaxSubtotal')
+        self._close(1, 'cac:TaxTotal')
+
+    def add_withholdingtaxtotal(self):
+        currency = {'currencyID': 'TRY'}
+        self._open(1, 'cac:WithholdingTaxTotal')
+        self._leaf(2, 'cbc:TaxAmount', '3240', currency)
+        self._open(2, 'cac:TaxSubtotal')
+        self._leaf(3, 'cbc:TaxAmount', '3240', currency)
+        self._leaf(3, 'cbc:Percent', '90')
+        self._open(3, 'cac:TaxCategory')
+        self._open(4, 'cac:TaxScheme')
+        self._leaf(5, 'cbc:TaxTypeCode', '606')
+        self._close(4, 'cac:TaxScheme')
+        self._close(3, 'cac:TaxCategory')
+        self._close(2, 'cac:TaxSubtotal')
+        self._close(1, 'cac:WithholdingTaxTotal')
+
+    def add_legalmonetarytotal(self, monetary_total: MonetaryTotal):
+        currency = {'currencyID': monetary_total.CurrencyID}
+        self._has_totals = True
+        self._open(1, 'cac:LegalMonetaryTotal')
+        self._leaf(2, 'cbc:LineExtensionAmount', monetary_total.LineExtensionAmount, currency)
+        self._leaf(2, 'cbc:TaxExclusiveAmount', monetary_total.TaxExclusiveAmount, currency)
+        self._leaf(2, 'cbc:TaxInclusiveAmount', monetary_total.TaxInclusiveAmount, currency)
+        if monetary_total.AllowanceTotalAmount:
+            self._leaf(2, 'cbc:AllowanceTotalAmount', monetary_total.AllowanceTotalAmount, currency)
+        if monetary_total.ChargeTotalAmount:
+            self._leaf(2, 'cbc:ChargeTotalAmount', monetary_total.ChargeTotalAmount, currency)
+        if monetary_total.PayableRoundingAmount:
+            self._leaf(2, 'cbc:PayableRoundingAmount', monetary_total.PayableRoundingAmount, currency)
+        self._leaf(2, 'cbc:PayableAmount', monetary_total.PayableAmount, currency)
+        self._close(1, 'cac:LegalMonetaryTotal')
+
+    def add_invoice_line(self, invoice_line: Union[InvoiceLine, List[InvoiceLine]]):
+        if not isinstance(invoice_line, list):
+            invoice_line = [invoice_line]
+        if self._lines_at is None:
+            self._lines_at = len(self._parts)
+
+        for line in invoice_line:
+            if self.totals is not None:
+                self.totals.add_invoice_line(line)
+            currency = {'currencyID': line.currencyID}
+            self._open(1, 'cac:InvoiceLine')
+            self._leaf(2, 'cbc:ID', line.ID)
+            self._leaf(2, 'cbc:InvoicedQuantity', line.InvoicedQuantity, {'unitCode': line.InvoicedQuantity_unitCode})
+            self._leaf(2, 'cbc:LineExtensionAmount', line.LineExtensionAmount, currency)
+
+            if line.TaxTotal:
+                subtotals = line.TaxTotal.TaxSubtotal
+                if not isinstance(subtotals, list):
+                    subtotals = [subtotals]
+                self._open(2, 'cac:TaxTotal')
+                self._leaf(3, 'cbc:TaxAmount', line.TaxTotal.TaxAmount, currency)
+                # Her vergi (örn. KDV ve ÖTV) ayrı bir TaxSubtotal.
+                for subtotal in subtotals:
+                    self._open(3, 'cac:TaxSubtotal')
+                    self._leaf(4, 'cbc:TaxableAmount', subtotal.TaxableAmount, currency)
+                    self._leaf(4, 'cbc:TaxAmount', subtotal.TaxAmount, currency)
+                    self._leaf(4, 'cbc:Percent', subtotal.Percent)
+                    key = self._cache_key(line_tax_category_key(subtotal)) if self.fragment_cache is not None else None
+                    if not self._append_cached(key):
+                        start = len(self._parts)
+                        self._open(4, 'cac:TaxCategory')
+                        self._open(5, 'cac:TaxScheme')
+                        self._leaf(6, 'cbc:Name', subtotal.TaxCategory.TaxScheme.Name)
+                        self._leaf(6, 'cbc:TaxTypeCode', subtotal.TaxCategory.TaxScheme.TaxTypeCode)
+                        self._close(5, 'cac:TaxScheme')
+                        self._close(4, 'cac:TaxCategory')
+                        self._put_cached(key, start)
+                    self._close(3, 'cac:TaxSubtotal')
+                self._close(2, 'cac:TaxTotal')
+
+            key = self._cache_key(item_key(line.Item)) if self.fragment_cache is not None else None
+            if not self._append_cached(key):
+                start = len(self._parts)
+                self._open(2, 'cac:Item')
+                self._leaf(3, 'cbc:Name', line.Item.Name)
+                if line.Item.SellersItemIdentification:
+                    self._open(3, 'cac:SellersItemIdentification')
+                    self._leaf(4, 'cbc:ID', line.Item.SellersItemIdentification.ID)
+                    self._close(3, 'cac:SellersItemIdentification')
+                self._close(2, 'cac:Item')
+                self._put_cached(key, start)
+
+            self._open(2, 'cac:Price')
+            self._leaf(3, 'cbc:PriceAmount', line.Price.PriceAmount, currency)
+            self._close(2, 'cac:Price')
+            self._close(1, 'cac:InvoiceLine')
+
+    def add_invoice_lines_from_columns(self, quantities, unit_codes, prices, vat_rates, item_names, item_ids=None,
+                                       line_ids=None, first_line_id: int = 1, currency_id: str = 'TRY',
+                                       rounding: str = ROUND_HALF_UP) -> ColumnTotals:
+        columns = line_columns(quantities, unit_codes, prices, vat_rates, item_names, item_ids, line_ids,
+                               first_line_id, rounding)
+        if self.totals is not None:
+            self.totals.add_column_totals(columns.totals)
+        if self._lines_at is None:
+            self._lines_at = len(self._parts)
+        currency = {'currencyID': currency_id}
+        tax_category_key = self._cache_key(('TaxCategory', VAT_TAX_SCHEME_NAME, VAT_TAX_TYPE_CODE))
+
+        for line_id, quantity, unit_code, amount, tax_amount, percent, price, item_name, item_id in zip(
+                columns.ids, columns.quantities, columns.unit_codes, columns.amounts, columns.tax_amounts,
+                columns.percents, columns.prices, columns.item_names, columns.item_ids):
+            self._open(1, 'cac:InvoiceLine')
+            self._leaf(2, 'cbc:ID', line_id)
+            self._leaf(2, 'cbc:InvoicedQuantity', quantity, {'unitCode': unit_code})
+            self._leaf(2, 'cbc:LineExtensionAmount', amount, currency)
+            self._open(2, 'cac:TaxTotal')
+            self._leaf(3, 'cbc:TaxAmount', tax_amount, currency)
+            self._open(3, 'cac:TaxSubtotal')
+            self._leaf(4, 'cbc:TaxableAmount', amount, currency)
+            self._leaf(4, 'cbc:TaxAmount', tax_amount, currency)
+            self._leaf(4, 'cbc:Percent', percent)
+            key = tax_category_key if self.fragment_cache is not None else None
+            if not self._append_cached(key):
+                start = len(self._parts)
+                self._open(4, 'cac:TaxCategory')
+                self._open(5, 'cac:TaxScheme')
+                self._leaf(6, 'cbc:Name', VAT_TAX_SCHEME_NAME)
+                self._leaf(6, 'cbc:TaxTypeCode', VAT_TAX_TYPE_CODE)
+                self._close(5, 'cac:TaxScheme')
+                self._close(4, 'cac:TaxCategory')
+                self._put_cached(key, start)
+            self._close(3, 'cac:TaxSubtotal')
+            self._close(2, 'cac:TaxTotal')
+
+            key = self._cache_key(('Item', item_name, item_id is not None, item_id)) if self.fragment_cache is not None else None
+            if not self._append_cached(key):
+                start = len(self._parts)
+                self._open(2, 'cac:Item')
+                self._leaf(3, 'cbc:Name', item_name)
+                if item_id is not None:
+                    self._open(3, 'cac:SellersItemIdentification')
+                    self._leaf(4, 'cbc:ID', item_id)
+                    self._close(3, 'cac:SellersItemIdentification')
+                self._close(2, 'cac:Item')
+                self._put_cached(key, start)
+
+            self._open(2, 'cac:Price')
+            self._leaf(3, 'cbc:PriceAmount', price, currency)
+            self._close(2, 'cac:Price')
+            self._close(1, 'cac:InvoiceLine')
+        return columns.totals
+
+    def add_invoice_lines_from_frame(self, frame, columns: Dict[str, str] = None, **kwargs) -> ColumnTotals:
+        return self.add_invoice_lines_from_columns(**{**frame_columns(frame, columns), **kwargs})
+
+    def finalize_totals(self, allowance_total_amount=None, charge_total_amount=None, payable_rounding_amount=None):
+        """UBLInvoice.finalize_totals ile aynı; elemanlar metin parçaları arasına yerleştirilir."""
+        if self.totals is None:
+            raise ValueError('finalize_totals() requires UBLInvoiceEmitter(totals=InvoiceTotals())')
+        if self._has_totals:
+            raise ValueError('finalize_totals(): the invoice already has a TaxTotal or LegalMonetaryTotal')
+
+        tax_total = self.totals.tax_total()
+        monetary_total = self.totals.monetary_total(allowance_total_amount, charge_total_amount,
+                                                    payable_rounding_amount)
+        fragment = UBLInvoiceEmitter()
+        fragment.add_taxtotal(tax_total)
+        fragment.add_legalmonetarytotal(monetary_total)
+        position = len(self._parts) if self._lines_at is None else self._lines_at
+        self._parts[position:position] = fragment._parts
+        self._has_totals = True
+
+        if not self._has_line_count:
+            position = len(self._parts) if self._line_count_at is None else self._line_count_at
+            fragment = UBLInvoiceEmitter()
+            fragment.add_line_count_numeric(str(self.totals.line_count))
+            self._parts[position:position] = fragment._parts
+            self._has_line_count = True
+        return tax_total, monetary_total
+
+    def add_ContractDocumentReference(self, cdr: DocumentReference):
+        pass
@@ -0,0 +1,118 @@
+# Tekrarlanan XML parçaları için önbellek: aynı içerikli alt ağaçlar bir kez oluşturulur, sonra kopyalanır.
+#
+# Her kalemde aynı TaxCategory/TaxScheme bloğu ("GERÇEK USULDE KATMA DEĞER VERGİSİ"/"0015"),
+# düzenli müşterilerde aynı AccountingCustomerParty, katalog ürünlerinde aynı Item yeniden kuruluyor.
+# Anahtar, parçayı belirleyen değerlerin demetidir; ilk elemanı parça türüdür, örn.
+# ('Item', 'Notebook Çantası', True, '1234567'). İstatistikler bu türe göre de tutulur.
+#
+# UBLInvoice önbellekte donmuş lxml alt ağaçları tutar ve kopyalarını ekler, UBLInvoiceEmitter
+# ise hazır metin parçalarını. Değerler önbelleğe konduktan sonra değiştirilmemelidir.
+#
+#   cache = FragmentCache(max_entries=10000)
+#   ubl_doc = UBLInvoice(fragment_cache=cache)
+#   ...
+#   cache.stats()  # {'hits': ..., 'misses': ..., 'hit_rate': ..., 'kinds': {'Item': {...}, ...}}
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from lxml import etree
+
+
+def _size_of(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value)
+    return len(etree.tostring(value))
+
+
+class FragmentCache:
+    """
+    İçerik anahtarlı, LRU tahliyeli parça önbelleği. Thread-safe'tir.
+
+    :param max_entries: En fazla parça sayısı.
+    :param max_bytes: Parçaların toplam serileştirilmiş boyutu için üst sınır (metin parçalarında karakter sayısı).
+                      None ise yalnızca max_entries uygulanır. Ölçmek için eleman parçaları önbelleğe
+                      konurken bir kez serileştirilir.
+    """
+
+    def __init__(self, max_entries: int = 4096, max_bytes: int = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size = 0
+        self._entries = OrderedDict()
+        self._kinds = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        """Parçayı döndürür, yoksa None. Dönen değer değiştirilmemeli, kopyalanarak kullanılmalıdır."""
+        with self._lock:
+            entry = self._entries.get(key)
+            counters = self._kinds.setdefault(key[0], [0, 0])
+            if entry is None:
+                self.misses += 1
+                counters[1] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            counters[0] += 1
+            return entry[0]
+
+    def put(self, key: Tuple[Hashable, ...], value: Any):
+        size = _size_of(value) if self.max_bytes is not None else 0
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            while len(self._entries) > self.max_entries or (self.max_bytes is not None and self.size > self.max_bytes):
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'size': self.size if self.max_bytes is not None else None,
+                'kinds': {kind: {'hits': hits, 'misses': misses,
+                                 'hit_rate': round(hits / (hits + misses), 4) if hits + misses else 0.0}
+                          for kind, (hits, misses) in self._kinds.items()},
+            }
+
+
+# Parça anahtarları: yalnızca oluşturucunun XML'e yazdığı alanlar.
+
+def customer_party_key(customer_party) -> tuple:
+    address = customer_party.PostalAddress
+    return ('AccountingCustomerParty', customer_party.WebsiteURI, customer_party.PartyIdentification.schemeID,
+            customer_party.PartyIdentification.value, customer_party.PartyName, address.id, address.street_name,
+            address.building_number, address.city_subdivision_name, address.city_name, address.postal_zone,
+            address.country)
+
+
+def line_tax_category_key(subtotal) -> tuple:
+    tax_scheme = subtotal.TaxCategory.TaxScheme
+    return ('TaxCategory', tax_scheme.Name, tax_scheme.TaxTypeCode)
+
+
+def item_key(item) -> tuple:
+    # SellersItemIdentification'ın varlığı ayrıca anahtarda: ID=None olan tanımlama da boş bir eleman yazar.
+    sellers_item_identification = item.SellersItemIdentification
+    if sellers_item_identification:
+        return ('Item', item.Name, True, sellers_item_identification.ID)
+    return ('Item', item.Name, False, None)
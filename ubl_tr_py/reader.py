@@ -0,0 +1,575 @@
+# UBL-TR faturalarını (tedarikçiden gelen e-Fatura XML'leri) model sınıflarına okur.
+#
+#   from ubl_tr_py.UBLInvoice import UBLInvoice
+#   invoice = UBLInvoice.from_xml('gelen/fatura.xml')          # veya read_invoice(path / dosya nesnesi / bytes)
+#   invoice.ID, invoice.UUID, invoice.IssueDate
+#   invoice.AccountingSupplierParty.PartyIdentification.value  # PartyData
+#   invoice.TaxTotal[0].TaxSubtotal[0].TaxCategory.TaxScheme.TaxTypeCode
+#   invoice.LegalMonetaryTotal.PayableAmount                   # MonetaryTotal
+#   for line in invoice.InvoiceLine:                           # InvoiceLine, Item, Price, TaxTotal
+#       ...
+#
+#   for line in iter_invoice_lines('gelen/hal-faturasi.xml'):   # binlerce kalem, sabit bellek
+#       ...
+#   scan_header('gelen/fatura.xml').UUID                        # yalnızca dizin alanları, kalemler okunmaz
+#
+# Belge iterparse ile tek geçişte okunur. Yalnızca kök elemanın çocukları ele alınır: her çocuğun sonunda
+# etiketine karşılık gelen işleyici (_INVOICE tablosu) alt ağacı model nesnelerine çevirir, sonra eleman ve
+# önceki kardeşleri silinir. İmza, UBLExtensions ve ekler (AdditionalDocumentReference içeriği) modele alınmaz.
+#
+# Alt ağaçlar da aynı şekilde okunur: her model için çocuk etiketi -> işleyici tablosu, çocuklar üzerinde tek
+# döngü. Değerler XML'deki metin olarak (str) alınır, tutarların currencyID'si ilgili CurrencyID alanına yazılır.
+# Modelde karşılığı olmayan elemanlar atlanır.
+
+import io
+import os
+from typing import Any, Callable, Dict, Iterator, Tuple, Union
+
+from lxml import etree
+
+from .UBLInvoice import (Model, PartyData, PartyIdentification, PostalAddress, PartyTaxScheme, TaxScheme, Contact,
+                         PaymentMeans, PayeeFinancialAccount, PaymentTerms, TaxTotal, TaxSubtotal, TaxCategory,
+                         MonetaryTotal, AllowanceCharge, InvoiceLine, Item, ItemIdentification, CommodityClassification,
+                         Country, Price, DocumentReference, OrderReference, Period)
+
+INVOICE = '{urn:oasis:names:specification:ubl:schema:xsd:Invoice-2}Invoice'
+CBC = '{urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2}'
+CAC = '{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}'
+
+# PartyIdentification birden çoksa (VKN, MERSISNO, TICARETSICILNO, ...) PartyData'ya alınan kimlik.
+PARTY_ID_SCHEMES = ('VKN', 'TCKN')
+
+Handler = Callable[[Dict[str, Any], Any], None]
+
+
+class ParsedInvoice(Model):
+    """
+    Okunan faturanın modeli. Alan adları UBL-TR eleman adlarıdır; tekrarlanabilen elemanlar (Note, PaymentMeans,
+    TaxTotal, InvoiceLine, ...) listedir, belgede yoksa boş liste. Bkz. read_invoice.
+    """
+    __slots__ = ('UBLVersionID', 'CustomizationID', 'ProfileID', 'ID', 'CopyIndicator', 'UUID', 'IssueDate',
+                 'IssueTime', 'InvoiceTypeCode', 'Note', 'DocumentCurrencyCode', 'TaxCurrencyCode',
+                 'PricingCurrencyCode', 'LineCountNumeric', 'InvoicePeriod', 'OrderReference',
+                 'DespatchDocumentReference', 'AdditionalDocumentReference', 'AccountingSupplierParty',
+                 'AccountingCustomerParty', 'BuyerCustomerParty', 'PaymentMeans', 'PaymentTerms', 'AllowanceCharge',
+                 'TaxTotal', 'WithholdingTaxTotal', 'LegalMonetaryTotal', 'InvoiceLine')
+
+    _LISTS = frozenset(('Note', 'DespatchDocumentReference', 'AdditionalDocumentReference', 'PaymentMeans',
+                        'AllowanceCharge', 'TaxTotal', 'WithholdingTaxTotal', 'InvoiceLine'))
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.pop(name, [] if name in self._LISTS else None))
+        if fields:
+            raise TypeError(f'Unknown ParsedInvoice fields: {", ".join(fields)}')
+
+    def __repr__(self):
+        return f'ParsedInvoice(ID={self.ID!r}, UUID={self.UUID!r}, lines={len(self.InvoiceLine)})'
+
+
+def _read(element, handlers: Dict[str, Handler]) -> Dict[str, Any]:
+    # Çocuklar üzerinde tek geçiş; yorum ve işleme talimatlarının etiketi str değildir, tabloda bulunmaz.
+    values = {}
+    for child in element:
+        handler = handlers.get(child.tag)
+        if handler is not None:
+            handler(values, child)
+    return values
+
+
+def _text(name: str) -> Handler:
+    def handler(values, element):
+        values[name] = element.text
+    return handler
+
+
+def _amount(name: str, currency: str = 'CurrencyID') -> Handler:
+    # Tutar ve currencyID; aynı modeldeki tutarların para birimi aynıdır, ilk bulunan alınır.
+    def handler(values, element):
+        values[name] = element.text
+        if currency not in values:
+            values[currency] = element.get('currencyID')
+    return handler
+
+
+def _one(name: str, convert: Callable) -> Handler:
+    def handler(values, element):
+        values[name] = convert(element)
+    return handler
+
+
+def _many(name: str, convert: Callable) -> Handler:
+    def handler(values, element):
+        values.setdefault(name, []).append(convert(element))
+    return handler
+
+
+def _model(model: type, handlers: Dict[str, Handler], **defaults) -> Callable:
+    # defaults: modelin zorunlu parametreleri, belgede yoksa None verilir.
+    if defaults:
+        def convert(element):
+            return model(**{**defaults, **_read(element, handlers)})
+    else:
+        def convert(element):
+            return model(**_read(element, handlers))
+    return convert
+
+
+def _child_text(tag: str) -> Callable:
+    def convert(element):
+        child = element.find(tag)
+        return None if child is None else child.text
+    return convert
+
+
+def _tax_scheme(element) -> TaxScheme:
+    return TaxScheme(**_read(element, _TAX_SCHEME))
+
+
+_TAX_SCHEME = {
+    CBC + 'ID': _text('ID'),
+    CBC + 'Name': _text('Name'),
+    CBC + 'TaxTypeCode': _text('TaxTypeCode'),
+}
+
+_POSTAL_ADDRESS = {
+    CBC + 'ID': _text('ID'),
+    CBC + 'Postbox': _text('Postbox'),
+    CBC + 'Room': _text('Room'),
+    CBC + 'StreetName': _text('StreetName'),
+    CBC + 'BlockName': _text('BlockName'),
+    CBC + 'BuildingName': _text('BuildingName'),
+    CBC + 'BuildingNumber': _text('BuildingNumber'),
+    CBC + 'CitySubdivisionName': _text('CitySubdivisionName'),
+    CBC + 'CityName': _text('CityName'),
+    CBC + 'PostalZone': _text('PostalZone'),
+    CBC + 'Region': _text('Region'),
+    CBC + 'District': _text('District'),
+    # UBLInvoice ülkeyi metin olarak yazar (PostalAddress.country).
+    CAC + 'Country': _one('Country', _child_text(CBC + 'Name')),
+}
+
+_PARTY_TAX_SCHEME = {
+    CBC + 'RegistrationName': _text('RegistrationName'),
+    CBC + 'CompanyID': _text('CompanyID'),
+    CAC + 'TaxScheme': _one('TaxScheme', _tax_scheme),
+}
+
+_CONTACT = {
+    CBC + 'ID': _text('ID'),
+    CBC + 'Name': _text('Name'),
+    CBC + 'Telephone': _text('Telephone'),
+    CBC + 'Telefax': _text('Telefax'),
+    CBC + 'ElectronicMail': _text('ElectronicMail'),
+    CBC + 'Note': _text('Note'),
+}
+
+
+def _party_identification(element) -> PartyIdentification:
+    identifier = element.find(CBC + 'ID')
+    if identifier is None:
+        return PartyIdentification()
+    return PartyIdentification(schemeID=identifier.get('schemeID'), value=identifier.text)
+
+
+_PARTY = {
+    CBC + 'WebsiteURI': _text('WebsiteURI'),
+    CAC + 'PartyIdentification': _many('PartyIdentification', _party_identification),
+    CAC + 'PartyName': _one('PartyName', _child_text(CBC + 'Name')),
+    CAC + 'PostalAddress': _one('PostalAddress', _model(PostalAddress, _POSTAL_ADDRESS)),
+    CAC + 'PartyTaxScheme': _one('PartyTaxScheme', _model(PartyTaxScheme, _PARTY_TAX_SCHEME)),
+    CAC + 'Contact': _one('Contact', _model(Contact, _CONTACT)),
+}
+
+
+def _party(element) -> PartyData:
+    """AccountingSupplierParty / AccountingCustomerParty: içindeki cac:Party."""
+    party = element.find(CAC + 'Party')
+    values = _read(party, _PARTY) if party is not None else {}
+    identifications = values.pop('PartyIdentification', None)
+    if identifications:
+        values['PartyIdentification'] = next((identification for identification in identifications
+                                              if identification.schemeID in PARTY_ID_SCHEMES), identifications[0])
+    return PartyData(**values)
+
+
+_PAYEE_FINANCIAL_ACCOUNT = {
+    CBC + 'ID': _text('ID'),
+    CBC + 'CurrencyCode': _text('CurrencyCode'),
+    CBC + 'PaymentNote': _text('PaymentNote'),
+}
+
+_PAYMENT_MEANS = {
+    CBC + 'PaymentMeansCode': _text('PaymentMeansCode'),
+    CBC + 'PaymentDueDate': _text('PaymentDueDate'),
+    CBC + 'PaymentChannelCode': _text('PaymentChannelCode'),
+    CBC + 'InstructionNote': _text('InstructionNote'),
+    CAC + 'PayeeFinancialAccount': _one('PayeeFinancialAccount',
+                                        _model(PayeeFinancialAccount, _PAYEE_FINANCIAL_ACCOUNT)),
+}
+
+_PAYMENT_TERMS = {
+    CBC + 'Note': _text('Note'),
+    CBC + 'PenaltySurchargePercent': _text('PenaltySurchargePercent'),
+    CBC + 'PaymentDueDate': _text('PaymentDueDate'),
+    CBC + 'Amount': _amount('Amount'),
+}
+
+_TAX_CATEGORY = {
+    CBC + 'Name': _text('Name'),
+    CBC + 'TaxExemptionReasonCode': _text('TaxExemptionReasonCode'),
+    CBC + 'TaxExemptionReason': _text('TaxExemptionReason'),
+    CAC + 'TaxScheme': _one('TaxScheme', _tax_scheme),
+}
+
+_TAX_SUBTOTAL = {
+    CBC + 'TaxableAmount': _text('TaxableAmount'),
+    CBC + 'TaxAmount': _text('TaxAmount'),
+    CBC + 'CalculationSequenceNumeric': _text('CalculationSequenceNumeric'),
+    CBC + 'TransactionCurrencyTaxAmount': _text('TransactionCurrencyTaxAmount'),
+    CBC + 'Percent': _text('Percent'),
+    CBC + 'BaseUnitMeasure': _text('BaseUnitMeasure'),
+    CBC + 'PerUnitAmount': _text('PerUnitAmount'),
+    CAC + 'TaxCategory': _one('TaxCategory', _model(TaxCategory, _TAX_CATEGORY)),
+}
+
+_TAX_TOTAL = {
+    CBC + 'TaxAmount': _amount('TaxAmount'),
+    CAC + 'TaxSubtotal': _many('TaxSubtotal', _model(TaxSubtotal, _TAX_SUBTOTAL)),
+}
+
+_MONETARY_TOTAL = {
+    CBC + 'LineExtensionAmount': _amount('LineExtensionAmount'),
+    CBC + 'TaxExclusiveAmount': _amount('TaxExclusiveAmount'),
+    CBC + 'TaxInclusiveAmount': _amount('TaxInclusiveAmount'),
+    CBC + 'AllowanceTotalAmount': _amount('AllowanceTotalAmount'),
+    CBC + 'ChargeTotalAmount': _amount('ChargeTotalAmount'),
+    CBC + 'PayableRoundingAmount': _amount('PayableRoundingAmount'),
+    CBC + 'PayableAmount': _amount('PayableAmount'),
+}
+
+_ALLOWANCE_CHARGE = {
+    CBC + 'ChargeIndicator': _text('ChargeIndicator'),
+    CBC + 'AllowanceChargeReason': _text('AllowanceChargeReason'),
+    CBC + 'MultiplierFactorNumeric': _text('MultiplierFactorNumeric'),
+    CBC + 'SequenceNumeric': _text('SequenceNumeric'),
+    CBC + 'Amount': _amount('Amount'),
+    CBC + 'BaseAmount': _amount('BaseAmount'),
+    CBC + 'PerUnitAmount': _amount('PerUnitAmount'),
+}
+
+
+def _item_identification(element) -> ItemIdentification:
+    return ItemIdentification(ID=element.findtext(CBC + 'ID'))
+
+
+def _commodity_classification(element) -> CommodityClassification:
+    code = element.find(CBC + 'ItemClassificationCode')
+    if code is None:
+        return CommodityClassification()
+    return CommodityClassification(ItemClassificationCode=code.text, listAgencyID=code.get('listAgencyID'),
+                                   listID=code.get('listID'))
+
+
+_COUNTRY = {
+    CBC + 'IdentificationCode': _text('IdentificationCode'),
+    CBC + 'Name': _text('Name'),
+}
+
+_ITEM = {
+    CBC + 'Description': _text('Description'),
+    CBC + 'Name': _text('Name'),
+    CBC + 'Keyword': _text('Keyword'),
+    CBC + 'BrandName': _text('BrandName'),
+    CBC + 'ModelName': _text('ModelName'),
+    CAC + 'BuyersItemIdentification': _one('BuyersItemIdentification', _item_identification),
+    CAC + 'SellersItemIdentification': _one('SellersItemIdentification', _item_identification),
+    CAC + 'ManufacturersItemIdentification': _one('ManufacturersItemIdentification', _item_identification),
+    CAC + 'AdditionalItemIdentification': _many('AdditionalItemIdentification', _item_identification),
+    CAC + 'OriginCountry': _one('OriginCountry', _model(Country, _COUNTRY, Name=None)),
+    CAC + 'CommodityClassification': _many('CommodityClassification', _commodity_classification),
+}
+
+_PRICE = {
+    CBC + 'PriceAmount': _amount('PriceAmount', 'currencyID'),
+}
+
+
+def _quantity(values, element):
+    values['InvoicedQuantity'] = element.text
+    values['InvoicedQuantity_unitCode'] = element.get('unitCode')
+
+
+_INVOICE_LINE = {
+    CBC + 'ID': _text('ID'),
+    CBC + 'Note': _text('Note'),
+    CBC + 'InvoicedQuantity': _quantity,
+    CBC + 'LineExtensionAmount': _amount('LineExtensionAmount', 'currencyID'),
+    CAC + 'AllowanceCharge': _many('AllowanceCharge', _model(AllowanceCharge, _ALLOWANCE_CHARGE,
+                                                             ChargeIndicator=None, Amount=None)),
+    CAC + 'TaxTotal': _one('TaxTotal', _model(TaxTotal, _TAX_TOTAL)),
+    CAC + 'WithholdingTaxTotal': _many('WithholdingTaxTotal', _model(TaxTotal, _TAX_TOTAL)),
+    CAC + 'Item': _one('Item', _model(Item, _ITEM, Name=None)),
+    CAC + 'Price': _one('Price', _model(Price, _PRICE)),
+}
+
+invoice_line = _model(InvoiceLine, _INVOICE_LINE, ID=None, InvoicedQuantity=None, InvoicedQuantity_unitCode=None,
+                      LineExtensionAmount=None, Item=None, Price=None)
+
+_DOCUMENT_REFERENCE = {
+    CBC + 'ID': _text('ID'),
+    CBC + 'IssueDate': _text('IssueDate'),
+    CBC + 'DocumentTypeCode': _text('DocumentTypeCode'),
+    CBC + 'DocumentType': _text('DocumentType'),
+    CBC + 'DocumentDescription': _text('DocumentDescription'),
+}
+
+_ORDER_REFERENCE = {
+    CBC + 'ID': _text('ID'),
+    CBC + 'SalesOrderID': _text('SalesOrderID'),
+    CBC + 'IssueDate': _text('IssueDate'),
+    CBC + 'OrderTypeCode': _text('OrderTypeCode'),
+}
+
+_PERIOD = {
+    CBC + 'StartDate': _text('StartDate'),
+    CBC + 'StartTime': _text('StartTime'),
+    CBC + 'EndDate': _text('EndDate'),
+    CBC + 'EndTime': _text('EndTime'),
+    CBC + 'DurationMeasure': _text('DurationMeasure'),
+    CBC + 'Description': _text('Description'),
+}
+
+# Kök elemanın çocukları: etiket -> işleyici. iterparse yalnızca bu etiketler için olay üretir.
+_INVOICE = {
+    CBC + 'UBLVersionID': _text('UBLVersionID'),
+    CBC + 'CustomizationID': _text('CustomizationID'),
+    CBC + 'ProfileID': _text('ProfileID'),
+    CBC + 'ID': _text('ID'),
+    CBC + 'CopyIndicator': _text('CopyIndicator'),
+    CBC + 'UUID': _text('UUID'),
+    CBC + 'IssueDate': _text('IssueDate'),
+    CBC + 'IssueTime': _text('IssueTime'),
+    CBC + 'InvoiceTypeCode': _text('InvoiceTypeCode'),
+    CBC + 'Note': _many('Note', lambda element: element.text),
+    CBC + 'DocumentCurrencyCode': _text('DocumentCurrencyCode'),
+    CBC + 'TaxCurrencyCode': _text('TaxCurrencyCode'),
+    CBC + 'PricingCurrencyCode': _text('PricingCurrencyCode'),
+    CBC + 'LineCountNumeric': _text('LineCountNumeric'),
+    CAC + 'InvoicePeriod': _one('InvoicePeriod', _model(Period, _PERIOD)),
+    CAC + 'OrderReference': _one('OrderReference', _model(OrderReference, _ORDER_REFERENCE)),
+    CAC + 'DespatchDocumentReference': _many('DespatchDocumentReference',
+                                             _model(DocumentReference, _DOCUMENT_REFERENCE)),
+    # Ekin içeriği (EmbeddedDocumentBinaryObject) alınmaz.
+    CAC + 'AdditionalDocumentReference': _many('AdditionalDocumentReference',
+                                               _model(DocumentReference, _DOCUMENT_REFERENCE)),
+    CAC + 'AccountingSupplierParty': _one('AccountingSupplierParty', _party),
+    CAC + 'AccountingCustomerParty': _one('AccountingCustomerParty', _party),
+    CAC + 'BuyerCustomerParty': _one('BuyerCustomerParty', _party),
+    CAC + 'PaymentMeans': _many('PaymentMeans', _model(PaymentMeans, _PAYMENT_MEANS)),
+    CAC + 'PaymentTerms': _one('PaymentTerms', _model(PaymentTerms, _PAYMENT_TERMS)),
+    CAC + 'AllowanceCharge': _many('AllowanceCharge', _model(AllowanceCharge, _ALLOWANCE_CHARGE,
+                                                             ChargeIndicator=None, Amount=None)),
+    CAC + 'TaxTotal': _many('TaxTotal', _model(TaxTotal, _TAX_TOTAL)),
+    CAC + 'WithholdingTaxTotal': _many('WithholdingTaxTotal', _model(TaxTotal, _TAX_TOTAL)),
+    CAC + 'LegalMonetaryTotal': _one('LegalMonetaryTotal', _model(MonetaryTotal, _MONETARY_TOTAL)),
+    CAC + 'InvoiceLine': _many('InvoiceLine', invoice_line),
+}
+
+_INVOICE_TAGS = tuple(_INVOICE)
+_INVOICE_LINE_TAG = CAC + 'InvoiceLine'
+
+
+def _source(source: Union[str, os.PathLike, bytes, Any]):
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    if isinstance(source, os.PathLike):
+        return os.fspath(source)
+    return source
+
+
+def iter_sections(source: Union[str, os.PathLike, bytes, Any], tags: Tuple[str, ...] = _INVOICE_TAGS
+                  ) -> Iterator[Any]:
+    """
+    Faturanın kök elemanının tags içindeki çocuklarını, her biri tamamen okunduğunda verir. Verilen eleman
+    bir sonraki adımda önceki kardeşleriyle birlikte silinir; alt ağacı o adıma kadar kullanılmalıdır.
+
+    :param source: Dosya yolu, okunabilir dosya nesnesi veya bytes.
+    :param tags: Clark notasyonunda etiketler, örn. CAC + 'InvoiceLine'.
+    :raises ValueError: Belge UBL-TR Invoice değilse.
+    """
+    # Gelen belgeler için dış varlıklar çözülmez; büyük ekler (base64) için huge_tree.
+    events = etree.iterparse(_source(source), events=('end',), tag=tags, huge_tree=True, resolve_entities=False,
+                             remove_blank_text=True)
+    root = None
+    for _, element in events:
+        parent = element.getparent()
+        if parent is None or parent.getparent() is not None:
+            continue
+        if root is None:
+            if parent.tag != INVOICE:
+                raise ValueError(f'Not a UBL-TR Invoice document: {parent.tag}')
+            root = parent
+        yield element
+        element.clear()
+        while element.getprevious() is not None:
+            del root[0]
+    if root is None:
+        raise ValueError('Not a UBL-TR Invoice document')
+
+
+def read_invoice(source: Union[str, os.PathLike, bytes, Any], invoice_lines: bool = True) -> ParsedInvoice:
+    """
+    Bkz. modül açıklaması ve UBLInvoice.from_xml.
+
+    :param source: Dosya yolu, okunabilir dosya nesnesi veya bytes.
+    :param invoice_lines: False ise kalemler modele çevrilmez (ParsedInvoice.InvoiceLine boş kalır).
+    """
+    values = {}
+    for element in iter_sections(source):
+        # Kalemler alınmasa da olay üretilir; böylece okunduktan sonra silinirler.
+        if invoice_lines or element.tag != _INVOICE_LINE_TAG:
+            _INVOICE[element.tag](values, element)
+    return ParsedInvoice(**values)
+
+
+class InvoiceHeader(Model):
+    """
+    Gelen kutusu dizini için fatura başlığı, bkz. scan_header. SupplierVKN/CustomerVKN: tarafın VKN'si, gerçek
+    kişilerde TCKN'si. CurrencyID: PayableAmount'un para birimi.
+    """
+    __slots__ = ('ID', 'UUID', 'IssueDate', 'ProfileID', 'InvoiceTypeCode', 'SupplierVKN', 'CustomerVKN',
+                 'PayableAmount', 'CurrencyID')
+
+    def __init__(self, ID: str = None, UUID: str = None, IssueDate: str = None, ProfileID: str = None,
+                 InvoiceTypeCode: str = None, SupplierVKN: str = None, CustomerVKN: str = None,
+                 PayableAmount: str = None, CurrencyID: str = None):
+        self.ID = ID
+        self.UUID = UUID
+        self.IssueDate = IssueDate
+        self.ProfileID = ProfileID
+        self.InvoiceTypeCode = InvoiceTypeCode
+        self.SupplierVKN = SupplierVKN
+        self.CustomerVKN = CustomerVKN
+        self.PayableAmount = PayableAmount
+        self.CurrencyID = CurrencyID
+
+
+def _party_vkn(element) -> str:
+    # Tek etiketli find/iterchildren; yol ifadeleri (Party/PartyIdentification/ID) her çağrıda ayrıştırılır.
+    party = element.find(CAC + 'Party')
+    if party is None:
+        return None
+    for identification in party.iterchildren(CAC + 'PartyIdentification'):
+        identifier = identification.find(CBC + 'ID')
+        if identifier is not None and identifier.get('schemeID') in PARTY_ID_SCHEMES:
+            return identifier.text
+    return None
+
+
+def _payable_amount(values, element):
+    amount = element.find(CBC + 'PayableAmount')
+    if amount is not None:
+        values['PayableAmount'] = amount.text
+        values['CurrencyID'] = amount.get('currencyID')
+
+
+_HEADER = {
+    CBC + 'ProfileID': _text('ProfileID'),
+    CBC + 'ID': _text('ID'),
+    CBC + 'UUID': _text('UUID'),
+    CBC + 'IssueDate': _text('IssueDate'),
+    CBC + 'InvoiceTypeCode': _text('InvoiceTypeCode'),
+    CAC + 'AccountingSupplierParty': _one('SupplierVKN', _party_vkn),
+    CAC + 'AccountingCustomerParty': _one('CustomerVKN', _party_vkn),
+    CAC + 'LegalMonetaryTotal': _payable_amount,
+}
+
+# Şemada LegalMonetaryTotal'dan sonra yalnızca kalemler gelir; ikisinden biri görülünce okuma bırakılır.
+_HEADER_TAGS = tuple(_HEADER) + (_INVOICE_LINE_TAG,)
+_HEADER_END = frozenset((CAC + 'LegalMonetaryTotal', _INVOICE_LINE_TAG))
+
+
+def scan_header(source: Union[str, os.PathLike, bytes, Any]) -> InvoiceHeader:
+    """
+    Gelen kutusunu dizinlemek için yalnızca başlık alanlarını okur ve LegalMonetaryTotal'da durur: kalemler
+    hiç okunmaz. Ekler (AdditionalDocumentReference) ve imza modele çevrilmeden silinir.
+
+        header = scan_header('gelen/fatura.xml')
+        header.UUID, header.SupplierVKN, header.PayableAmount
+
+    :param source: Dosya yolu, okunabilir dosya nesnesi veya bytes.
+    :return: InvoiceHeader
+    :raises ValueError: Belge UBL-TR Invoice değilse.
+    """
+    values = {}
+    sections = iter_sections(source, _HEADER_TAGS)
+    try:
+        for element in sections:
+            handler = _HEADER.get(element.tag)
+            if handler is not None:
+                handler(values, element)
+            if element.tag in _HEADER_END:
+                break
+    finally:
+        sections.close()
+    return InvoiceHeader(**values)
+
+
+class InvoiceLineIterator:
+    """
+    Faturanın kalemlerini birer birer InvoiceLine olarak veren iterator, bkz. iter_invoice_lines. Oluşturulurken
+    belge ilk kaleme kadar okunur; kalemlerden önceki bölümler header'dadır (header.InvoiceLine boştur).
+    """
+
+    def __init__(self, source: Union[str, os.PathLike, bytes, Any]):
+        self._sections = iter_sections(source)
+        self._next = None
+        values = {}
+        for element in self._sections:
+            if element.tag == _INVOICE_LINE_TAG:
+                self._next = invoice_line(element)
+                break
+            _INVOICE[element.tag](values, element)
+        self.header = ParsedInvoice(**values)
+
+    def __iter__(self) -> 'InvoiceLineIterator':
+        return self
+
+    def __next__(self) -> InvoiceLine:
+        if self._next is not None:
+            line, self._next = self._next, None
+            return line
+        # UBL-TR şemasında InvoiceLine kökün son elemanıdır; kalemlerden sonra gelen bölüm olmaz.
+        for element in self._sections:
+            if element.tag == _INVOICE_LINE_TAG:
+                return invoice_line(element)
+        raise StopIteration
+
+    def close(self):
+        """Okumayı bırakır (dosya yolu verildiyse dosya kapanır)."""
+        self._next = None
+        self._sections.close()
+
+    def __enter__(self) -> 'InvoiceLineIterator':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def iter_invoice_lines(source: Union[str, os.PathLike, bytes, Any]) -> InvoiceLineIterator:
+    """
+    Büyük gelen faturaların kalemlerini sabit bellekle okur: her cac:InvoiceLine okunduğunda InvoiceLine modeline
+    çevrilip verilir, eleman ve önceki kardeşleri silinir. Başlık alanları ilk kalemden önce hazırdır.
+
+        with iter_invoice_lines('gelen/hal-faturasi.xml') as lines:
+            lines.header.ID, lines.header.AccountingSupplierParty.PartyIdentification.value
+            for line in lines:
+                line.Item.Name, line.InvoicedQuantity, line.LineExtensionAmount
+
+    :param source: Dosya yolu, okunabilir dosya nesnesi veya bytes.
+    :return: InvoiceLineIterator; header özelliği ParsedInvoice (kalemsiz).
+    :raises ValueError: Belge UBL-TR Invoice değilse.
+    """
+    return InvoiceLineIterator(source)
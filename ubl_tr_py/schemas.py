@@ -0,0 +1,170 @@
+# UBL-TR XSD şemaları: ilk kullanımda derlenir, süreç boyunca önbellekte tutulur.
+#
+# Şemaları modül import edilirken derlemek her worker, CLI çağrısı ve testin
+# ilk faturadan önce bütün UBL ortak bileşen şemalarını derlemesine yol açıyordu.
+#
+# maindoc altındaki beş kök şema (Invoice, CreditNote, DespatchAdvice, ApplicationResponse,
+# ReceiptAdvice) tek bir sürücü şema üzerinden birlikte derlenir. Böylece common/*.xsd
+# bileşenleri her belge tipi için ayrı ayrı değil, bir kez okunup derlenir. Belgenin tipi
+# kök elemanından belirlenir.
+
+import hashlib
+import os
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+from lxml import etree
+
+module_path = os.path.dirname(__file__)
+parent_path = os.path.dirname(module_path)
+
+# Belge tipi -> maindoc altındaki kök şema dosyası.
+SCHEMA_FILES = {
+    'Invoice': 'UBL-Invoice-2.1.xsd',
+    'CreditNote': 'UBL-CreditNote-2.1.xsd',
+    'DespatchAdvice': 'UBL-DespatchAdvice-2.1.xsd',
+    'ApplicationResponse': 'UBL-ApplicationResponse-2.1.xsd',
+    'ReceiptAdvice': 'UBL-ReceiptAdvice-2.1.xsd',
+}
+
+# Kök eleman (Clark notasyonu) -> belge tipi, örn. '{urn:...:Invoice-2}Invoice' -> 'Invoice'
+ROOT_TAGS = {
+    f'{{urn:oasis:names:specification:ubl:schema:xsd:{document_type}-2}}{document_type}': document_type
+    for document_type in SCHEMA_FILES
+}
+
+# Şemalar dosya sistemi yolları yerine bu sanal adres altından çözümlenir, bkz. XSDResolver.
+RESOLVER_PREFIX = 'ubltr://xsdrt/'
+
+_schema: Optional[etree.XMLSchema] = None
+_version: Optional[str] = None
+_sources: Dict[str, bytes] = {}
+_lock = threading.Lock()
+
+
+def xsd_root() -> str:
+    """
+    Şema dizinini (common/ ve maindoc/ içeren xsdrt) döndürür.
+
+    Paket kurulduğunda şemalar ubl_tr_py/xsdrt altına kopyalanır (bkz. setup.py),
+    kaynak ağacından çalışırken GİB paketinin kendi dizini kullanılır.
+    """
+    installed = os.path.join(module_path, 'xsdrt')
+    if os.path.isdir(installed):
+        return installed
+    return os.path.join(parent_path, 'UBLTR_1.2.1_Paketi', 'xsdrt')
+
+
+def schema_path(document_type: str = 'Invoice') -> str:
+    try:
+        file_name = SCHEMA_FILES[document_type]
+    except KeyError:
+        raise ValueError(f'Unknown UBL-TR document type: {document_type}')
+    return os.path.join(xsd_root(), 'maindoc', file_name)
+
+
+def schema_version() -> str:
+    """
+    xsdrt altındaki bütün .xsd dosyalarının içeriğinden hesaplanan kısa özet.
+    Şema paketi güncellendiğinde değişir; doğrulama sonucu önbellekleri anahtarlarında kullanır.
+    """
+    global _version
+    if _version is None:
+        digest = hashlib.sha256()
+        root = xsd_root()
+        for dir_path, dir_names, file_names in os.walk(root):
+            dir_names.sort()
+            for file_name in sorted(file_names):
+                if file_name.endswith('.xsd'):
+                    path = os.path.join(dir_path, file_name)
+                    digest.update(os.path.relpath(path, root).replace(os.sep, '/').encode())
+                    with open(path, 'rb') as f:
+                        digest.update(f.read())
+        _version = digest.hexdigest()[:16]
+    return _version
+
+
+class XSDResolver(etree.Resolver):
+    """
+    RESOLVER_PREFIX altındaki şema adreslerini xsdrt dizininden çözer.
+    Her .xsd dosyası süreç başına bir kez okunur ve bütün derlemelerde paylaşılır.
+    """
+
+    def resolve(self, url, pubid, context):
+        if not url or not url.startswith(RESOLVER_PREFIX):
+            return None
+        relative_path = os.path.normpath(url[len(RESOLVER_PREFIX):])
+        source = _sources.get(relative_path)
+        if source is None:
+            with open(os.path.join(xsd_root(), relative_path), 'rb') as f:
+                source = f.read()
+            _sources[relative_path] = source
+        return self.resolve_string(source, context, base_url=url)
+
+
+def _driver_schema() -> bytes:
+    imports = ''.join(
+        f'<xsd:import namespace="urn:oasis:names:specification:ubl:schema:xsd:{document_type}-2" '
+        f'schemaLocation="{RESOLVER_PREFIX}maindoc/{file_name}"/>'
+        for document_type, file_name in SCHEMA_FILES.items()
+    )
+    return f'<xsd:schema xmlns:xsd="http://www.w3.org/2001/XMLSchema">{imports}</xsd:schema>'.encode()
+
+
+def get_schema(document_type: str = None) -> etree.XMLSchema:
+    """
+    UBL-TR belge tiplerinin tamamını içeren derlenmiş XMLSchema nesnesini döndürür.
+    İlk çağrıda derlenir, sonraki çağrılar önbellekten döner.
+
+    Şema beş kök elemanın hepsini kabul eder; belgenin beklenen tipte olduğu ayrıca
+    kontrol edilmelidir (bkz. schema_for, document_type_of).
+
+    :param document_type: Verilirse SCHEMA_FILES içinde olup olmadığı kontrol edilir, örn. 'Invoice'
+    :return: lxml.etree.XMLSchema
+    """
+    if document_type is not None and document_type not in SCHEMA_FILES:
+        raise ValueError(f'Unknown UBL-TR document type: {document_type}')
+
+    schema = _schema
+    if schema is not None:
+        return schema
+    return _compile()
+
+
+def _compile() -> etree.XMLSchema:
+    global _schema
+    with _lock:
+        if _schema is None:
+            parser = etree.XMLParser()
+            parser.resolvers.add(XSDResolver())
+            driver = etree.fromstring(_driver_schema(), parser, base_url=f'{RESOLVER_PREFIX}driver.xsd')
+            _schema = etree.XMLSchema(driver)
+        return _schema
+
+
+def document_type_of(doc: Union[etree._ElementTree, etree._Element]) -> Optional[str]:
+    """Belgenin kök elemanına bakarak tipini döndürür. UBL-TR belgesi değilse None."""
+    root = doc.getroot() if isinstance(doc, etree._ElementTree) else doc
+    return ROOT_TAGS.get(root.tag)
+
+
+def schema_for(doc: Union[etree._ElementTree, etree._Element]) -> Tuple[str, etree.XMLSchema]:
+    """
+    Belgenin kök elemanına göre (belge tipi, şema) döndürür.
+
+    :raises ValueError: Kök eleman UBL-TR belge tiplerinden biri değilse.
+    """
+    document_type = document_type_of(doc)
+    if document_type is None:
+        root = doc.getroot() if isinstance(doc, etree._ElementTree) else doc
+        raise ValueError(f'Unsupported root element: {root.tag}')
+    return document_type, get_schema()
+
+
+def clear_cache():
+    """Derlenmiş şemayı ve okunmuş .xsd içeriklerini bırakır. Bir sonraki get_schema çağrısı yeniden derler."""
+    global _schema, _version
+    with _lock:
+        _schema = None
+        _version = None
+        _sources.clear()
@@ -0,0 +1,151 @@
+# Fatura toplamlarının kalemler eklenirken hesaplanması: TaxTotal, LegalMonetaryTotal ve LineCountNumeric.
+#
+# Çağıran taraf bugüne kadar toplamları kendisi hesaplayıp metin olarak veriyordu. InvoiceTotals her
+# add_invoice_line / add_invoice_lines_from_columns çağrısında Decimal toplayıcıları (TaxTypeCode, Percent)
+# grubuna göre günceller; finalize_totals() kalemler üzerinden ikinci kez geçmeden, grup sayısı kadar işle
+# belge düzeyindeki elemanları şemadaki yerlerine ekler.
+#
+#   ubl_doc = UBLInvoice(totals=InvoiceTotals())
+#   ...                                   # add_line_count_numeric, add_taxtotal, add_legalmonetarytotal çağrılmaz
+#   ubl_doc.add_invoice_line(lines)
+#   ubl_doc.finalize_totals()             # LineCountNumeric, TaxTotal (grup başına bir TaxSubtotal), LegalMonetaryTotal
+#
+# Yuvarlama:
+#   rounding  : decimal yuvarlama kipi (varsayılan ROUND_HALF_UP, GİB örneklerindeki "yarım yukarı")
+#   quantum   : tutarların basamağı (varsayılan '0.01', kuruş)
+#   tax_basis : 'line'     -> grup vergisi kalemlerdeki (yuvarlanmış) vergi tutarlarının toplamı
+#               'document' -> grup vergisi, grup matrahı x oran / 100 tek seferde yuvarlanarak hesaplanır
+
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .UBLInvoice import TaxTotal, TaxSubtotal, TaxCategory, TaxScheme, MonetaryTotal, InvoiceLine, _tax_type_name
+from .columns import ColumnTotals, VAT_TAX_SCHEME_NAME, VAT_TAX_TYPE_CODE, to_decimal
+
+TAX_BASES = ('line', 'document')
+
+
+class InvoiceTotals:
+    """
+    Kalemlerden belge toplamlarını tek geçişte biriktirir.
+
+    :param rounding: decimal yuvarlama kipi, örn. decimal.ROUND_HALF_EVEN.
+    :param quantum: Tutarların yuvarlandığı basamak.
+    :param tax_basis: 'line' veya 'document', bkz. modül açıklaması.
+    :param currency_id: TaxTotal ve LegalMonetaryTotal para birimi.
+    """
+
+    def __init__(self, rounding: str = ROUND_HALF_UP, quantum: str = '0.01', tax_basis: str = 'line',
+                 currency_id: str = 'TRY'):
+        if tax_basis not in TAX_BASES:
+            raise ValueError(f'tax_basis must be one of {TAX_BASES}, not {tax_basis!r}')
+        self.rounding = rounding
+        self.quantum = Decimal(quantum)
+        self.tax_basis = tax_basis
+        self.currency_id = currency_id
+        self.line_count = 0
+        self.line_extension_amount = Decimal(0)
+        # (TaxTypeCode, Percent) -> [vergi adı, matrah, vergi]
+        self._groups: Dict[Tuple[str, Decimal], list] = {}
+
+    def add(self, line_extension_amount, taxes: Iterable[Tuple[str, Optional[str], object, object, object]] = ()):
+        """
+        Bir kalem ekler.
+
+        :param line_extension_amount: Kalem tutarı
+        :param taxes: (TaxTypeCode, vergi adı, oran, matrah, vergi tutarı) demetleri. Ad None ise
+                      TaxTypeCode listesindeki ad kullanılır.
+        """
+        self.line_count += 1
+        self.line_extension_amount += to_decimal(line_extension_amount)
+        for tax_type_code, name, percent, taxable_amount, tax_amount in taxes:
+            self._add_tax(tax_type_code, name, to_decimal(percent), to_decimal(taxable_amount), to_decimal(tax_amount))
+
+    def add_invoice_line(self, invoice_line: InvoiceLine):
+        """InvoiceLine modelinden kalem ekler; vergiler kalemin TaxTotal alt toplamlarından alınır."""
+        taxes = []
+        if invoice_line.TaxTotal:
+            subtotals = invoice_line.TaxTotal.TaxSubtotal
+            for subtotal in subtotals if isinstance(subtotals, list) else [subtotals]:
+                tax_scheme = subtotal.TaxCategory.TaxScheme
+                taxable_amount = subtotal.TaxableAmount
+                if taxable_amount is None:
+                    taxable_amount = invoice_line.LineExtensionAmount
+                taxes.append((tax_scheme.TaxTypeCode, tax_scheme.Name, subtotal.Percent or 0, taxable_amount,
+                              subtotal.TaxAmount or 0))
+        self.add(invoice_line.LineExtensionAmount, taxes)
+
+    def add_column_totals(self, totals: ColumnTotals):
+        """add_invoice_lines_from_columns sonucunu ekler (KDV, 0015)."""
+        self.line_count += totals.line_count
+        self.line_extension_amount += totals.line_extension_amount
+        for percent, (taxable_amount, tax_amount) in totals.vat.items():
+            self._add_tax(VAT_TAX_TYPE_CODE, VAT_TAX_SCHEME_NAME, percent, taxable_amount, tax_amount)
+
+    def _add_tax(self, tax_type_code: str, name: Optional[str], percent: Decimal, taxable_amount: Decimal,
+                 tax_amount: Decimal):
+        group = self._groups.get((tax_type_code, percent))
+        if group is None:
+            self._groups[(tax_type_code, percent)] = [name or _tax_type_name(tax_type_code), taxable_amount, tax_amount]
+        else:
+            group[1] += taxable_amount
+            group[2] += tax_amount
+
+    def _round(self, value: Decimal) -> Decimal:
+        return value.quantize(self.quantum, self.rounding)
+
+    def tax_groups(self) -> List[Tuple[str, str, Decimal, Decimal, Decimal]]:
+        """
+        :return: Eklenme sırasıyla (TaxTypeCode, vergi adı, oran, yuvarlanmış matrah, yuvarlanmış vergi) demetleri.
+        """
+        groups = []
+        for (tax_type_code, percent), (name, taxable_amount, tax_amount) in self._groups.items():
+            if self.tax_basis == 'document':
+                tax_amount = taxable_amount * percent / 100
+            groups.append((tax_type_code, name, percent, self._round(taxable_amount), self._round(tax_amount)))
+        return groups
+
+    @property
+    def tax_amount(self) -> Decimal:
+        return sum((group[4] for group in self.tax_groups()), Decimal(0))
+
+    def tax_total(self) -> TaxTotal:
+        """Belge düzeyindeki TaxTotal; (TaxTypeCode, Percent) grubu başına bir TaxSubtotal."""
+        subtotals = []
+        total = Decimal(0)
+        for sequence, (tax_type_code, name, percent, taxable_amount, tax_amount) in enumerate(self.tax_groups(), 1):
+            total += tax_amount
+            subtotals.append(TaxSubtotal(TaxableAmount=str(taxable_amount), TaxAmount=str(tax_amount),
+                                         CalculationSequenceNumeric=str(sequence),
+                                         Percent=format(percent.normalize(), 'f'),
+                                         TaxCategory=TaxCategory.interned(Name=name,
+                                                                          TaxScheme=TaxScheme.of(tax_type_code, name))))
+        return TaxTotal(TaxAmount=str(self._round(total)), TaxSubtotal=subtotals, CurrencyID=self.currency_id)
+
+    def monetary_total(self, allowance_total_amount=None, charge_total_amount=None,
+                       payable_rounding_amount=None) -> MonetaryTotal:
+        """
+        LegalMonetaryTotal:
+            TaxExclusiveAmount = LineExtensionAmount - AllowanceTotalAmount + ChargeTotalAmount
+            TaxInclusiveAmount = TaxExclusiveAmount + vergiler
+            PayableAmount      = TaxInclusiveAmount + PayableRoundingAmount
+        """
+        allowance = to_decimal(allowance_total_amount or 0)
+        charge = to_decimal(charge_total_amount or 0)
+        rounding_amount = to_decimal(payable_rounding_amount or 0)
+
+        line_extension_amount = self._round(self.line_extension_amount)
+        tax_exclusive_amount = self._round(line_extension_amount - allowance + charge)
+        tax_inclusive_amount = self._round(tax_exclusive_amount + self.tax_amount)
+
+        def text(value) -> Optional[str]:
+            return None if value is None else str(self._round(to_decimal(value)))
+
+        return MonetaryTotal(LineExtensionAmount=str(line_extension_amount),
+                             TaxExclusiveAmount=str(tax_exclusive_amount),
+                             TaxInclusiveAmount=str(tax_inclusive_amount),
+                             AllowanceTotalAmount=text(allowance_total_amount),
+                             ChargeTotalAmount=text(charge_total_amount),
+                             PayableRoundingAmount=text(payable_rounding_amount),
+                             PayableAmount=str(self._round(tax_inclusive_amount + rounding_amount)),
+                             CurrencyID=self.currency_id)
@@ -1,21 +1,378 @@
-# Get xml filename from command line and assert validate with xsd file using lxml
+# UBL-TR XML dosyalarını XSD şemalarına göre doğrular.
+#
+# Tek dosya:
+#   python -m ubl_tr_py.validate_xml fatura.xml
+# Toplu (dizin, glob veya dosya listesi), süreç havuzu ile:
+#   python -m ubl_tr_py.validate_xml arsiv/2023 "arsiv/2024/**/*.xml" --file-list liste.txt --workers 8 --report sonuc.jsonl
+#
+# Her worker şemayı bir kez derler (bkz. ubl_tr_py.schemas). Dosya başına sonuçlar JSONL olarak yazılır,
+# sonunda verim (dosya/sn, MB/sn) özeti basılır.
+#
+# Kısa ömürlü süreçlerde şema derleme süresinden kaçınmak için çalışan servise gönderilebilir
+# (bkz. ubl_tr_py.validator_daemon), servis yoksa aynı süreçte doğrulanır:
+#   python -m ubl_tr_py.validate_xml fatura.xml --daemon
+#
+# --parse-validate ile şema ayrıştırıcıya bağlanır: belge okunurken doğrulanır, bütün ağaç bellekte
+# tutulmaz ve ilk şema hatasından sonra okuma bırakılır. --fail-fast ile toplu doğrulama ilk geçersiz
+# dosyada sonlanır:
+#   python -m ubl_tr_py.validate_xml gelen/ --parse-validate --fail-fast
+#
+# Aynı belgeler tekrar tekrar doğrulanıyorsa sonuçlar içerik özetine göre önbelleklenebilir
+# (bkz. ubl_tr_py.validation_cache):
+#   python -m ubl_tr_py.validate_xml gelen/ --cache dogrulama.sqlite --cache-max-age 604800
 
-import sys
+import argparse
+import fnmatch
+import functools
+import glob
+import io
+import itertools
+import json
 import os
+import sys
+import time
+import urllib.error
+import urllib.request
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List, Optional
+from urllib.parse import quote
+
 import lxml.etree as etree
 
-cwd = os.getcwd()
-file_path = os.path.join(cwd, "UBLTR_1.2.1_Paketi", "xsdrt", "maindoc", "UBL-Invoice-2.1.xsd")
+from ubl_tr_py.schemas import ROOT_TAGS, get_schema, document_type_of
+from ubl_tr_py.validation_cache import ValidationCache
+
+DEFAULT_DAEMON_URL = 'http://127.0.0.1:8765'
+
+_CAC = '{urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2}'
+
+# --parse-validate: belgenin büyük kısmını oluşturan, okunduktan sonra bellekten silinen elemanlar.
+STREAMING_TAGS = [_CAC + 'InvoiceLine', _CAC + 'CreditNoteLine', _CAC + 'DespatchLine', _CAC + 'ReceiptLine',
+                  _CAC + 'AdditionalDocumentReference']
+
+
+def validate_file(path: str, parse_validate: bool = False, cache: ValidationCache = None) -> dict:
+    """
+    Tek bir dosyayı doğrular.
+
+    :param parse_validate: True ise belge okunurken doğrulanır, ağaç bellekte tutulmaz ve ilk şema hatasında
+                           okuma bırakılır (bkz. _validate_streaming).
+    :param cache: Verilirse dosya içeriği özetlenir, aynı içerik daha önce doğrulandıysa sonuç önbellekten döner.
+    :return: path, size, valid, document_type, line, message, cached, seconds alanlarını içeren sözlük.
+             Geçersiz belgelerde line/message ilk hatayı gösterir.
+    """
+    if cache is not None:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            result = _new_result(path)
+            result['message'] = str(e)
+            result['seconds'] = 0.0
+            return result
+        return validate_bytes(data, path, parse_validate, cache)
+
+    started = time.perf_counter()
+    result = _new_result(path)
+
+    try:
+        result['size'] = os.path.getsize(path)
+        if parse_validate:
+            _validate_streaming(path, result)
+        else:
+            _validate_doc(etree.parse(path), result)
+    except etree.XMLSyntaxError as e:
+        _syntax_error(e, result)
+    except OSError as e:
+        result['message'] = str(e)
+
+    result['seconds'] = round(time.perf_counter() - started, 6)
+    return result
+
+
+def validate_bytes(data: bytes, path: str = None, parse_validate: bool = False, cache: ValidationCache = None) -> dict:
+    """
+    Bellekteki belgeyi doğrular (bkz. ubl_tr_py.validator_daemon). Sonuç validate_file ile aynı biçimdedir.
+
+    :param path: Yalnızca rapora yazılır, dosya okunmaz.
+    :param parse_validate: validate_file ile aynı.
+    :param cache: validate_file ile aynı.
+    """
+    started = time.perf_counter()
+    result = _new_result(path)
+    result['size'] = len(data)
+
+    key = None
+    if cache is not None:
+        key = cache.key(data, parse_validate)
+        cached = cache.get(key)
+        if cached is not None:
+            return _cached_result(result, cached, started)
+
+    if parse_validate:
+        _validate_streaming(io.BytesIO(data), result)
+    else:
+        try:
+            _validate_doc(etree.fromstring(data).getroottree(), result)
+        except etree.XMLSyntaxError as e:
+            _syntax_error(e, result)
+
+    if key is not None:
+        cache.put(key, result)
+    result['seconds'] = round(time.perf_counter() - started, 6)
+    return result
+
+
+def _cached_result(result: dict, cached: dict, started: float) -> dict:
+    result.update(cached)
+    result['cached'] = True
+    result['seconds'] = round(time.perf_counter() - started, 6)
+    return result
+
+
+def _validate_streaming(source, result: dict):
+    """
+    Belgeyi iterparse ile okurken doğrular. Kalem ve ek elemanları (STREAMING_TAGS) işlendikçe bellekten
+    silinir, böylece ağacın tamamı hiçbir zaman bellekte tutulmaz. Her böyle elemanın sonunda hata kaydına
+    bakılır; şema hatası bulunduysa belgenin geri kalanı okunmaz.
+
+    Not: libxml2 okuma sırasında bulunan şema hatalarında satır numarası vermez, bu durumda line None olur.
+    """
+    # Kök elemanın start olayı belge tipini verir; belge erken bırakılsa da (ilk hata, söz dizimi hatası) raporlanır.
+    events = etree.iterparse(source, events=('start', 'end'), tag=STREAMING_TAGS + list(ROOT_TAGS),
+                             schema=get_schema())
+    try:
+        for event, element in events:
+            if event == 'start':
+                if result['document_type'] is None:
+                    result['document_type'] = document_type_of(element)
+                continue
+            if element.getparent() is None:
+                continue
+            element.clear(keep_tail=True)
+            errors = events.error_log.filter_from_errors()
+            if errors:
+                error = errors[0]
+                result['line'] = error.line or None
+                result['message'] = error.message
+                break
+        else:
+            result['valid'] = True
+    except etree.XMLSyntaxError as e:
+        _syntax_error(e, result)
+
+
+def _new_result(path: str) -> dict:
+    return {'path': path, 'size': None, 'valid': False, 'document_type': None, 'line': None, 'message': None,
+            'cached': False}
+
+
+def _syntax_error(e: etree.XMLSyntaxError, result: dict):
+    result['line'] = e.lineno or None
+    result['message'] = str(e)
+
+
+def _validate_doc(doc: etree._ElementTree, result: dict):
+    result['document_type'] = document_type_of(doc)
+    if result['document_type'] is None:
+        result['line'] = doc.getroot().sourceline
+        result['message'] = f'Unsupported root element: {doc.getroot().tag}'
+        return
+
+    schema = get_schema()
+    result['valid'] = schema.validate(doc)
+    if not result['valid']:
+        error = schema.error_log[0]
+        result['line'] = error.line
+        result['message'] = error.message
+
+
+def request_validation(daemon_url: str, path: str, timeout: float = 30, parse_validate: bool = False,
+                       data: bytes = None) -> dict:
+    """
+    Dosyayı çalışan doğrulama servisine (ubl_tr_py.validator_daemon) gönderir.
+
+    :param data: Dosyanın içeriği; verilirse dosya okunmaz, path yalnızca rapora yazılır.
+    :raises OSError: Dosya okunamazsa, servis çalışmıyorsa veya bağlantı kurulamazsa (urllib.error.URLError),
+                     servis hata döndürürse (urllib.error.HTTPError) veya yanıt zaman aşımına uğrarsa (TimeoutError).
+    """
+    if data is None:
+        with open(path, 'rb') as f:
+            data = f.read()
+    headers = {'Content-Type': 'application/xml', 'X-Path': quote(path)}
+    if parse_validate:
+        headers['X-Parse-Validate'] = '1'
+    request = urllib.request.Request(daemon_url.rstrip('/') + '/validate', data=data, method='POST', headers=headers)
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+def iter_paths(inputs: Iterable[str], file_list: str = None, pattern: str = '*.xml') -> Iterator[str]:
+    """
+    Komut satırı girdilerini dosya yollarına açar: dizinler (alt dizinlerle birlikte pattern'e uyan dosyalar),
+    glob ifadeleri ve düz dosya yolları. file_list verilirse her satırı bir yol olarak okunur ('-' stdin).
+    """
+    for item in inputs:
+        if os.path.isdir(item):
+            for dir_path, _, file_names in os.walk(item):
+                for file_name in sorted(file_names):
+                    if fnmatch.fnmatch(file_name, pattern):
+                        yield os.path.join(dir_path, file_name)
+        elif glob.has_magic(item):
+            yield from sorted(glob.iglob(item, recursive=True))
+        else:
+            yield item
+
+    if file_list:
+        f = sys.stdin if file_list == '-' else open(file_list, encoding='utf-8')
+        try:
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield line
+        finally:
+            if f is not sys.stdin:
+                f.close()
+
+
+# Worker süreçlerinin kendi önbelleği, bkz. _init_worker.
+_worker_cache: Optional[ValidationCache] = None
+
+
+def _init_worker(cache_options: dict = None):
+    # Şemayı worker başlarken derle, ilk dosyanın süresine eklenmesin.
+    global _worker_cache
+    get_schema()
+    if cache_options is not None:
+        _worker_cache = ValidationCache(**cache_options)
+
+
+def _validate_in_worker(path: str, parse_validate: bool = False) -> dict:
+    return validate_file(path, parse_validate, _worker_cache)
+
+
+def validate_many(paths: Iterable[str], workers: int = None, chunksize: int = 16, daemon_url: str = None,
+                  parse_validate: bool = False, cache_options: dict = None) -> Iterator[dict]:
+    """
+    Dosyaları süreç havuzunda doğrular, sonuçları tamamlandıkça döndürür (sıra garanti edilmez).
+    workers=1 ise havuz kurulmadan aynı süreçte çalışır. Döngü erken bırakılırsa (örn. --fail-fast)
+    havuz kapatılır, kalan dosyalar doğrulanmaz.
+
+    daemon_url verilirse dosyalar çalışan doğrulama servisine gönderilir; servise bağlanılamazsa
+    kalan dosyalar için aynı süreçte/havuzda doğrulamaya geri dönülür. Okunamayan dosyalar, servisin
+    hata yanıtları (HTTP) ve zaman aşımları yalnızca o dosyanın sonucuna (valid=False) yazılır.
+
+    :param cache_options: Verilirse her worker bu parametrelerle bir ValidationCache kurar, örn.
+                          {'path': 'dogrulama.sqlite', 'max_age': 86400}. Worker'lar arasında yalnızca
+                          SQLite dosyası paylaşılır.
+    """
+    if daemon_url:
+        paths = iter(paths)
+        for path in paths:
+            started = time.perf_counter()
+            result = _new_result(path)
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError as e:
+                # validate_file ile aynı sonuç; servisle ilgisi yok.
+                result['message'] = str(e)
+                result['seconds'] = round(time.perf_counter() - started, 6)
+                yield result
+                continue
+
+            try:
+                daemon_result = request_validation(daemon_url, path, parse_validate=parse_validate, data=data)
+            except urllib.error.HTTPError as e:
+                # Servis çalışıyor, bu dosyada hata verdi.
+                result['message'] = f'Validator daemon error: {e}'
+            except (urllib.error.URLError, ConnectionError) as e:
+                print(f'Validator daemon at {daemon_url} is not reachable ({e}), validating in-process', file=sys.stderr)
+                yield from validate_many(itertools.chain([path], paths), workers, chunksize,
+                                         parse_validate=parse_validate, cache_options=cache_options)
+                return
+            except OSError as e:
+                # Örn. büyük bir dosyada yanıt zaman aşımı (TimeoutError); kalan dosyalar yine servise gönderilir.
+                result['message'] = f'Validator daemon error: {type(e).__name__}: {e}'
+            else:
+                yield daemon_result
+                continue
+            result['size'] = len(data)
+            result['seconds'] = round(time.perf_counter() - started, 6)
+            yield result
+        return
+
+    validate = functools.partial(_validate_in_worker, parse_validate=parse_validate)
+    if workers == 1:
+        _init_worker(cache_options)
+        yield from map(validate, paths)
+        return
+
+    with Pool(processes=workers, initializer=_init_worker, initargs=(cache_options,)) as pool:
+        yield from pool.imap_unordered(validate, paths, chunksize=chunksize)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m ubl_tr_py.validate_xml',
+                                     description='UBL-TR XML belgelerini XSD şemalarına göre doğrular.')
+    parser.add_argument('inputs', nargs='*', help='Dosya, dizin veya glob ifadesi')
+    parser.add_argument('--file-list', help="Her satırında bir dosya yolu olan liste ('-' stdin)")
+    parser.add_argument('--pattern', default='*.xml', help='Dizinlerde aranacak dosya deseni (varsayılan: *.xml)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker süreç sayısı (varsayılan: CPU sayısı)')
+    parser.add_argument('--chunksize', type=int, default=16, help="Worker'a tek seferde gönderilen dosya sayısı")
+    parser.add_argument('--report', help="Dosya başına sonuçların yazılacağı JSONL dosyası ('-' stdout)")
+    parser.add_argument('--quiet', action='store_true', help='Geçersiz dosyaları tek tek yazdırma')
+    parser.add_argument('--daemon', nargs='?', const=DEFAULT_DAEMON_URL, default=os.environ.get('UBLTR_VALIDATOR_URL'),
+                        help='Dosyaları çalışan doğrulama servisine gönder (varsayılan adres: %(const)s, '
+                             'ortam değişkeni: UBLTR_VALIDATOR_URL). Servis yoksa aynı süreçte doğrulanır.')
+    parser.add_argument('--parse-validate', action='store_true',
+                        help='Belgeyi okurken doğrula, ağacı bellekte tutma, ilk hatada dur (şema hatalarında satır numarası verilmez)')
+    parser.add_argument('--fail-fast', action='store_true', help='İlk geçersiz dosyada dur, çıkış kodu 1')
+    parser.add_argument('--cache', metavar='SQLITE', help='Doğrulama sonuçlarını içerik özetine göre bu SQLite dosyasında sakla')
+    parser.add_argument('--cache-max-entries', type=int, default=100000, help='Önbellekteki en fazla sonuç (varsayılan: %(default)s)')
+    parser.add_argument('--cache-max-age', type=float, help='Saniye; bundan eski önbellek sonuçları kullanılmaz')
+    args = parser.parse_args(argv)
+
+    if not args.inputs and not args.file_list:
+        parser.error('en az bir dosya, dizin, glob veya --file-list gerekli')
+
+    report = None
+    if args.report:
+        report = sys.stdout if args.report == '-' else open(args.report, 'w', encoding='utf-8')
+
+    cache_options = None
+    if args.cache:
+        cache_options = {'path': args.cache, 'max_entries': args.cache_max_entries, 'max_age': args.cache_max_age}
 
-print(file_path)
+    total = valid = cached = total_bytes = 0
+    started = time.perf_counter()
+    try:
+        for result in validate_many(iter_paths(args.inputs, args.file_list, args.pattern), args.workers, args.chunksize,
+                                    args.daemon, args.parse_validate, cache_options):
+            total += 1
+            cached += result.get('cached', False)
+            total_bytes += result['size'] or 0
+            if result['valid']:
+                valid += 1
+            elif not args.quiet:
+                print(f"INVALID {result['path']}:{result['line']}: {result['message']}", file=sys.stderr)
+            if report:
+                report.write(json.dumps(result, ensure_ascii=False) + '\n')
+            if args.fail_fast and not result['valid']:
+                break
+    finally:
+        if report and report is not sys.stdout:
+            report.close()
 
+    elapsed = time.perf_counter() - started
+    if cache_options or cached:
+        print(f'cache: {cached} hits, {total - cached} misses', file=sys.stderr)
+    print(f'{total} files, {valid} valid, {total - valid} invalid in {elapsed:.2f}s '
+          f'({total / elapsed if elapsed else 0:.1f} files/s, {total_bytes / 1048576 / elapsed if elapsed else 0:.2f} MB/s)',
+          file=sys.stderr)
 
-# Parse the XSD schema
-schema_doc = etree.parse(file_path)
-schema = etree.XMLSchema(schema_doc)
+    return 0 if valid == total else 1
 
-# Parse the XML file
-doc = etree.parse(sys.argv[1])
 
-# Validate the XML file against the XSD schema
-schema.assertValid(doc)
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# Doğrulama sonucu önbelleği: aynı belge baytları tekrar geldiğinde XSD doğrulaması atlanır.
+#
+# Yeniden denemeler, entegratöre tekrar gönderimler ve yeniden içe aktarmalar aynı faturanın
+# defalarca doğrulanmasına yol açıyor. Anahtar, belgenin SHA-256 özeti, doğrulama modu (parse_validate) ve şema
+# sürümüdür (bkz. schemas.schema_version); şema paketi değişince eski sonuçlar kendiliğinden geçersiz olur.
+#
+# İki katman vardır:
+#   - süreç içi LRU (max_entries, max_age)
+#   - isteğe bağlı SQLite dosyası (path); süreçler ve çalıştırmalar arasında paylaşılır
+#
+#   cache = ValidationCache(max_entries=10000, max_age=7 * 86400, path='dogrulama.sqlite')
+#   result = validate_bytes(data, cache=cache)
+#   cache.stats()  # {'hits': ..., 'misses': ..., 'entries': ..., ...}
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from ubl_tr_py.schemas import schema_version
+
+# Önbellekte tutulan sonuç alanları; path, size ve seconds her çağrıda yeniden doldurulur.
+CACHED_FIELDS = ('valid', 'document_type', 'line', 'message')
+
+# SQLite katmanında boyut/yaş temizliği bu kadar yazmada bir yapılır.
+_EVICT_EVERY = 256
+
+
+class ValidationCache:
+    """
+    Belge içeriğine göre doğrulama sonucu önbelleği. Thread-safe'tir.
+
+    :param max_entries: Her katmanda tutulacak en fazla sonuç sayısı. Aşılınca en eski sonuçlar silinir
+                        (bellekte en az kullanılan, SQLite'ta en eski yazılan).
+    :param max_age: Saniye. Bundan eski sonuçlar kullanılmaz ve silinir. None ise süresiz.
+    :param path: Verilirse sonuçlar bu SQLite dosyasında da tutulur.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_age: float = None, path: str = None):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute('PRAGMA journal_mode=WAL')
+            self._db.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, result TEXT NOT NULL, '
+                             'created REAL NOT NULL)')
+            self._db.execute('CREATE INDEX IF NOT EXISTS results_created ON results (created)')
+            self._db.commit()
+            self._evict_db()
+
+    @staticmethod
+    def key(data: bytes, parse_validate: bool = False) -> str:
+        """
+        Şema sürümü + doğrulama modu + belge baytlarının SHA-256 özeti. Okurken doğrulamanın sonucu (satır yok,
+        hatalarda document_type boş) bütün ağaç doğrulamasınınkinden farklıdır, ayrı tutulur.
+        """
+        digest = hashlib.sha256(schema_version().encode())
+        digest.update(b'\0stream\0' if parse_validate else b'\0tree\0')
+        digest.update(data)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        :return: CACHED_FIELDS alanlarını içeren sonuç, yoksa veya süresi dolmuşsa None.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                created, result = entry
+                if self._expired(created, now):
+                    del self._entries[key]
+                    self.evictions += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return dict(result)
+
+            if self._db is not None:
+                row = self._db.execute('SELECT result, created FROM results WHERE key = ?', (key,)).fetchone()
+                if row is not None and not self._expired(row[1], now):
+                    result = json.loads(row[0])
+                    self._remember(key, row[1], result)
+                    self.hits += 1
+                    return dict(result)
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, result: dict):
+        """Sonucun CACHED_FIELDS alanlarını saklar."""
+        result = {field: result.get(field) for field in CACHED_FIELDS}
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, result)
+            if self._db is not None:
+                self._db.execute('INSERT OR REPLACE INTO results (key, result, created) VALUES (?, ?, ?)',
+                                 (key, json.dumps(result, ensure_ascii=False), now))
+                self._db.commit()
+                self._writes += 1
+                if self._writes % _EVICT_EVERY == 0:
+                    self._evict_db()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute('DELETE FROM results')
+                self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'entries': len(self._entries), 'max_entries': self.max_entries, 'max_age': self.max_age,
+                    'path': self.path}
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _expired(self, created: float, now: float) -> bool:
+        return self.max_age is not None and now - created > self.max_age
+
+    def _remember(self, key: str, created: float, result: dict):
+        self._entries[key] = (created, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _evict_db(self):
+        if self.max_age is not None:
+            cursor = self._db.execute('DELETE FROM results WHERE created < ?', (time.time() - self.max_age,))
+            self.evictions += cursor.rowcount
+        cursor = self._db.execute('DELETE FROM results WHERE key IN '
+                                  '(SELECT key FROM results ORDER BY created DESC LIMIT -1 OFFSET ?)',
+                                  (self.max_entries,))
+        self.evictions += cursor.rowcount
+        self._db.commit()
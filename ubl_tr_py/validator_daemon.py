@@ -0,0 +1,151 @@
+# Yerel doğrulama servisi: UBL-TR şemalarını derlenmiş halde tutar, belgeleri worker havuzunda doğrular.
+#
+# Her belge için yeni süreç açan entegrasyonlarda (ERP vb.) şema derleme süresi doğrulamanın
+# kendisinden uzun sürüyor. Servis bir kez başlatılır, istemciler belgeyi HTTP ile gönderir:
+#
+#   python -m ubl_tr_py.validator_daemon --port 8765 --workers 4
+#   python -m ubl_tr_py.validate_xml fatura.xml --daemon http://127.0.0.1:8765
+#
+# Uç noktalar:
+#   POST /validate   gövde: XML belge, isteğe bağlı X-Path ve X-Parse-Validate: 1 başlıkları. Yanıt: validate_xml.validate_bytes sonucu (JSON)
+#   GET  /health     {"status": "ok", "workers": N, "document_types": [...], "cache": {...}}
+#
+# Sonuçlar varsayılan olarak bellekte, belge içeriğinin özetine göre önbelleklenir (bkz. ubl_tr_py.validation_cache);
+# --cache-db ile yeniden başlatmalar arasında da korunur, --cache-size 0 önbelleği kapatır.
+#
+# Servis yalnızca yerel kullanım içindir; kimlik doğrulama yoktur, varsayılan olarak 127.0.0.1'i dinler.
+
+import argparse
+import json
+import os
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import Pool
+from typing import List
+from urllib.parse import unquote, urlsplit
+
+from ubl_tr_py.schemas import SCHEMA_FILES, get_schema
+from ubl_tr_py.validate_xml import DEFAULT_DAEMON_URL, _cached_result, _init_worker, _new_result, validate_bytes
+from ubl_tr_py.validation_cache import ValidationCache
+
+# Bundan büyük istekler reddedilir (ekli belgelerle birlikte GİB sınırının üstünde).
+MAX_DOCUMENT_SIZE = 100 * 1024 * 1024
+
+
+class ValidatorHandler(BaseHTTPRequestHandler):
+    server: 'ValidatorServer'
+
+    def do_GET(self):
+        if self.path != '/health':
+            self._send_json(404, {'error': 'not found'})
+            return
+        cache = self.server.cache.stats() if self.server.cache is not None else None
+        self._send_json(200, {'status': 'ok', 'workers': self.server.workers, 'document_types': list(SCHEMA_FILES),
+                              'cache': cache})
+
+    def do_POST(self):
+        if self.path != '/validate':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        length = int(self.headers.get('Content-Length') or 0)
+        if length <= 0 or length > MAX_DOCUMENT_SIZE:
+            self._send_json(413 if length else 411, {'error': f'invalid Content-Length: {length}'})
+            return
+
+        data = self.rfile.read(length)
+        path = self.headers.get('X-Path')
+        parse_validate = self.headers.get('X-Parse-Validate') == '1'
+        result = self.server.validate(data, unquote(path) if path else None, parse_validate)
+        self._send_json(200, result)
+
+    def _send_json(self, status: int, body: dict):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ValidatorServer(ThreadingHTTPServer):
+    """
+    HTTP isteklerini thread'lerde karşılar, doğrulamayı worker havuzuna verir.
+    workers=1 ise havuz kurulmaz, doğrulama istek thread'inde yapılır.
+    cache verilirse önbellek istek thread'inde, havuza gitmeden önce sorgulanır.
+    """
+    daemon_threads = True
+
+    def __init__(self, address, workers: int = None, verbose: bool = False, cache: ValidationCache = None):
+        super().__init__(address, ValidatorHandler)
+        self.workers = workers or os.cpu_count()
+        self.verbose = verbose
+        self.cache = cache
+        if self.workers == 1:
+            get_schema()
+            self.pool = None
+        else:
+            self.pool = Pool(processes=self.workers, initializer=_init_worker)
+
+    def validate(self, data: bytes, path: str = None, parse_validate: bool = False) -> dict:
+        if self.pool is None:
+            return validate_bytes(data, path, parse_validate, self.cache)
+        if self.cache is None:
+            return self.pool.apply(validate_bytes, (data, path, parse_validate))
+
+        started = time.perf_counter()
+        key = self.cache.key(data, parse_validate)
+        cached = self.cache.get(key)
+        if cached is not None:
+            result = _new_result(path)
+            result['size'] = len(data)
+            return _cached_result(result, cached, started)
+        result = self.pool.apply(validate_bytes, (data, path, parse_validate))
+        self.cache.put(key, result)
+        return result
+
+    def server_close(self):
+        super().server_close()
+        if self.cache is not None:
+            self.cache.close()
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool.join()
+
+
+def main(argv: List[str] = None) -> int:
+    default = urlsplit(DEFAULT_DAEMON_URL)
+    parser = argparse.ArgumentParser(prog='python -m ubl_tr_py.validator_daemon',
+                                     description='UBL-TR şemalarını derlenmiş tutan yerel doğrulama servisi.')
+    parser.add_argument('--host', default=default.hostname, help='Dinlenecek adres (varsayılan: %(default)s)')
+    parser.add_argument('--port', type=int, default=default.port, help='Dinlenecek port (varsayılan: %(default)s)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker süreç sayısı (varsayılan: CPU sayısı)')
+    parser.add_argument('--verbose', action='store_true', help='İstekleri logla')
+    parser.add_argument('--cache-size', type=int, default=10000, help='Önbellekteki en fazla sonuç, 0 ise kapalı (varsayılan: %(default)s)')
+    parser.add_argument('--cache-max-age', type=float, help='Saniye; bundan eski önbellek sonuçları kullanılmaz')
+    parser.add_argument('--cache-db', metavar='SQLITE', help='Önbelleği bu SQLite dosyasında da tut')
+    args = parser.parse_args(argv)
+
+    cache = None
+    if args.cache_size > 0:
+        cache = ValidationCache(max_entries=args.cache_size, max_age=args.cache_max_age, path=args.cache_db)
+
+    server = ValidatorServer((args.host, args.port), workers=args.workers, verbose=args.verbose, cache=cache)
+    print(f'Validator daemon listening on http://{args.host}:{server.server_port} with {server.workers} workers',
+          file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())